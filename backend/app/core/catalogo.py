@@ -0,0 +1,28 @@
+"""
+Versão do catálogo de atividades, guardada na base de dados
+
+As escritas em atividades (criar, atualizar, eliminar, aprovar, rejeitar)
+chamam invalidar_catalogo antes do commit: a versão (tabela catalogo_versao,
+uma só linha) sobe na mesma transação da escrita, e todos os workers a veem
+mal a escrita é confirmada. O que é derivado do catálogo (os planos das
+propostas e o motor de pontuação) guarda a versão com que foi construído e
+reconstrói-se quando ela muda.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.catalogo_versao import CatalogoVersao
+
+
+def versao_catalogo(db: Session) -> int:
+    """Versão atual do catálogo (query de uma linha)"""
+    return db.scalar(select(CatalogoVersao.versao).where(CatalogoVersao.id == 1)) or 0
+
+
+def invalidar_catalogo(db: Session):
+    """O catálogo mudou: sobe a versão na transação de quem escreveu (efetiva no seu commit)"""
+    db.execute(
+        update(CatalogoVersao)
+        .where(CatalogoVersao.id == 1)
+        .values(versao=CatalogoVersao.versao + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,38 +1,54 @@
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.core.security import decode_access_token
-from app.crud import user as crud_user
-from app.models.user import User
+from app.core.identity import Identity, Principal, Snapshot, load_identity, load_identity_async
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
-def get_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
-    """Obtém utilizador atual a partir do token JWT (opcional)"""
+def _token_payload(token: Optional[str]) -> Optional[dict]:
     if token is None:
         return None
-    
     payload = decode_access_token(token)
+    if payload is None or not payload.get("sub"):
+        return None
+    return payload
+
+
+def get_current_identity(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[Identity]:
+    """Utilizador e perfil (empresa/fornecedor) do token JWT, via cache de identidade"""
+    payload = _token_payload(token)
     if payload is None:
         return None
-    
-    email: str = payload.get("sub")
-    if email is None:
+    return load_identity(db, payload["sub"])
+
+
+def get_current_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[Principal]:
+    """Obtém utilizador atual a partir das claims do token JWT (opcional)"""
+    payload = _token_payload(token)
+    if payload is None:
         return None
-    
-    user = crud_user.get_user_by_email(db, email=email)
-    return user
+    principal = Principal.from_claims(payload)
+    if principal is not None and not principal.perfil_em_falta:
+        return principal
+    # Token sem claims ou perfil criado depois do login: resolver pela identidade
+    identity = load_identity(db, payload["sub"])
+    return Principal.from_identity(identity) if identity else None
 
 
 def get_current_user_required(
-    current_user: Optional[User] = Depends(get_current_user)
-) -> User:
+    current_user: Optional[Principal] = Depends(get_current_user)
+) -> Principal:
     """Obtém utilizador atual a partir do token JWT (requerido)"""
     if current_user is None:
         raise HTTPException(
@@ -42,3 +58,55 @@ def get_current_user_required(
         )
     return current_user
 
+
+def get_current_empresa(
+    identity: Optional[Identity] = Depends(get_current_identity)
+) -> Optional[Snapshot]:
+    """Perfil de empresa do utilizador autenticado, só colunas (sem query quando em cache)"""
+    return identity.empresa if identity else None
+
+
+def get_current_fornecedor(
+    identity: Optional[Identity] = Depends(get_current_identity)
+) -> Optional[Snapshot]:
+    """Perfil de fornecedor do utilizador autenticado, só colunas (sem query quando em cache)"""
+    return identity.fornecedor if identity else None
+
+
+async def get_current_identity_async(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Identity]:
+    """Utilizador e perfil do token JWT (sessão assíncrona), via cache de identidade"""
+    payload = _token_payload(token)
+    if payload is None:
+        return None
+    return await load_identity_async(db, payload["sub"])
+
+
+async def get_current_user_async(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """Obtém utilizador atual a partir das claims do token JWT (opcional, sessão assíncrona)"""
+    payload = _token_payload(token)
+    if payload is None:
+        return None
+    principal = Principal.from_claims(payload)
+    if principal is not None and not principal.perfil_em_falta:
+        return principal
+    identity = await load_identity_async(db, payload["sub"])
+    return Principal.from_identity(identity) if identity else None
+
+
+async def get_current_user_required_async(
+    current_user: Optional[Principal] = Depends(get_current_user_async)
+) -> Principal:
+    """Obtém utilizador atual a partir do token JWT (requerido, sessão assíncrona)"""
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return current_user
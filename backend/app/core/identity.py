@@ -0,0 +1,173 @@
+"""
+Cache de identidade dos utilizadores autenticados
+
+Guarda, por subject do token (email), o User e o perfil Empresa/Fornecedor já
+resolvidos, como cópias só de leitura das colunas (Snapshot) e não instâncias
+ORM: a mesma entrada é partilhada entre pedidos e threads sem pertencer a
+nenhuma sessão. Pedidos autenticados deixam de fazer as queries de user e de
+perfil enquanto a entrada for válida; uma rota que precise da linha ORM
+(relacionamentos, escrita) carrega-a pelo id na sua sessão.
+As escritas em users/empresas/fornecedores chamam invalidate_identity.
+
+Principal é a versão mínima da identidade (ids, tipo, nome, email) que vai nas
+claims do access token: autorização e filtros por empresa/fornecedor decidem-se
+sem base de dados.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User, TipoUsuario
+from app.models.empresa import Empresa
+from app.models.fornecedor import Fornecedor
+
+
+class Snapshot:
+    """Valores das colunas de uma linha ORM, só de leitura e sem relacionamentos"""
+    __slots__ = ("modelo", "_valores")
+
+    def __init__(self, instancia):
+        object.__setattr__(self, "modelo", type(instancia))
+        object.__setattr__(self, "_valores", MappingProxyType({
+            coluna.key: getattr(instancia, coluna.key) for coluna in inspect(instancia).mapper.column_attrs
+        }))
+
+    def __getattr__(self, nome):
+        try:
+            return self._valores[nome]
+        except KeyError:
+            raise AttributeError(
+                f"{self.modelo.__name__} em cache só tem colunas; carregar a linha para aceder a '{nome}'"
+            ) from None
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(f"{self.modelo.__name__} em cache é só de leitura")
+
+    def __repr__(self):
+        return f"Snapshot({self.modelo.__name__}, id={self._valores.get('id')})"
+
+
+@dataclass(frozen=True)
+class Identity:
+    user: Snapshot  # User
+    empresa: Optional[Snapshot] = None  # Empresa
+    fornecedor: Optional[Snapshot] = None  # Fornecedor
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    nome: str
+    tipo: TipoUsuario
+    empresa_id: Optional[int] = None
+    fornecedor_id: Optional[int] = None
+
+    @property
+    def perfil_em_falta(self) -> bool:
+        """Empresa/fornecedor sem id de perfil (perfil criado depois de emitido o token)"""
+        if self.tipo == TipoUsuario.EMPRESA:
+            return self.empresa_id is None
+        if self.tipo == TipoUsuario.FORNECEDOR:
+            return self.fornecedor_id is None
+        return False
+
+    @classmethod
+    def from_identity(cls, identity: Identity) -> "Principal":
+        return cls(
+            id=identity.user.id,
+            email=identity.user.email,
+            nome=identity.user.nome,
+            tipo=identity.user.tipo,
+            empresa_id=identity.empresa.id if identity.empresa else None,
+            fornecedor_id=identity.fornecedor.id if identity.fornecedor else None
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """Principal a partir do payload do access token (None para tokens só com sub)"""
+        try:
+            return cls(
+                id=payload["uid"],
+                email=payload["sub"],
+                nome=payload["nome"],
+                tipo=TipoUsuario(payload["tipo"]),
+                empresa_id=payload.get("empresa_id"),
+                fornecedor_id=payload.get("fornecedor_id")
+            )
+        except (KeyError, ValueError):
+            return None
+
+    def claims(self) -> dict:
+        """Claims a incluir no access token"""
+        return {
+            "sub": self.email,
+            "uid": self.id,
+            "nome": self.nome,
+            "tipo": self.tipo.value,
+            "empresa_id": self.empresa_id,
+            "fornecedor_id": self.fornecedor_id
+        }
+
+
+identity_cache = TTLCache(maxsize=settings.IDENTITY_CACHE_SIZE, ttl=settings.IDENTITY_CACHE_TTL)
+
+
+def _profile_statement(user: User):
+    if user.tipo == TipoUsuario.EMPRESA:
+        return select(Empresa).where(Empresa.user_id == user.id)
+    if user.tipo == TipoUsuario.FORNECEDOR:
+        return select(Fornecedor).where(Fornecedor.user_id == user.id)
+    return None
+
+
+def _build_identity(user: User, perfil) -> Identity:
+    perfil = Snapshot(perfil) if perfil is not None else None
+    return Identity(
+        user=Snapshot(user),
+        empresa=perfil if user.tipo == TipoUsuario.EMPRESA else None,
+        fornecedor=perfil if user.tipo == TipoUsuario.FORNECEDOR else None
+    )
+
+
+def load_identity(db: Session, email: str) -> Optional[Identity]:
+    """Identidade do utilizador (cache, ou user + perfil numa sessão síncrona)"""
+    identity = identity_cache.get(email)
+    if identity is not None:
+        return identity
+
+    user = db.scalar(select(User).where(User.email == email))
+    if user is None:
+        return None
+    statement = _profile_statement(user)
+    perfil = db.scalar(statement) if statement is not None else None
+
+    identity = _build_identity(user, perfil)
+    identity_cache.set(email, identity)
+    return identity
+
+
+async def load_identity_async(db: AsyncSession, email: str) -> Optional[Identity]:
+    """Identidade do utilizador (cache, ou user + perfil numa sessão assíncrona)"""
+    identity = identity_cache.get(email)
+    if identity is not None:
+        return identity
+
+    user = await db.scalar(select(User).where(User.email == email))
+    if user is None:
+        return None
+    statement = _profile_statement(user)
+    perfil = await db.scalar(statement) if statement is not None else None
+
+    identity = _build_identity(user, perfil)
+    identity_cache.set(email, identity)
+    return identity
+
+
+def invalidate_identity(user_id: int):
+    """Remove da cache a identidade do utilizador (após alterar user ou perfil)"""
+    identity_cache.delete_where(lambda email, identity: identity.user.id == user_id)
@@ -0,0 +1,160 @@
+"""
+Paginação por cursor (keyset) para as listagens
+
+O cursor é opaco para o cliente: base64 (URL-safe) do JSON com os valores da
+chave de ordenação da última linha devolvida. A página seguinte filtra as linhas
+depois desse ponto (WHERE sobre a chave de ordenação) em vez de saltar linhas
+com OFFSET: o custo de cada página não depende da profundidade.
+
+A ordenação tem de ser total: termina sempre numa coluna única (o id) e as
+colunas usadas não devem ter NULLs.
+
+Uso numa função de crud:
+
+    ordem = (Reserva.data_criacao.desc(), Reserva.id.desc())
+    statement = paginate(select(Reserva).where(...), ordem, cursor, limit)
+    return make_page(db.scalars(statement).all(), ordem, limit)
+
+e na rota, com o cursor seguinte no header X-Next-Cursor:
+
+    def list_x(response: Response, page: PageParams = Depends(page_params), ...):
+        pagina = crud_x.get_x(db, cursor=page.cursor, limit=page.limit)
+        set_next_cursor(response, pagina)
+        return pagina.items
+"""
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+from fastapi import Query, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import operators
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Cursor que não foi gerado por esta listagem (ou foi alterado)"""
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT)
+) -> PageParams:
+    """Parâmetros de paginação comuns às listagens (?cursor=...&limit=...)"""
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _column(expressao):
+    """Coluna e sentido de um elemento da ordenação (col, col.asc() ou col.desc())"""
+    modifier = getattr(expressao, "modifier", None)
+    if modifier in (operators.desc_op, operators.asc_op):
+        return expressao.element, modifier is operators.desc_op
+    return expressao, False
+
+
+def _encode_value(valor: Any) -> Any:
+    if isinstance(valor, (datetime.datetime, datetime.date)):
+        return valor.isoformat()
+    return valor
+
+
+def _decode_value(coluna, valor: Any) -> Any:
+    tipo = coluna.type.python_type
+    if tipo is datetime.datetime:
+        return datetime.datetime.fromisoformat(valor)
+    if tipo is datetime.date:
+        return datetime.date.fromisoformat(valor)
+    return tipo(valor)
+
+
+def encode_cursor(valores: Sequence[Any]) -> str:
+    dados = json.dumps([_encode_value(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, ordem: Sequence) -> list:
+    """Valores da chave de ordenação guardados no cursor, com o tipo de cada coluna"""
+    try:
+        dados = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        valores = json.loads(dados)
+        if not isinstance(valores, list) or len(valores) != len(ordem):
+            raise InvalidCursor(cursor)
+        return [_decode_value(_column(expressao)[0], v) for expressao, v in zip(ordem, valores)]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as erro:
+        if isinstance(erro, InvalidCursor):
+            raise
+        raise InvalidCursor(cursor) from erro
+
+
+def after_position(ordem: Sequence, valores: Sequence):
+    """
+    Condição "depois de (v1, v2, ...)" na ordem dada, coluna a coluna:
+    c1 > v1  OR  (c1 = v1 AND c2 > v2)  OR ...
+
+    Os valores podem ser literais (de um cursor) ou expressões SQL (p. ex. uma
+    subquery escalar com a posição de uma linha conhecida).
+    """
+    condicoes = []
+    for i, expressao in enumerate(ordem):
+        coluna, descendente = _column(expressao)
+        iguais = [_column(anterior)[0] == v for anterior, v in zip(ordem[:i], valores[:i])]
+        depois = coluna < valores[i] if descendente else coluna > valores[i]
+        condicoes.append(and_(*iguais, depois))
+    return or_(*condicoes)
+
+
+def paginate(statement, ordem: Sequence, cursor: Optional[str], limit: int):
+    """
+    Aplica ordenação, posição do cursor e limite a um select
+
+    Pede limit + 1 linhas: a linha a mais indica que existe página seguinte.
+    """
+    statement = statement.order_by(None).order_by(*ordem)
+    if cursor:
+        statement = statement.where(after_position(ordem, decode_cursor(cursor, ordem)))
+    return statement.limit(limit + 1)
+
+
+def make_page(
+    linhas: Sequence[T],
+    ordem: Sequence,
+    limit: int,
+    chave: Optional[Callable[[T], Any]] = None
+) -> Page[T]:
+    """
+    Página a partir do resultado de paginate() (limit + 1 linhas)
+
+    chave dá o objeto com as colunas da ordenação quando a linha não é o
+    próprio modelo (p. ex. lambda linha: linha[0] para (modelo, contagem)).
+    """
+    items = list(linhas[:limit])
+    if len(linhas) <= limit:
+        return Page(items=items)
+    ultima = items[-1] if chave is None else chave(items[-1])
+    valores = [getattr(ultima, _column(expressao)[0].key) for expressao in ordem]
+    return Page(items=items, next_cursor=encode_cursor(valores))
+
+
+def set_next_cursor(response: Response, page: Page):
+    """Expõe o cursor da página seguinte no header X-Next-Cursor (ausente na última página)"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
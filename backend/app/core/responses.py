@@ -0,0 +1,71 @@
+"""
+Resposta JSON rápida, usada como default_response_class da aplicação
+
+Serializa com orjson quando está instalado (datetime, date, enum e dataclasses
+nativos, em C) e, sem ele, com o json da biblioteca padrão e o mesmo
+tratamento de tipos. Rotas que devolvem dicts grandes construídos à mão podem
+devolver FastJSONResponse diretamente e saltar o jsonable_encoder.
+"""
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional: fallback para a biblioteca padrão
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que nem o orjson nem o json serializam por si"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON compacto em UTF-8"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match do pedido corresponde ao ETag atual (comparação fraca, aceita listas e *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    valor = etag.removeprefix("W/")
+    return any(candidato.strip().removeprefix("W/") == valor for candidato in if_none_match.split(","))
+
+
+def not_modified(headers: dict) -> Response:
+    """304 sem corpo, com os mesmos headers de cache da resposta completa"""
+    return Response(status_code=304, headers=headers)
@@ -1,39 +1,146 @@
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a password está correta"""
+class PasswordHasherBusy(Exception):
+    """O pool de hashing tem demasiados pedidos pendentes"""
+
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica se a password está correta (corre no pool de processos)"""
     try:
         # Verificar se o hash é válido
         if not hashed_password or not plain_password:
             return False
         # Usar bcrypt diretamente para evitar problemas com passlib
         return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
+            plain_password.encode('utf-8')[:72],
             hashed_password.encode('utf-8')
         )
     except Exception:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Gera hash da password"""
+def _hash_password(password: str, rounds: int) -> str:
+    """Gera hash da password (corre no pool de processos)"""
     # Garantir que a senha não exceda 72 bytes (limite do bcrypt)
     if isinstance(password, str):
         password_bytes = password.encode('utf-8')
         if len(password_bytes) > 72:
             password_bytes = password_bytes[:72]
         # Usar bcrypt diretamente
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
     return password
 
 
+# Pool de processos para o bcrypt: o trabalho de CPU não ocupa o threadpool
+# nem o event loop, e o número de pedidos pendentes é limitado
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pendentes = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_password_pool():
+    """Termina o pool de processos (shutdown da aplicação)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _submit(fn, *args) -> Future:
+    if not _pendentes.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        pool = _get_pool()
+        if pool is None:
+            future = Future()
+            future.set_result(fn(*args))
+        else:
+            future = pool.submit(fn, *args)
+    except BaseException:
+        _pendentes.release()
+        raise
+    future.add_done_callback(lambda _: _pendentes.release())
+    return future
+
+
+# Marcador de password inutilizável (contas guest): nunca é um hash bcrypt
+# válido, por isso nenhuma password o satisfaz e não há derivação de chave
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
+def make_unusable_password() -> str:
+    """Valor a guardar em User.password para contas sem password (guest)"""
+    return UNUSABLE_PASSWORD_PREFIX
+
+
+def has_usable_password(hashed_password: Optional[str]) -> bool:
+    """False para contas guest ainda não reclamadas"""
+    return bool(hashed_password) and not hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica se a password está correta"""
+    if not has_usable_password(hashed_password):
+        return False
+    return _submit(_check_password, plain_password, hashed_password).result()
+
+
+def get_password_hash(password: str) -> str:
+    """Gera hash da password"""
+    return _submit(_hash_password, password, settings.BCRYPT_ROUNDS).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica a password sem bloquear o event loop"""
+    if not has_usable_password(hashed_password):
+        return False
+    return await asyncio.wrap_future(_submit(_check_password, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Gera hash da password sem bloquear o event loop"""
+    return await asyncio.wrap_future(_submit(_hash_password, password, settings.BCRYPT_ROUNDS))
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Indica se o hash foi gerado com um custo diferente do configurado"""
+    try:
+        # Formato: $2b$<custo>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return False
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria token JWT"""
     to_encode = data.copy()
@@ -46,11 +153,93 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
-    """Decodifica token JWT"""
+def create_token_pair(claims: dict) -> dict:
+    """Access token curto com as claims do utilizador e refresh token para o renovar"""
+    access_token = create_access_token(
+        data={**claims, "jti": uuid.uuid4().hex},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = create_access_token(
+        data={"sub": claims["sub"], "uid": claims.get("uid"), "purpose": "refresh", "jti": uuid.uuid4().hex},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+def create_claim_token(email: str) -> str:
+    """Token de uso único para uma conta guest definir a sua password"""
+    return create_access_token(
+        data={"sub": email, "purpose": "claim"},
+        expires_delta=timedelta(hours=settings.CLAIM_TOKEN_EXPIRE_HOURS)
+    )
+
+
+def decode_claim_token(token: str) -> Optional[str]:
+    """Devolve o email de um token de claim válido"""
+    payload = _decode_token(token)
+    if not payload or payload.get("purpose") != "claim":
+        return None
+    return payload.get("sub")
+
+
+def _decode_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
 
+
+# Tokens revogados (logout, refresh já usado): jti -> expiração do token.
+# Em memória e por processo; as entradas saem quando o token expiraria, por
+# isso o conjunto não cresce além dos tokens ainda válidos
+_revogados: dict = {}
+_revogados_lock = threading.Lock()
+
+
+def revoke_token(payload: dict):
+    """Revoga um token (payload já decodificado) até à sua expiração"""
+    jti = payload.get("jti")
+    if not jti:
+        return
+    agora = time.time()
+    with _revogados_lock:
+        _revogados[jti] = payload.get("exp", agora)
+        for chave in [k for k, exp in _revogados.items() if exp < agora]:
+            del _revogados[chave]
+
+
+def is_token_revoked(payload: dict) -> bool:
+    jti = payload.get("jti")
+    return bool(jti) and jti in _revogados
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """Decodifica token JWT"""
+    payload = _decode_token(token)
+    # Tokens com finalidade específica (ex.: claim, refresh) não servem para autenticar
+    if payload is None or payload.get("purpose") or is_token_revoked(payload):
+        return None
+    return payload
+
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    """Decodifica um refresh token válido e não revogado"""
+    payload = _decode_token(token)
+    if payload is None or payload.get("purpose") != "refresh" or is_token_revoked(payload):
+        return None
+    return payload
+
+
+def create_access_key() -> Tuple[str, str]:
+    """Chave de acesso aleatória a entregar ao cliente e o hash a guardar"""
+    chave = secrets.token_urlsafe(32)
+    return chave, hash_access_key(chave)
+
+
+def hash_access_key(chave: str) -> str:
+    return hashlib.sha256(chave.encode("utf-8")).hexdigest()
+
+
+def verify_access_key(chave: Optional[str], chave_hash: Optional[str]) -> bool:
+    """Compara (em tempo constante) a chave recebida com o hash guardado"""
+    return bool(chave and chave_hash) and hmac.compare_digest(hash_access_key(chave), chave_hash)
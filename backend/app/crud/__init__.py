@@ -1,4 +1,4 @@
-from app.crud import user, empresa, fornecedor, atividade, reserva, itinerario, rfq, proposta, mensagem, documento, nota_evento, pagamento
+from app.crud import user, empresa, fornecedor, atividade, reserva, itinerario, rfq, proposta, mensagem, documento, nota_evento, pagamento, evento, email_outbox
 
-__all__ = ["user", "empresa", "fornecedor", "atividade", "reserva", "itinerario", "rfq", "proposta", "mensagem", "documento", "nota_evento", "pagamento"]
+__all__ = ["user", "empresa", "fornecedor", "atividade", "reserva", "itinerario", "rfq", "proposta", "mensagem", "documento", "nota_evento", "pagamento", "evento", "email_outbox"]
 
@@ -0,0 +1,3 @@
+from app.crud.aio import user, atividade, reserva, mensagem
+
+__all__ = ["user", "atividade", "reserva", "mensagem"]
@@ -0,0 +1,64 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.pagination import Page, paginate, make_page
+from app.models.atividade import Atividade
+from app.crud.atividade import ORDEM_ATIVIDADES
+
+
+async def get_atividade(db: AsyncSession, atividade_id: int) -> Optional[Atividade]:
+    """Busca atividade por ID"""
+    return await db.get(Atividade, atividade_id)
+
+
+async def get_atividades(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Page[Atividade]:
+    """Lista atividades (paginação por cursor)"""
+    result = await db.scalars(paginate(select(Atividade), ORDEM_ATIVIDADES, cursor, limit))
+    return make_page(result.all(), ORDEM_ATIVIDADES, limit)
+
+
+async def get_atividades_by_fornecedor(db: AsyncSession, fornecedor_id: int) -> List[Atividade]:
+    """Lista atividades de um fornecedor"""
+    result = await db.scalars(select(Atividade).where(Atividade.fornecedor_id == fornecedor_id))
+    return result.all()
+
+
+async def get_atividades_recomendadas(
+    db: AsyncSession,
+    n_pessoas: int,
+    orcamento: Optional[float] = None,
+    localizacao: Optional[str] = None,
+    tipo_empresa: Optional[str] = None,
+    categoria: Optional[str] = None,
+    clima: Optional[str] = None,
+    duracao_max: Optional[int] = None
+) -> List[Atividade]:
+    """Busca atividades recomendadas baseado em critérios"""
+    # Apenas atividades aprovadas
+    query = select(Atividade).where(
+        Atividade.capacidade_max >= n_pessoas,
+        Atividade.aprovada == True
+    )
+    
+    if orcamento:
+        query = query.where(Atividade.preco_por_pessoa <= orcamento)
+    
+    if localizacao:
+        query = query.where(Atividade.localizacao.ilike(f"%{localizacao}%"))
+    
+    if categoria:
+        query = query.where(Atividade.categoria.ilike(f"%{categoria}%"))
+    
+    if clima:
+        query = query.where(Atividade.clima.ilike(f"%{clima}%"))
+    
+    if duracao_max:
+        query = query.where(Atividade.duracao_minutos <= duracao_max)
+    
+    # Ordenar por rating médio (maior primeiro), depois por preço
+    result = await db.scalars(query.order_by(
+        Atividade.rating_medio.desc(),
+        Atividade.preco_por_pessoa
+    ).limit(20))
+    
+    return result.all()
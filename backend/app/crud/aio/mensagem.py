@@ -0,0 +1,60 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.core.pagination import Page
+from app.models.mensagem import Mensagem
+from app.crud.mensagem import (
+    select_mensagens_pagina,
+    make_page_mensagens,
+    update_marcar_lidas,
+    incrementar_por_ler,
+    descontar_por_ler,
+    select_por_ler
+)
+from app.schemas.mensagem import MensagemCreate
+
+
+async def create_mensagem(db: AsyncSession, mensagem: MensagemCreate, remetente_id: int) -> Mensagem:
+    """Cria nova mensagem"""
+    db_mensagem = Mensagem(
+        remetente_id=remetente_id,
+        **mensagem.dict()
+    )
+    db.add(db_mensagem)
+    await db.execute(incrementar_por_ler(db.get_bind().dialect.name, mensagem.destinatario_id, mensagem.reserva_id))
+    await db.commit()
+    await db.refresh(db_mensagem)
+    return db_mensagem
+
+
+async def get_mensagens_by_reserva(
+    db: AsyncSession,
+    reserva_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    desde: Optional[int] = None,
+    antes_de: Optional[int] = None,
+    recentes: bool = False
+) -> Page[Mensagem]:
+    """Lista mensagens de uma reserva (com remetente carregado, paginação keyset)"""
+    statement = select_mensagens_pagina(reserva_id, cursor, limit, desde, antes_de, recentes)
+    result = await db.scalars(statement)
+    return make_page_mensagens(result.all(), limit, antes_de is not None or recentes)
+
+
+async def marcar_lidas_ate(db: AsyncSession, reserva_id: int, destinatario_id: int, ate_id: int) -> int:
+    """
+    Marca como lidas, num só UPDATE, as mensagens recebidas até ate_id; devolve quantas
+
+    O contador de mensagens por ler desce na mesma transação.
+    """
+    marcadas = (await db.execute(update_marcar_lidas(reserva_id, destinatario_id, ate_id))).rowcount
+    if marcadas:
+        await db.execute(descontar_por_ler(destinatario_id, reserva_id, marcadas))
+    await db.commit()
+    return marcadas
+
+
+async def get_por_ler(db: AsyncSession, destinatario_id: int) -> List[Tuple[int, int]]:
+    """(reserva_id, por_ler) das reservas com mensagens por ler do utilizador"""
+    result = await db.execute(select_por_ler(destinatario_id))
+    return [tuple(linha) for linha in result]
@@ -0,0 +1,62 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.pagination import Page, paginate, make_page
+from app.models.reserva import Reserva, EstadoReserva
+from app.models.atividade import Atividade
+from app.crud.reserva import select_reserva_detalhe, select_reservas_empresa, ORDEM_RESERVAS_EMPRESA
+from app.schemas.reserva import ReservaCreate
+
+
+async def get_reserva(db: AsyncSession, reserva_id: int) -> Optional[Reserva]:
+    """Busca reserva por ID (com empresa e atividade/fornecedor carregados)"""
+    return await db.scalar(select_reserva_detalhe(reserva_id))
+
+
+async def get_reservas_by_empresa(
+    db: AsyncSession,
+    empresa_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[Reserva]:
+    """Lista reservas de uma empresa (com atividade carregada, paginação por cursor)"""
+    statement = paginate(select_reservas_empresa(empresa_id), ORDEM_RESERVAS_EMPRESA, cursor, limit)
+    result = await db.scalars(statement)
+    return make_page(result.all(), ORDEM_RESERVAS_EMPRESA, limit)
+
+
+async def create_reserva(
+    db: AsyncSession,
+    reserva: ReservaCreate,
+    empresa_id: int,
+    preco_total: Optional[float] = None,
+    proposta_id: Optional[int] = None
+) -> Optional[Reserva]:
+    """Cria nova reserva"""
+    if reserva.atividade_id:
+        atividade = await db.get(Atividade, reserva.atividade_id)
+        if not atividade:
+            return None
+        
+        # Verificar capacidade
+        if atividade.capacidade_max < reserva.n_pessoas:
+            return None
+        
+        # Calcular preço se não fornecido
+        if preco_total is None:
+            preco_total = atividade.preco_por_pessoa * reserva.n_pessoas
+    elif preco_total is None:
+        return None  # Preço deve ser fornecido
+    
+    db_reserva = Reserva(
+        empresa_id=empresa_id,
+        atividade_id=reserva.atividade_id,
+        proposta_id=proposta_id,
+        data=reserva.data,
+        n_pessoas=reserva.n_pessoas,
+        preco_total=preco_total,
+        estado=EstadoReserva.PENDENTE
+    )
+    db.add(db_reserva)
+    await db.commit()
+    await db.refresh(db_reserva, ["atividade"])
+    return db_reserva
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.models.user import User, TipoUsuario
+from app.core.security import get_password_hash_async, verify_password_async, password_needs_rehash, has_usable_password
+from app.core.identity import invalidate_identity
+from app.schemas.user import UserCreate
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Busca utilizador por email"""
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Busca utilizador por ID"""
+    return await db.get(User, user_id)
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """Cria novo utilizador"""
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = User(
+        nome=user.nome,
+        email=user.email,
+        password=hashed_password,
+        tipo=TipoUsuario(user.tipo)
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Autentica utilizador (refaz o hash se o custo do bcrypt mudou)"""
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.password):
+        return None
+    if password_needs_rehash(user.password):
+        user.password = await get_password_hash_async(password)
+        await db.commit()
+        invalidate_identity(user.id)
+    return user
+
+
+async def claim_guest_user(db: AsyncSession, email: str, password: str, nome: Optional[str] = None) -> Optional[User]:
+    """Define a password de uma conta guest. Devolve None se não for guest."""
+    user = await get_user_by_email(db, email)
+    if not user or has_usable_password(user.password):
+        return None
+    user.password = await get_password_hash_async(password)
+    if nome:
+        user.nome = nome
+    await db.commit()
+    invalidate_identity(user.id)
+    return user
@@ -1,7 +1,11 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from app.models.atividade import Atividade
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.sql import Select
+from typing import Iterable, List, Optional
+from sqlalchemy.engine import Row
+from app.core.catalogo import invalidar_catalogo
+from app.core.pagination import Page, paginate, make_page
+from app.models.atividade import Atividade, EstadoAtividade
 from app.schemas.atividade import AtividadeCreate, AtividadeUpdate
 
 
@@ -10,9 +14,14 @@ def get_atividade(db: Session, atividade_id: int) -> Optional[Atividade]:
     return db.query(Atividade).filter(Atividade.id == atividade_id).first()
 
 
-def get_atividades(db: Session, skip: int = 0, limit: int = 100):
-    """Lista atividades"""
-    return db.query(Atividade).offset(skip).limit(limit).all()
+# Ordem estável das listagens paginadas de atividades
+ORDEM_ATIVIDADES = (Atividade.id,)
+
+
+def get_atividades(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[Atividade]:
+    """Lista atividades (paginação por cursor)"""
+    statement = paginate(select(Atividade), ORDEM_ATIVIDADES, cursor, limit)
+    return make_page(db.scalars(statement).all(), ORDEM_ATIVIDADES, limit)
 
 
 def get_atividades_by_fornecedor(db: Session, fornecedor_id: int):
@@ -24,6 +33,7 @@ def create_atividade(db: Session, atividade: AtividadeCreate, fornecedor_id: int
     """Cria nova atividade"""
     db_atividade = Atividade(**atividade.dict(), fornecedor_id=fornecedor_id)
     db.add(db_atividade)
+    invalidar_catalogo(db)
     db.commit()
     db.refresh(db_atividade)
     return db_atividade
@@ -37,6 +47,7 @@ def update_atividade(db: Session, atividade_id: int, atividade_update: Atividade
     update_data = atividade_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_atividade, key, value)
+    invalidar_catalogo(db)
     db.commit()
     db.refresh(db_atividade)
     return db_atividade
@@ -48,6 +59,7 @@ def delete_atividade(db: Session, atividade_id: int) -> bool:
     if not db_atividade:
         return False
     db.delete(db_atividade)
+    invalidar_catalogo(db)
     db.commit()
     return True
 
@@ -92,3 +104,111 @@ def get_atividades_recomendadas(
     
     return atividades
 
+
+
+# Tipos de atividade do brief de evento (CriarEventoForm) -> (coluna, valores) do catálogo
+TIPOS_EVENTO = {
+    "aventuras": ("categoria", ("aventura", "esporte")),
+    "artes": ("categoria", ("cultural",)),
+    "workshops": ("categoria", ("cultural", "gastronomia")),
+    "outdoor": ("clima", ("outdoor", "ambos")),
+    "indoor": ("clima", ("indoor", "ambos")),
+}
+
+# Pontuação das candidatas, além de 1 por tipo correspondido e rating / 5
+PONTOS_LOCALIZACAO = 2
+PONTOS_FAIXA_PRECO = 2
+
+
+def condicao_tipo_evento(tipo: str):
+    """Condição de um tipo do brief; tipos desconhecidos procuram-se na categoria e no tipo"""
+    tipo = tipo.strip().lower()
+    if tipo in TIPOS_EVENTO:
+        coluna, valores = TIPOS_EVENTO[tipo]
+        return getattr(Atividade, coluna).in_(valores)
+    return or_(
+        func.lower(Atividade.categoria).contains(tipo, autoescape=True),
+        func.lower(Atividade.tipo).contains(tipo, autoescape=True)
+    )
+
+
+def select_atividades_candidatas(
+    n_pessoas: int,
+    tipos: List[str],
+    localizacao: Optional[str] = None,
+    preco_min: Optional[float] = None,
+    preco_max: Optional[float] = None,
+    limit: int = 10
+) -> Select:
+    """
+    Atividades aprovadas com capacidade para o grupo e de algum dos tipos
+    pedidos, ordenadas por pontuação:
+      - 1 por cada tipo pedido a que a atividade corresponde
+      - PONTOS_LOCALIZACAO se a localização é a do evento
+      - PONTOS_FAIXA_PRECO se o preço por pessoa está na faixa [preco_min, preco_max)
+      - rating médio / 5 (0 a 1)
+    A localização e o preço só ordenam: um brief sem atividades na sua cidade
+    ou faixa de preço continua a ter candidatas.
+    """
+    condicoes_tipo = [condicao_tipo_evento(tipo) for tipo in tipos if tipo.strip()]
+    statement = select(Atividade).where(
+        Atividade.estado == EstadoAtividade.APROVADA,
+        Atividade.capacidade_max >= n_pessoas
+    )
+    if condicoes_tipo:
+        statement = statement.where(or_(*condicoes_tipo))
+
+    pontos = [case((condicao, 1), else_=0) for condicao in condicoes_tipo]
+    if localizacao and localizacao.strip():
+        pontos.append(case((func.lower(Atividade.localizacao) == localizacao.strip().lower(), PONTOS_LOCALIZACAO), else_=0))
+    faixa = []
+    if preco_min is not None:
+        faixa.append(Atividade.preco_por_pessoa >= preco_min)
+    if preco_max is not None:
+        faixa.append(Atividade.preco_por_pessoa < preco_max)
+    if faixa:
+        pontos.append(case((and_(*faixa), PONTOS_FAIXA_PRECO), else_=0))
+    pontuacao = sum(pontos, func.coalesce(Atividade.rating_medio, 0.0) / 5)
+
+    return (
+        statement
+        .options(joinedload(Atividade.fornecedor))
+        .order_by(pontuacao.desc(), Atividade.preco_por_pessoa, Atividade.id)
+        .limit(limit)
+    )
+
+
+def get_atividades_candidatas(
+    db: Session,
+    n_pessoas: int,
+    tipos: List[str],
+    localizacao: Optional[str] = None,
+    preco_min: Optional[float] = None,
+    preco_max: Optional[float] = None,
+    limit: int = 10
+) -> List[Atividade]:
+    """Melhores atividades para um brief de evento, com o fornecedor carregado (uma só query)"""
+    statement = select_atividades_candidatas(n_pessoas, tipos, localizacao, preco_min, preco_max, limit)
+    return db.scalars(statement).all()
+
+
+def get_atividades_com_fornecedor(db: Session, ids: Iterable[int]) -> List[Atividade]:
+    """Atividades pelos ids, com o fornecedor carregado (uma só query)"""
+    ids = list(ids)
+    if not ids:
+        return []
+    return db.scalars(
+        select(Atividade).options(joinedload(Atividade.fornecedor)).where(Atividade.id.in_(ids))
+    ).all()
+
+
+def get_colunas_catalogo(db: Session) -> List[Row]:
+    """Colunas das atividades aprovadas usadas na pontuação das propostas"""
+    return db.execute(
+        select(
+            Atividade.id, Atividade.preco_por_pessoa, Atividade.capacidade_max, Atividade.duracao_minutos,
+            Atividade.rating_medio, Atividade.categoria, Atividade.tipo, Atividade.clima, Atividade.localizacao
+        )
+        .where(Atividade.estado == EstadoAtividade.APROVADA)
+        .order_by(Atividade.id)
+    ).all()
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from typing import Optional, List
+from app.core.pagination import Page, paginate, make_page
 from app.models.avaliacao import Avaliacao
 from app.models.atividade import Atividade
 from app.schemas.avaliacao import AvaliacaoCreate
@@ -37,9 +38,16 @@ def create_avaliacao(db: Session, avaliacao: AvaliacaoCreate, empresa_id: int) -
     return db_avaliacao
 
 
-def get_avaliacoes_by_atividade(db: Session, atividade_id: int) -> List[Avaliacao]:
-    """Lista avaliações de uma atividade"""
-    return db.query(Avaliacao).filter(Avaliacao.atividade_id == atividade_id).all()
+def get_avaliacoes_by_atividade(
+    db: Session,
+    atividade_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[Avaliacao]:
+    """Lista avaliações de uma atividade, mais recentes primeiro (paginação por cursor)"""
+    ordem = (Avaliacao.data_criacao.desc(), Avaliacao.id.desc())
+    statement = paginate(select(Avaliacao).where(Avaliacao.atividade_id == atividade_id), ordem, cursor, limit)
+    return make_page(db.scalars(statement).all(), ordem, limit)
 
 
 def get_avaliacoes_by_fornecedor(db: Session, fornecedor_id: int) -> List[Avaliacao]:
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.models.documento import Documento
 from app.schemas.documento import DocumentoCreate
@@ -16,11 +17,19 @@ def create_documento(db: Session, documento: DocumentoCreate, uploaded_by_id: in
     return db_documento
 
 
+def select_documentos_reserva(reserva_id: int):
+    """Documentos de uma reserva com quem os carregou (uploaded_by_nome)"""
+    return (
+        select(Documento)
+        .where(Documento.reserva_id == reserva_id)
+        .options(joinedload(Documento.uploaded_by))
+        .order_by(Documento.data_upload.desc())
+    )
+
+
 def get_documentos_by_reserva(db: Session, reserva_id: int) -> List[Documento]:
     """Lista documentos de uma reserva"""
-    return db.query(Documento).filter(
-        Documento.reserva_id == reserva_id
-    ).order_by(Documento.data_upload.desc()).all()
+    return db.scalars(select_documentos_reserva(reserva_id)).all()
 
 
 def delete_documento(db: Session, documento_id: int) -> bool:
@@ -0,0 +1,121 @@
+"""
+Fila de envio de emails (email_outbox)
+
+Os pedidos só inserem o email (enfileirar); o envio fica para o dispatcher de
+services/email_outbox.py, que reserva lotes com reservar_lote e regista o
+resultado de cada email.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from app.core.pagination import Page, paginate, make_page
+from app.models.email_outbox import EmailOutbox, EstadoEmail
+
+
+def enfileirar(db: Session, destinatario: str, assunto: str, html: str, texto: Optional[str] = None) -> int:
+    """Põe um email na fila de envio; devolve o id"""
+    email = EmailOutbox(destinatario=destinatario, assunto=assunto, html=html, texto=texto)
+    db.add(email)
+    db.flush()
+    email_id = email.id
+    db.commit()
+    return email_id
+
+
+def enfileirar_lote(db: Session, emails: List[Tuple[str, str, str, Optional[str]]]):
+    """Põe vários emails (destinatario, assunto, html, texto) na fila num só INSERT"""
+    if not emails:
+        return
+    db.execute(insert(EmailOutbox), [
+        {"destinatario": destinatario, "assunto": assunto, "html": html, "texto": texto}
+        for destinatario, assunto, html, texto in emails
+    ])
+    db.commit()
+
+
+def reservar_lote(db: Session, limite: int, lease_segundos: int) -> List[Row]:
+    """
+    Reserva até `limite` emails pendentes cuja próxima tentativa já passou
+
+    Num só UPDATE: conta a tentativa e adia a próxima para o fim do lease, para
+    que nenhum outro worker pegue nos mesmos emails enquanto são enviados. Se
+    o worker morrer a meio, os emails voltam à fila quando o lease expira. No
+    PostgreSQL, SKIP LOCKED deixa vários workers reservar lotes em paralelo.
+    """
+    agora = datetime.utcnow()
+    pendentes = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.estado == EstadoEmail.PENDENTE, EmailOutbox.proxima_tentativa <= agora)
+        .order_by(EmailOutbox.proxima_tentativa, EmailOutbox.id)
+        .limit(limite)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(pendentes.scalar_subquery()))
+        .values(tentativas=EmailOutbox.tentativas + 1, proxima_tentativa=agora + timedelta(seconds=lease_segundos))
+        .returning(
+            EmailOutbox.id, EmailOutbox.destinatario, EmailOutbox.assunto,
+            EmailOutbox.html, EmailOutbox.texto, EmailOutbox.tentativas
+        )
+        .execution_options(synchronize_session=False)
+    )
+    emails = db.execute(statement).all()
+    db.commit()
+    return sorted(emails, key=lambda email: email.id)
+
+
+def marcar_enviados(db: Session, ids: List[int]):
+    """Marca os emails como enviados"""
+    if not ids:
+        return
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(ids))
+        .values(estado=EstadoEmail.ENVIADO, data_envio=datetime.utcnow(), ultimo_erro=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def registar_falha(db: Session, email_id: int, erro: str, proxima_tentativa: Optional[datetime]):
+    """Agenda nova tentativa do email, ou passa-o a FALHADO (dead-letter) se proxima_tentativa for None"""
+    valores = {"ultimo_erro": erro}
+    if proxima_tentativa is None:
+        valores["estado"] = EstadoEmail.FALHADO
+    else:
+        valores["proxima_tentativa"] = proxima_tentativa
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(**valores)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# Dead-letter, mais recentes primeiro
+ORDEM_FALHADOS = (EmailOutbox.id.desc(),)
+
+
+def get_falhados(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[EmailOutbox]:
+    """Lista os emails que falharam em definitivo (paginação por cursor)"""
+    statement = paginate(
+        select(EmailOutbox).where(EmailOutbox.estado == EstadoEmail.FALHADO),
+        ORDEM_FALHADOS, cursor, limit
+    )
+    return make_page(db.scalars(statement).all(), ORDEM_FALHADOS, limit)
+
+
+def reenviar(db: Session, email_id: int) -> bool:
+    """Devolve um email FALHADO à fila, com as tentativas a zero"""
+    result = db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id, EmailOutbox.estado == EstadoEmail.FALHADO)
+        .values(estado=EstadoEmail.PENDENTE, tentativas=0, proxima_tentativa=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
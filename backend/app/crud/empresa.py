@@ -1,6 +1,9 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional
+from app.core.pagination import Page, paginate, make_page
 from app.models.empresa import Empresa
+from app.core.identity import invalidate_identity
 from app.schemas.empresa import EmpresaCreate, EmpresaUpdate
 
 
@@ -14,9 +17,11 @@ def get_empresa_by_user_id(db: Session, user_id: int) -> Optional[Empresa]:
     return db.query(Empresa).filter(Empresa.user_id == user_id).first()
 
 
-def get_empresas(db: Session, skip: int = 0, limit: int = 100):
-    """Lista empresas"""
-    return db.query(Empresa).offset(skip).limit(limit).all()
+def get_empresas(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[Empresa]:
+    """Lista empresas (paginação por cursor)"""
+    ordem = (Empresa.id,)
+    statement = paginate(select(Empresa), ordem, cursor, limit)
+    return make_page(db.scalars(statement).all(), ordem, limit)
 
 
 def create_empresa(db: Session, empresa: EmpresaCreate, user_id: int) -> Empresa:
@@ -25,6 +30,7 @@ def create_empresa(db: Session, empresa: EmpresaCreate, user_id: int) -> Empresa
     db.add(db_empresa)
     db.commit()
     db.refresh(db_empresa)
+    invalidate_identity(db_empresa.user_id)
     return db_empresa
 
 
@@ -38,6 +44,7 @@ def update_empresa(db: Session, empresa_id: int, empresa_update: EmpresaUpdate)
         setattr(db_empresa, key, value)
     db.commit()
     db.refresh(db_empresa)
+    invalidate_identity(db_empresa.user_id)
     return db_empresa
 
 
@@ -46,7 +53,9 @@ def delete_empresa(db: Session, empresa_id: int) -> bool:
     db_empresa = get_empresa(db, empresa_id)
     if not db_empresa:
         return False
+    user_id = db_empresa.user_id
     db.delete(db_empresa)
     db.commit()
+    invalidate_identity(user_id)
     return True
 
@@ -0,0 +1,175 @@
+"""
+Dossier do evento (GET /evento/{reserva_id}) em duas queries
+
+1. select_dossier: a reserva com empresa/atividade/fornecedor/users (permissões
+   e cabeçalho do dossier) e, em subqueries escalares sobre os índices
+   (reserva_id, ...), os marcadores de alteração de mensagens, documentos e
+   notas. A versão do dossier (ETag) sai só desta query: um poll sem alterações
+   fica por aqui.
+2. select_dossier_itens: mensagens, documentos e notas num só UNION ALL, com o
+   nome do autor por JOIN.
+"""
+import hashlib
+from typing import List, Optional, Tuple
+from sqlalchemy import DateTime, Integer, String, Boolean, func, literal, null, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+from app.crud.reserva import select_reserva_detalhe
+from app.models.reserva import Reserva
+from app.models.mensagem import Mensagem
+from app.models.documento import Documento
+from app.models.nota_evento import NotaEvento
+from app.models.user import User
+
+
+def _nulo(tipo):
+    """NULL com tipo, para as colunas que um ramo do UNION não tem"""
+    return type_coerce(null(), tipo)
+
+
+def select_dossier(reserva_id: int):
+    """Reserva com as partes do evento e os marcadores de alteração dos itens"""
+    def escalar(*colunas, modelo):
+        return select(*colunas).where(modelo.reserva_id == Reserva.id).correlate(Reserva).scalar_subquery()
+
+    return select_reserva_detalhe(reserva_id).add_columns(
+        escalar(func.count(Mensagem.id), modelo=Mensagem),
+        escalar(func.max(Mensagem.data_criacao), modelo=Mensagem),
+        # Marcar como lida não muda timestamps: conta as lidas
+        escalar(func.count(Mensagem.id).filter(Mensagem.lida == True), modelo=Mensagem),  # noqa: indice
+        escalar(func.count(Documento.id), modelo=Documento),
+        escalar(func.max(Documento.data_upload), modelo=Documento),
+        escalar(func.count(NotaEvento.id), modelo=NotaEvento),
+        escalar(func.max(NotaEvento.data_atualizacao), modelo=NotaEvento),
+    )
+
+
+def _versao(reserva: Reserva, marcadores: tuple) -> str:
+    """Hash de tudo o que o dossier mostra: campos carregados + marcadores dos itens"""
+    empresa = reserva.empresa
+    atividade = reserva.atividade
+    fornecedor = atividade.fornecedor if atividade else None
+    partes = (
+        reserva.id, reserva.data, reserva.n_pessoas, reserva.preco_total, reserva.estado, reserva.data_criacao,
+        atividade and (atividade.id, atividade.nome, atividade.tipo, atividade.localizacao, atividade.preco_por_pessoa),
+        empresa and (empresa.id, empresa.nome, empresa.localizacao, empresa.user.email, empresa.user.nome),
+        fornecedor and (
+            fornecedor.id, fornecedor.nome, fornecedor.localizacao, fornecedor.contacto,
+            fornecedor.user.email, fornecedor.user.nome
+        ),
+        marcadores
+    )
+    return hashlib.blake2b(repr(partes).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_dossier(db: Session, reserva_id: int) -> Optional[Tuple[Reserva, str]]:
+    """Reserva (com as partes do evento) e a versão atual do dossier"""
+    linha = db.execute(select_dossier(reserva_id)).first()
+    if linha is None:
+        return None
+    reserva, *marcadores = linha
+    return reserva, _versao(reserva, tuple(marcadores))
+
+
+def select_dossier_itens(reserva_id: int):
+    """Mensagens, documentos e notas da reserva num só UNION ALL (colunas genéricas por posição)"""
+    # O primeiro ramo define os tipos das colunas do resultado: todas tipadas
+    mensagens = (
+        select(
+            literal("mensagem").label("item"),
+            Mensagem.id.label("id"),
+            Mensagem.remetente_id.label("autor_id"),
+            User.nome.label("autor_nome"),
+            Mensagem.destinatario_id.label("destinatario_id"),
+            Mensagem.lida.label("lida"),
+            Mensagem.conteudo.label("texto_1"),
+            _nulo(String).label("texto_2"),
+            _nulo(String).label("texto_3"),
+            _nulo(String).label("texto_4"),
+            Mensagem.data_criacao.label("data_1"),
+            _nulo(DateTime).label("data_2"),
+        )
+        .join(User, User.id == Mensagem.remetente_id)
+        .where(Mensagem.reserva_id == reserva_id)
+    )
+    documentos = (
+        select(
+            literal("documento"),
+            Documento.id,
+            Documento.uploaded_by_id,
+            User.nome,
+            _nulo(Integer),
+            _nulo(Boolean),
+            Documento.nome,
+            Documento.url,
+            Documento.tipo,
+            Documento.descricao,
+            Documento.data_upload,
+            _nulo(DateTime),
+        )
+        .join(User, User.id == Documento.uploaded_by_id)
+        .where(Documento.reserva_id == reserva_id)
+    )
+    notas = (
+        select(
+            literal("nota"),
+            NotaEvento.id,
+            NotaEvento.criado_por_id,
+            User.nome,
+            _nulo(Integer),
+            _nulo(Boolean),
+            NotaEvento.titulo,
+            NotaEvento.conteudo,
+            _nulo(String),
+            _nulo(String),
+            NotaEvento.data_criacao,
+            NotaEvento.data_atualizacao,
+        )
+        .join(User, User.id == NotaEvento.criado_por_id)
+        .where(NotaEvento.reserva_id == reserva_id)
+    )
+    uniao = union_all(mensagens, documentos, notas).subquery()
+    return select(uniao).order_by(uniao.c.data_1, uniao.c.id)
+
+
+def get_dossier_itens(db: Session, reserva_id: int) -> Tuple[List[dict], List[dict], List[dict]]:
+    """
+    Mensagens (cronológicas), documentos e notas (mais recentes primeiro) da reserva
+
+    Cada item é um dict com os nomes de campo do respetivo modelo e o nome do autor.
+    """
+    mensagens, documentos, notas = [], [], []
+    for linha in db.execute(select_dossier_itens(reserva_id)):
+        if linha.item == "mensagem":
+            mensagens.append({
+                "id": linha.id,
+                "remetente_id": linha.autor_id,
+                "destinatario_id": linha.destinatario_id,
+                "conteudo": linha.texto_1,
+                "lida": linha.lida,
+                "data_criacao": linha.data_1,
+                "remetente_nome": linha.autor_nome
+            })
+        elif linha.item == "documento":
+            documentos.append({
+                "id": linha.id,
+                "nome": linha.texto_1,
+                "url": linha.texto_2,
+                "tipo": linha.texto_3,
+                "descricao": linha.texto_4,
+                "uploaded_by_id": linha.autor_id,
+                "data_upload": linha.data_1,
+                "uploaded_by_nome": linha.autor_nome
+            })
+        else:
+            notas.append({
+                "id": linha.id,
+                "titulo": linha.texto_1,
+                "conteudo": linha.texto_2,
+                "criado_por_id": linha.autor_id,
+                "data_criacao": linha.data_1,
+                "data_atualizacao": linha.data_2,
+                "criado_por_nome": linha.autor_nome
+            })
+    documentos.reverse()
+    notas.reverse()
+    return mensagens, documentos, notas
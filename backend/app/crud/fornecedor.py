@@ -1,6 +1,9 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional
+from app.core.pagination import Page, paginate, make_page
 from app.models.fornecedor import Fornecedor
+from app.core.identity import invalidate_identity
 from app.schemas.fornecedor import FornecedorCreate, FornecedorUpdate
 
 
@@ -14,9 +17,11 @@ def get_fornecedor_by_user_id(db: Session, user_id: int) -> Optional[Fornecedor]
     return db.query(Fornecedor).filter(Fornecedor.user_id == user_id).first()
 
 
-def get_fornecedores(db: Session, skip: int = 0, limit: int = 100):
-    """Lista fornecedores"""
-    return db.query(Fornecedor).offset(skip).limit(limit).all()
+def get_fornecedores(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Page[Fornecedor]:
+    """Lista fornecedores (paginação por cursor)"""
+    ordem = (Fornecedor.id,)
+    statement = paginate(select(Fornecedor), ordem, cursor, limit)
+    return make_page(db.scalars(statement).all(), ordem, limit)
 
 
 def create_fornecedor(db: Session, fornecedor: FornecedorCreate, user_id: int) -> Fornecedor:
@@ -25,6 +30,7 @@ def create_fornecedor(db: Session, fornecedor: FornecedorCreate, user_id: int) -
     db.add(db_fornecedor)
     db.commit()
     db.refresh(db_fornecedor)
+    invalidate_identity(db_fornecedor.user_id)
     return db_fornecedor
 
 
@@ -38,5 +44,6 @@ def update_fornecedor(db: Session, fornecedor_id: int, fornecedor_update: Fornec
         setattr(db_fornecedor, key, value)
     db.commit()
     db.refresh(db_fornecedor)
+    invalidate_identity(db_fornecedor.user_id)
     return db_fornecedor
 
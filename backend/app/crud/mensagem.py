@@ -1,6 +1,10 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased, joinedload
+from typing import List, Optional, Tuple
+from app.core.pagination import Page, paginate, make_page, after_position
 from app.models.mensagem import Mensagem
+from app.models.mensagens_por_ler import MensagensPorLer
 from app.schemas.mensagem import MensagemCreate
 
 
@@ -11,23 +15,155 @@ def create_mensagem(db: Session, mensagem: MensagemCreate, remetente_id: int) ->
         **mensagem.dict()
     )
     db.add(db_mensagem)
+    db.execute(incrementar_por_ler(db.get_bind().dialect.name, mensagem.destinatario_id, mensagem.reserva_id))
     db.commit()
     db.refresh(db_mensagem)
     return db_mensagem
 
 
-def get_mensagens_by_reserva(db: Session, reserva_id: int) -> List[Mensagem]:
-    """Lista mensagens de uma reserva"""
-    return db.query(Mensagem).filter(
-        Mensagem.reserva_id == reserva_id
-    ).order_by(Mensagem.data_criacao.asc()).all()
+def incrementar_por_ler(dialeto: str, destinatario_id: int, reserva_id: int):
+    """+1 no contador de mensagens por ler, criando-o se ainda não existe (upsert num só statement)"""
+    insert = postgresql.insert if dialeto == "postgresql" else sqlite.insert
+    return insert(MensagensPorLer).values(
+        destinatario_id=destinatario_id, reserva_id=reserva_id, por_ler=1
+    ).on_conflict_do_update(
+        index_elements=[MensagensPorLer.destinatario_id, MensagensPorLer.reserva_id],
+        set_={"por_ler": MensagensPorLer.por_ler + 1}
+    )
+
+
+def descontar_por_ler(destinatario_id: int, reserva_id: int, lidas: int):
+    """Desconta do contador as mensagens acabadas de marcar como lidas"""
+    return (
+        update(MensagensPorLer)
+        .where(MensagensPorLer.destinatario_id == destinatario_id, MensagensPorLer.reserva_id == reserva_id)
+        # Nunca abaixo de zero, mesmo que o contador tenha ficado atrás das mensagens
+        .values(por_ler=case((MensagensPorLer.por_ler > lidas, MensagensPorLer.por_ler - lidas), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def select_por_ler(destinatario_id: int):
+    """Reservas com mensagens por ler do utilizador e quantas (só a tabela de contadores)"""
+    return (
+        select(MensagensPorLer.reserva_id, MensagensPorLer.por_ler)
+        .where(MensagensPorLer.destinatario_id == destinatario_id, MensagensPorLer.por_ler > 0)
+        .order_by(MensagensPorLer.reserva_id)
+    )
+
 
+def get_por_ler(db: Session, destinatario_id: int) -> List[Tuple[int, int]]:
+    """(reserva_id, por_ler) das reservas com mensagens por ler do utilizador"""
+    return [tuple(linha) for linha in db.execute(select_por_ler(destinatario_id))]
+
+
+def select_mensagens_reserva(reserva_id: int):
+    """Mensagens de uma reserva com o remetente (remetente_nome)"""
+    return (
+        select(Mensagem)
+        .where(Mensagem.reserva_id == reserva_id)
+        .options(joinedload(Mensagem.remetente))
+        .order_by(Mensagem.data_criacao.asc())
+    )
+
+
+# Conversa por ordem cronológica; a ordem do índice ix_mensagens_reserva_id_data_criacao
+ORDEM_MENSAGENS = (Mensagem.data_criacao.asc(), Mensagem.id.asc())
+# O mesmo índice lido ao contrário: as mais recentes primeiro
+ORDEM_MENSAGENS_INVERSA = (Mensagem.data_criacao.desc(), Mensagem.id.desc())
+
+
+def posicao_mensagem(reserva_id: int, mensagem_id: int) -> tuple:
+    """(data_criacao, id) de uma mensagem da reserva, como subquery (NULL se não existir)"""
+    ancora = aliased(Mensagem)
+    data_criacao = (
+        select(ancora.data_criacao)
+        .where(ancora.id == mensagem_id, ancora.reserva_id == reserva_id)
+        .scalar_subquery()
+    )
+    return data_criacao, mensagem_id
 
-def marcar_como_lida(db: Session, mensagem_id: int) -> Mensagem:
-    """Marca mensagem como lida"""
-    mensagem = db.query(Mensagem).filter(Mensagem.id == mensagem_id).first()
-    if mensagem:
-        mensagem.lida = True
-        db.commit()
-        db.refresh(mensagem)
-    return mensagem
+
+def select_mensagens_pagina(
+    reserva_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    desde: Optional[int] = None,
+    antes_de: Optional[int] = None,
+    recentes: bool = False
+):
+    """
+    Página de mensagens de uma reserva sobre a chave (data_criacao, id)
+
+    - cursor: página seguinte, pela ordem cronológica (X-Next-Cursor)
+    - desde: só as mensagens depois da mensagem com este id (as novas)
+    - antes_de: as mensagens imediatamente antes da mensagem com este id
+    - recentes: as últimas mensagens da conversa
+
+    Com antes_de/recentes o índice é lido ao contrário (ORDEM_MENSAGENS_INVERSA)
+    e make_page_mensagens repõe a ordem cronológica.
+    """
+    inversa = antes_de is not None or recentes
+    ordem = ORDEM_MENSAGENS_INVERSA if inversa else ORDEM_MENSAGENS
+    statement = paginate(select_mensagens_reserva(reserva_id), ordem, None if inversa else cursor, limit)
+    if desde is not None:
+        statement = statement.where(after_position(ORDEM_MENSAGENS, posicao_mensagem(reserva_id, desde)))
+    if antes_de is not None:
+        statement = statement.where(after_position(ORDEM_MENSAGENS_INVERSA, posicao_mensagem(reserva_id, antes_de)))
+    return statement
+
+
+def make_page_mensagens(linhas, limit: int, inversa: bool) -> Page[Mensagem]:
+    """
+    Página por ordem cronológica
+
+    Lida ao contrário não tem cursor: a página anterior pede-se com antes_de=<id
+    da primeira mensagem> e uma página com menos de limit mensagens é o início.
+    """
+    if not inversa:
+        return make_page(linhas, ORDEM_MENSAGENS, limit)
+    items = list(linhas[:limit])
+    items.reverse()
+    return Page(items=items)
+
+
+def get_mensagens_by_reserva(
+    db: Session,
+    reserva_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    desde: Optional[int] = None,
+    antes_de: Optional[int] = None,
+    recentes: bool = False
+) -> Page[Mensagem]:
+    """Lista mensagens de uma reserva (com remetente carregado, paginação keyset)"""
+    statement = select_mensagens_pagina(reserva_id, cursor, limit, desde, antes_de, recentes)
+    return make_page_mensagens(db.scalars(statement).all(), limit, antes_de is not None or recentes)
+
+
+def update_marcar_lidas(reserva_id: int, destinatario_id: int, ate_id: int):
+    """UPDATE das mensagens por ler do destinatário até à mensagem ate_id (inclusive)"""
+    return (
+        update(Mensagem)
+        .where(
+            Mensagem.reserva_id == reserva_id,
+            Mensagem.destinatario_id == destinatario_id,
+            Mensagem.lida == False,
+            ~after_position(ORDEM_MENSAGENS, posicao_mensagem(reserva_id, ate_id))
+        )
+        .values(lida=True)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def marcar_lidas_ate(db: Session, reserva_id: int, destinatario_id: int, ate_id: int) -> int:
+    """
+    Marca como lidas, num só UPDATE, as mensagens recebidas até ate_id; devolve quantas
+
+    O contador de mensagens por ler desce na mesma transação.
+    """
+    marcadas = db.execute(update_marcar_lidas(reserva_id, destinatario_id, ate_id)).rowcount
+    if marcadas:
+        db.execute(descontar_por_ler(destinatario_id, reserva_id, marcadas))
+    db.commit()
+    return marcadas
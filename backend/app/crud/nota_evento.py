@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.models.nota_evento import NotaEvento
 from app.schemas.nota_evento import NotaEventoCreate, NotaEventoUpdate
@@ -16,11 +17,19 @@ def create_nota(db: Session, nota: NotaEventoCreate, criado_por_id: int) -> Nota
     return db_nota
 
 
+def select_notas_reserva(reserva_id: int):
+    """Notas de uma reserva com o autor (criado_por_nome)"""
+    return (
+        select(NotaEvento)
+        .where(NotaEvento.reserva_id == reserva_id)
+        .options(joinedload(NotaEvento.criado_por))
+        .order_by(NotaEvento.data_criacao.desc())
+    )
+
+
 def get_notas_by_reserva(db: Session, reserva_id: int) -> List[NotaEvento]:
     """Lista notas de uma reserva"""
-    return db.query(NotaEvento).filter(
-        NotaEvento.reserva_id == reserva_id
-    ).order_by(NotaEvento.data_criacao.desc()).all()
+    return db.scalars(select_notas_reserva(reserva_id)).all()
 
 
 def update_nota(db: Session, nota_id: int, nota_update: NotaEventoUpdate) -> Optional[NotaEvento]:
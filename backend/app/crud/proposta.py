@@ -1,5 +1,7 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
+from app.core.pagination import Page, paginate, make_page
 from datetime import datetime, timedelta
 from app.models.proposta import Proposta, EstadoProposta
 from app.models.rfq import RFQ, EstadoRFQ
@@ -44,11 +46,27 @@ def get_propostas_by_rfq(db: Session, rfq_id: int) -> List[Proposta]:
     ).order_by(Proposta.data_criacao.desc()).all()
 
 
-def get_propostas_by_fornecedor(db: Session, fornecedor_id: int) -> List[Proposta]:
-    """Lista propostas de um fornecedor"""
-    return db.query(Proposta).filter(
-        Proposta.fornecedor_id == fornecedor_id
-    ).order_by(Proposta.data_criacao.desc()).all()
+def count_propostas_by_rfq(db: Session, rfq_id: int) -> int:
+    """Número de propostas de um RFQ (COUNT, sem carregar as propostas)"""
+    return db.scalar(select(func.count(Proposta.id)).where(Proposta.rfq_id == rfq_id))
+
+
+def get_propostas_by_fornecedor(
+    db: Session,
+    fornecedor_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[Proposta]:
+    """Lista propostas de um fornecedor, com a atividade (paginação por cursor)"""
+    # Mais recentes primeiro; a ordem do índice ix_propostas_fornecedor_id_data_criacao
+    ordem = (Proposta.data_criacao.desc(), Proposta.id.desc())
+    statement = paginate(
+        select(Proposta)
+        .where(Proposta.fornecedor_id == fornecedor_id)
+        .options(joinedload(Proposta.atividade)),
+        ordem, cursor, limit
+    )
+    return make_page(db.scalars(statement).all(), ordem, limit)
 
 
 def update_proposta(db: Session, proposta_id: int, proposta_update: PropostaUpdate) -> Optional[Proposta]:
@@ -0,0 +1,52 @@
+"""
+Eventos criados a partir do brief e as propostas geradas para eles
+
+Uma linha por proposta, com o tema e a agenda em JSON (JSONB no PostgreSQL);
+o resto da proposta é reconstruído pelo gerador (services/proposta_generator).
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, joinedload
+from app.models.evento import Evento, PropostaGerada
+
+
+def create_evento(
+    db: Session,
+    brief: dict,
+    empresa_id: Optional[int],
+    chave_hash: str,
+    propostas: List[Tuple[str, List[dict]]]
+) -> Tuple[int, List[int]]:
+    """
+    Guarda o evento e as propostas (tema, agenda), um INSERT para cada tabela;
+    devolve (evento_id, ids das propostas pela ordem dada)
+    """
+    evento_id = db.scalar(
+        insert(Evento).returning(Evento.id),
+        {"empresa_id": empresa_id, "brief": brief, "chave_hash": chave_hash}
+    )
+    # Um tema por proposta: os ids são associados pelo tema (a ordem do RETURNING não é garantida)
+    ids = dict(db.execute(
+        insert(PropostaGerada).returning(PropostaGerada.tema, PropostaGerada.id),
+        [{"evento_id": evento_id, "tema": tema, "agenda": agenda} for tema, agenda in propostas]
+    ).all())
+    db.commit()
+    return evento_id, [ids[tema] for tema, _ in propostas]
+
+
+def get_proposta(db: Session, proposta_id: int) -> Optional[PropostaGerada]:
+    """Proposta com o evento (brief e empresa) numa só query"""
+    return db.scalar(
+        select(PropostaGerada).where(PropostaGerada.id == proposta_id).options(joinedload(PropostaGerada.evento))
+    )
+
+
+def update_proposta(db: Session, proposta_id: int, agenda: List[dict], observacoes: Optional[str]):
+    """Substitui a agenda e as observações de uma proposta"""
+    db.execute(
+        update(PropostaGerada)
+        .where(PropostaGerada.id == proposta_id)
+        .values(agenda=agenda, observacoes=observacoes)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
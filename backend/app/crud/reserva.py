@@ -1,19 +1,65 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from datetime import date
-from typing import Optional
+from typing import List, Optional, Tuple
 from app.models.reserva import Reserva, EstadoReserva
 from app.models.atividade import Atividade
+from app.models.empresa import Empresa
+from app.models.fornecedor import Fornecedor
 from app.schemas.reserva import ReservaCreate
 
 
+# Queries por forma de endpoint: cada uma declara as relações que as rotas
+# leem, para que percorrer os resultados não dispare um lazy load por linha.
+# Partilhadas com app.crud.aio (o caminho assíncrono não pode fazer lazy loads)
+
+def select_reserva_detalhe(reserva_id: int):
+    """Reserva com empresa/user e atividade/fornecedor/user (permissões, dossier, notificações)"""
+    return select(Reserva).where(Reserva.id == reserva_id).options(
+        joinedload(Reserva.empresa).joinedload(Empresa.user),
+        joinedload(Reserva.atividade).joinedload(Atividade.fornecedor).joinedload(Fornecedor.user)
+    )
+
+
+def select_reservas_empresa(empresa_id: int):
+    """Reservas de uma empresa com a atividade (listagem)"""
+    return select(Reserva).where(Reserva.empresa_id == empresa_id).options(
+        joinedload(Reserva.atividade)
+    )
+
+
+# Mais recentes primeiro; a ordem do índice ix_reservas_empresa_id_data_criacao
+ORDEM_RESERVAS_EMPRESA = (Reserva.data_criacao.desc(), Reserva.id.desc())
+
+
+def select_reservas_fornecedor(fornecedor_id: int):
+    """Reservas das atividades de um fornecedor; a atividade vem do próprio JOIN"""
+    return (
+        select(Reserva)
+        .join(Reserva.atividade)
+        .where(Atividade.fornecedor_id == fornecedor_id)
+        .options(contains_eager(Reserva.atividade))
+    )
+
+
 def get_reserva(db: Session, reserva_id: int) -> Optional[Reserva]:
     """Busca reserva por ID"""
     return db.query(Reserva).filter(Reserva.id == reserva_id).first()
 
 
-def get_reservas_by_empresa(db: Session, empresa_id: int):
+def get_reserva_detalhe(db: Session, reserva_id: int) -> Optional[Reserva]:
+    """Busca reserva por ID com as partes do evento carregadas"""
+    return db.scalar(select_reserva_detalhe(reserva_id))
+
+
+def get_reservas_by_empresa(db: Session, empresa_id: int) -> List[Reserva]:
     """Lista reservas de uma empresa"""
-    return db.query(Reserva).filter(Reserva.empresa_id == empresa_id).all()
+    return db.scalars(select_reservas_empresa(empresa_id)).all()
+
+
+def get_reservas_by_fornecedor(db: Session, fornecedor_id: int) -> List[Reserva]:
+    """Lista reservas das atividades de um fornecedor"""
+    return db.scalars(select_reservas_fornecedor(fornecedor_id)).all()
 
 
 def create_reserva(
@@ -58,6 +104,37 @@ def create_reserva(
     return db_reserva
 
 
+def create_reservas(
+    db: Session,
+    empresa_id: int,
+    data: date,
+    itens: List[Tuple[Atividade, int]]
+) -> List[int]:
+    """
+    Cria as reservas (atividade, n_pessoas) de um evento num só INSERT; devolve os ids
+
+    As atividades já vêm carregadas; as que não têm capacidade ficam de fora,
+    como em create_reserva.
+    """
+    reservas = [
+        {
+            "empresa_id": empresa_id,
+            "atividade_id": atividade.id,
+            "data": data,
+            "n_pessoas": n_pessoas,
+            "preco_total": atividade.preco_por_pessoa * n_pessoas,
+            "estado": EstadoReserva.PENDENTE
+        }
+        for atividade, n_pessoas in itens
+        if atividade.capacidade_max >= n_pessoas
+    ]
+    if not reservas:
+        return []
+    ids = db.scalars(insert(Reserva).returning(Reserva.id), reservas).all()
+    db.commit()
+    return sorted(ids)
+
+
 def cancelar_reserva(db: Session, reserva_id: int) -> Optional[Reserva]:
     """Cancela uma reserva"""
     db_reserva = get_reserva(db, reserva_id)
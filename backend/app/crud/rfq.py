@@ -1,6 +1,11 @@
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.core.pagination import Page, paginate, make_page
 from app.models.rfq import RFQ, EstadoRFQ
+from app.models.proposta import Proposta
+from app.models.atividade import Atividade
+from app.models.fornecedor import Fornecedor
 from app.schemas.rfq import RFQCreate
 
 
@@ -26,6 +31,25 @@ def get_rfqs_by_empresa(db: Session, empresa_id: int) -> List[RFQ]:
     return db.query(RFQ).filter(RFQ.empresa_id == empresa_id).order_by(RFQ.data_criacao.desc()).all()
 
 
+def num_propostas_subquery():
+    """COUNT das propostas do RFQ da query exterior (resolvido pelo índice rfq_id, data_criacao)"""
+    return (
+        select(func.count(Proposta.id))
+        .where(Proposta.rfq_id == RFQ.id)
+        .correlate(RFQ)
+        .scalar_subquery()
+    )
+
+
+def get_rfqs_by_empresa_com_num_propostas(db: Session, empresa_id: int) -> List[Tuple[RFQ, int]]:
+    """Lista RFQs de uma empresa com o número de propostas de cada um, numa só query"""
+    return db.execute(
+        select(RFQ, num_propostas_subquery().label("num_propostas"))
+        .where(RFQ.empresa_id == empresa_id)
+        .order_by(RFQ.data_criacao.desc())
+    ).all()
+
+
 def get_rfqs_abertos(db: Session, skip: int = 0, limit: int = 100) -> List[RFQ]:
     """Lista RFQs abertos (para fornecedores verem)"""
     return db.query(RFQ).filter(
@@ -33,11 +57,65 @@ def get_rfqs_abertos(db: Session, skip: int = 0, limit: int = 100) -> List[RFQ]:
     ).order_by(RFQ.data_criacao.desc()).offset(skip).limit(limit).all()
 
 
-def get_rfqs_por_fornecedor(db: Session, fornecedor_id: int) -> List[RFQ]:
-    """Lista RFQs que um fornecedor pode ver (baseado em localização e categorias)"""
-    # Por agora, retorna todos os RFQs abertos
-    # Futuramente pode filtrar por localização, categoria, etc.
-    return get_rfqs_abertos(db)
+# Mais recentes primeiro; a ordem do índice ix_rfqs_estado_data_criacao
+ORDEM_RFQS_DISPONIVEIS = (RFQ.data_criacao.desc(), RFQ.id.desc())
+
+
+def get_rfqs_por_fornecedor(
+    db: Session,
+    fornecedor_id: int,
+    localizacao: Optional[str] = None,
+    categoria: Optional[str] = None,
+    compativeis: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Page[Tuple[RFQ, int]]:
+    """
+    Lista RFQs abertos a que o fornecedor ainda não respondeu, com o número de propostas, numa só query
+
+    - ja respondeu: NOT EXISTS sobre propostas (rfq_id, fornecedor_id)
+    - localizacao/categoria: filtros explícitos (sem distinguir maiúsculas)
+    - compativeis: só RFQs na localização do fornecedor e com categoria preferida
+      entre as categorias das suas atividades (ou sem categoria preferida)
+    - cursor: paginação por cursor, mais recentes primeiro (ORDEM_RFQS_DISPONIVEIS)
+    """
+    ja_respondeu = exists().where(
+        Proposta.rfq_id == RFQ.id,
+        Proposta.fornecedor_id == fornecedor_id
+    )
+    query = (
+        select(RFQ, num_propostas_subquery().label("num_propostas"))
+        .where(RFQ.estado == EstadoRFQ.ABERTO, ~ja_respondeu)
+    )
+
+    if localizacao:
+        query = query.where(func.lower(RFQ.localizacao) == localizacao.lower())
+    if categoria:
+        query = query.where(func.lower(RFQ.categoria_preferida) == categoria.lower())
+    if compativeis:
+        localizacao_fornecedor = (
+            select(Fornecedor.localizacao)
+            .where(Fornecedor.id == fornecedor_id)
+            .scalar_subquery()
+        )
+        categorias_fornecedor = (
+            select(Atividade.categoria)
+            .where(Atividade.fornecedor_id == fornecedor_id, Atividade.categoria.is_not(None))
+        )
+        query = query.where(
+            # Fornecedor sem localização definida: não filtra por localização
+            or_(
+                localizacao_fornecedor.is_(None),
+                func.lower(RFQ.localizacao) == func.lower(localizacao_fornecedor)
+            ),
+            or_(
+                RFQ.categoria_preferida.is_(None),
+                RFQ.categoria_preferida.in_(categorias_fornecedor)
+            )
+        )
+
+    statement = paginate(query, ORDEM_RFQS_DISPONIVEIS, cursor, limit)
+    return make_page(db.execute(statement).all(), ORDEM_RFQS_DISPONIVEIS, limit, chave=lambda linha: linha[0])
 
 
 def update_rfq_estado(db: Session, rfq_id: int, novo_estado: EstadoRFQ) -> Optional[RFQ]:
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.models.user import User, TipoUsuario
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_password, password_needs_rehash, make_unusable_password
+from app.core.identity import invalidate_identity
 from app.schemas.user import UserCreate
 
 
@@ -30,12 +31,30 @@ def create_user(db: Session, user: UserCreate) -> User:
     return db_user
 
 
+def create_guest_user(db: Session, nome: str, email: str) -> User:
+    """Cria conta guest (empresa) sem password; pode ser reclamada mais tarde"""
+    db_user = User(
+        nome=nome,
+        email=email,
+        password=make_unusable_password(),
+        tipo=TipoUsuario.EMPRESA
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """Autentica utilizador"""
+    """Autentica utilizador (refaz o hash se o custo do bcrypt mudou)"""
     user = get_user_by_email(db, email)
     if not user:
         return None
     if not verify_password(password, user.password):
         return None
+    if password_needs_rehash(user.password):
+        user.password = get_password_hash(password)
+        db.commit()
+        invalidate_identity(user.id)
     return user
 
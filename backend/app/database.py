@@ -1,14 +1,182 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+class PoolMetrics:
+    """Métricas do pool de ligações (checkouts, esperas e tempo de espera)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0
+            self.timeouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_checkout(self, elapsed: float, waited: bool):
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def record_timeout(self, elapsed: float):
+        with self._lock:
+            self.timeouts += 1
+            self.waits += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / self.waits, 3) if self.waits else 0.0,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que regista quanto tempo cada pedido espera por uma ligação"""
+
+    def _do_get(self):
+        # Só há espera quando não existem ligações livres e o overflow está esgotado
+        waited = self.checkedin() == 0 and self._max_overflow > -1 and self._overflow >= self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record_timeout(time.perf_counter() - start)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start, waited)
+        return connection
+
+
+def _engine_kwargs(database_url, instrumented: bool = True) -> dict:
+    """Opções do pool a partir das settings (SQLite usa o pool por omissão)"""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    kwargs = {"poolclass": InstrumentedQueuePool} if instrumented else {}
+    return {
+        **kwargs,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _async_database_url(database_url: str):
+    """Converte o URL síncrono (psycopg2/pysqlite) no equivalente assíncrono"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Caminho assíncrono (asyncpg) para endpoints que não devem ocupar o threadpool
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL, instrumented=False))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Réplica de leitura (opcional)
+if settings.REPLICA_DATABASE_URL:
+    replica_engine = create_engine(settings.REPLICA_DATABASE_URL, **_engine_kwargs(settings.REPLICA_DATABASE_URL, instrumented=False))
+    ASYNC_REPLICA_DATABASE_URL = settings.ASYNC_REPLICA_DATABASE_URL or _async_database_url(settings.REPLICA_DATABASE_URL)
+    async_replica_engine = create_async_engine(ASYNC_REPLICA_DATABASE_URL, **_engine_kwargs(ASYNC_REPLICA_DATABASE_URL, instrumented=False))
+else:
+    replica_engine = engine
+    async_replica_engine = async_engine
+
+
+class RoutingSession(Session):
+    """
+    Sessão que lê da réplica e escreve no primário.
+    Após o primeiro write, todas as queries seguintes da sessão (pedido)
+    passam a usar o primário, para que o pedido leia o que acabou de escrever.
+    """
+
+    def __init__(self, primary=None, replica=None, **kw):
+        super().__init__(**kw)
+        self.primary = primary
+        self.replica = replica
+        self.usar_primario = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.usar_primario = True
+        return self.primary if self.usar_primario else self.replica
+
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    primary=engine,
+    replica=replica_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    primary=async_engine.sync_engine,
+    replica=async_replica_engine.sync_engine
+)
+
 Base = declarative_base()
 
 
+def get_pool_status() -> dict:
+    """Estado atual do pool de ligações e métricas acumuladas"""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    status.update(pool_metrics.snapshot())
+    async_pool = async_engine.pool
+    if isinstance(async_pool, QueuePool):
+        status["async"] = {
+            "size": async_pool.size(),
+            "checked_in": async_pool.checkedin(),
+            "checked_out": async_pool.checkedout(),
+            "overflow": async_pool.overflow(),
+        }
+    return status
+
+
 def get_db():
     """Dependency para obter sessão da base de dados"""
     db = SessionLocal()
@@ -17,3 +185,67 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency para obter sessão assíncrona da base de dados"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """Dependency para rotas de leitura (réplica, com fallback para o primário após um write)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """Dependency assíncrona para rotas de leitura (réplica, com fallback para o primário)"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+class StatementCounter:
+    """Statements SQL executados enquanto o contador está ligado aos engines"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_max(self, maximo: int, descricao: str = "bloco"):
+        """Falha (AssertionError) se o bloco executou mais de `maximo` statements"""
+        if self.count > maximo:
+            detalhe = "\n".join(f"  {i + 1}. {' '.join(s.split())[:160]}" for i, s in enumerate(self.statements))
+            raise AssertionError(f"{descricao}: {self.count} statements SQL (máximo {maximo})\n{detalhe}")
+
+
+@contextmanager
+def count_statements():
+    """
+    Conta os statements SQL executados no bloco, em todos os engines
+    (síncrono, assíncrono e réplicas). Para testes e scripts de verificação:
+    conta os pedidos de todas as threads, não só os do bloco atual.
+
+        with count_statements() as contador:
+            client.get("/reservas/1")
+        contador.assert_max(3, "GET /reservas/{empresa_id}")
+    """
+    contador = StatementCounter()
+    engines = {id(e): e for e in (engine, replica_engine, async_engine.sync_engine, async_replica_engine.sync_engine)}
+    for e in engines.values():
+        event.listen(e, "before_cursor_execute", contador)
+    try:
+        yield contador
+    finally:
+        for e in engines.values():
+            event.remove(e, "before_cursor_execute", contador)
@@ -8,9 +8,13 @@ from app.models.avaliacao import Avaliacao
 from app.models.rfq import RFQ
 from app.models.proposta import Proposta
 from app.models.mensagem import Mensagem
+from app.models.mensagens_por_ler import MensagensPorLer
 from app.models.documento import Documento
 from app.models.nota_evento import NotaEvento
 from app.models.pagamento import Pagamento, EstadoPagamento, MetodoPagamento
+from app.models.email_outbox import EmailOutbox, EstadoEmail
+from app.models.evento import Evento, PropostaGerada
+from app.models.catalogo_versao import CatalogoVersao
 
-__all__ = ["User", "Empresa", "Fornecedor", "Atividade", "Reserva", "Itinerario", "Avaliacao", "RFQ", "Proposta", "Mensagem", "Documento", "NotaEvento", "Pagamento", "EstadoPagamento", "MetodoPagamento"]
+__all__ = ["User", "Empresa", "Fornecedor", "Atividade", "Reserva", "Itinerario", "Avaliacao", "RFQ", "Proposta", "Mensagem", "MensagensPorLer", "Documento", "NotaEvento", "Pagamento", "EstadoPagamento", "MetodoPagamento", "EmailOutbox", "EstadoEmail", "Evento", "PropostaGerada", "CatalogoVersao"]
 
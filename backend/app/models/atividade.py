@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, Boolean, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
@@ -37,7 +37,7 @@ class Atividade(Base):
     localizacao = Column(String)
     descricao = Column(Text)
     imagens = Column(Text)  # JSON string com URLs das imagens
-    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id"), nullable=False)
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id"), nullable=False, index=True)
     # Novos campos
     clima = Column(String)  # indoor, outdoor, ambos
     duracao_minutos = Column(Integer)  # Duração estimada em minutos
@@ -46,6 +46,13 @@ class Atividade(Base):
     rating_medio = Column(Float, default=0.0)  # Calculado automaticamente
     total_avaliacoes = Column(Integer, default=0)
 
+    __table_args__ = (
+        # Catálogo/recomendações: aprovadas, ordenadas por rating
+        Index("ix_atividades_aprovada_rating_medio", aprovada, rating_medio.desc()),
+        # Candidatas das propostas de evento: aprovadas com capacidade para o grupo
+        Index("ix_atividades_estado_capacidade_max", estado, capacidade_max),
+    )
+
     # Relacionamentos
     fornecedor = relationship("Fornecedor", back_populates="atividades")
     reservas = relationship("Reserva", back_populates="atividade")
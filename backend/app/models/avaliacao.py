@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -9,13 +9,18 @@ class Avaliacao(Base):
     __tablename__ = "avaliacoes"
 
     id = Column(Integer, primary_key=True, index=True)
-    empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False)
+    empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False, index=True)
     atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=True)
-    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id"), nullable=True)
+    fornecedor_id = Column(Integer, ForeignKey("fornecedores.id"), nullable=True, index=True)
     rating = Column(Integer, nullable=False)  # 1-5 estrelas
     comentario = Column(Text)
     data_criacao = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Avaliações de uma atividade, mais recentes primeiro (paginação por cursor)
+        Index("ix_avaliacoes_atividade_id_data_criacao", atividade_id, data_criacao.desc()),
+    )
+
     # Relacionamentos
     empresa = relationship("Empresa", back_populates="avaliacoes")
     atividade = relationship("Atividade", back_populates="avaliacoes")
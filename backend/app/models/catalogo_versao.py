@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, DDL, event
+from app.database import Base
+
+
+class CatalogoVersao(Base):
+    """Versão do catálogo de atividades, partilhada por todos os workers (uma só linha, id 1)"""
+    __tablename__ = "catalogo_versao"
+
+    id = Column(Integer, primary_key=True)
+    versao = Column(Integer, nullable=False, default=0)
+
+
+# A linha existe desde a criação da tabela (create_all; a migração 0008 insere-a também)
+event.listen(
+    CatalogoVersao.__table__,
+    "after_create",
+    DDL("INSERT INTO catalogo_versao (id, versao) VALUES (1, 0)")
+)
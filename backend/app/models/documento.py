@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -13,8 +13,12 @@ class Documento(Base):
     url = Column(String, nullable=False)  # URL do ficheiro (S3, local, etc.)
     tipo = Column(String)  # contrato, foto, certificado, etc.
     descricao = Column(Text)
-    uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     data_upload = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_documentos_reserva_id_data_upload", reserva_id, data_upload.desc()),
+    )
     
     # Relacionamentos
     reserva = relationship("Reserva", back_populates="documentos")
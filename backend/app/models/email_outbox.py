@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Enum as SQLEnum
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class EstadoEmail(str, enum.Enum):
+    PENDENTE = "pendente"  # À espera de envio (ou de nova tentativa)
+    ENVIADO = "enviado"
+    FALHADO = "falhado"  # Dead-letter: esgotou as tentativas ou foi recusado em definitivo
+
+
+class EmailOutbox(Base):
+    """Email à espera de envio, despachado em background por services/email_outbox.py"""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    destinatario = Column(String, nullable=False)
+    assunto = Column(String, nullable=False)
+    html = Column(Text, nullable=False)
+    texto = Column(Text)
+    estado = Column(SQLEnum(EstadoEmail), nullable=False, default=EstadoEmail.PENDENTE)
+    tentativas = Column(Integer, nullable=False, default=0)
+    # Próxima tentativa; enquanto um worker envia, é o fim da reserva (lease) do email
+    proxima_tentativa = Column(DateTime, nullable=False, default=datetime.utcnow)
+    ultimo_erro = Column(Text)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_envio = Column(DateTime)
+
+    __table_args__ = (
+        # Fila: pendentes por ordem da próxima tentativa
+        Index("ix_email_outbox_estado_proxima_tentativa", estado, proxima_tentativa),
+    )
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+# JSONB no PostgreSQL, JSON (texto) nas outras bases de dados
+JSONB_OU_JSON = JSON().with_variant(JSONB(), "postgresql")
+
+
+class Evento(Base):
+    """Brief de um evento (POST /eventos/criar), com as propostas geradas para ele"""
+    __tablename__ = "eventos"
+
+    id = Column(Integer, primary_key=True, index=True)
+    empresa_id = Column(Integer, ForeignKey("empresas.id"), index=True)  # None se criado sem login
+    brief = Column(JSONB_OU_JSON, nullable=False)  # EventoCreate
+    # SHA-256 da chave devolvida a quem criou o evento; sem empresa, editar e confirmar exigem-na
+    chave_hash = Column(String(64))
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+
+    # Relacionamentos
+    propostas = relationship("PropostaGerada", back_populates="evento", order_by="PropostaGerada.id")
+
+
+class PropostaGerada(Base):
+    """
+    Proposta gerada para um evento, endereçada como prop_<id>
+
+    Só guarda o tema e a agenda: títulos e textos são os do tema e os preços
+    totais saem da agenda (services/proposta_generator.proposta_guardada).
+    """
+    __tablename__ = "propostas_evento"
+
+    id = Column(Integer, primary_key=True, index=True)
+    evento_id = Column(Integer, ForeignKey("eventos.id"), nullable=False, index=True)
+    tema = Column(String, nullable=False)  # aventura, criativa, hibrida
+    agenda = Column(JSONB_OU_JSON, nullable=False)  # Lista de PropostaEventoItem
+    observacoes = Column(Text)
+    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relacionamentos
+    evento = relationship("Evento", back_populates="propostas")
@@ -8,7 +8,7 @@ class Itinerario(Base):
     __tablename__ = "itinerarios"
 
     id = Column(Integer, primary_key=True, index=True)
-    empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False)
+    empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False, index=True)
     data = Column(Date, nullable=False)
     atividades = Column(Text)  # JSON string com lista de atividades
     restaurante_sugerido = Column(String)
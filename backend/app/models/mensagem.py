@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -9,11 +9,16 @@ class Mensagem(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     reserva_id = Column(Integer, ForeignKey("reservas.id"), nullable=False)
-    remetente_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # User que enviou
-    destinatario_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # User que recebe
+    remetente_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # User que enviou
+    destinatario_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # User que recebe
     conteudo = Column(Text, nullable=False)
     lida = Column(Boolean, default=False)
     data_criacao = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Conversa do evento por ordem cronológica
+        Index("ix_mensagens_reserva_id_data_criacao", reserva_id, data_criacao),
+    )
     
     # Relacionamentos
     reserva = relationship("Reserva", back_populates="mensagens")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+
+class MensagensPorLer(Base):
+    """
+    Contador de mensagens por ler de um utilizador numa reserva
+
+    Mantido na mesma transação que cria mensagens (+1) e que as marca como
+    lidas (-n), para o número de mensagens por ler não exigir ler a tabela
+    mensagens. A chave começa pelo destinatário: os contadores de um
+    utilizador são um intervalo da chave primária.
+    """
+    __tablename__ = "mensagens_por_ler"
+
+    destinatario_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    reserva_id = Column(Integer, ForeignKey("reservas.id"), primary_key=True, index=True)
+    por_ler = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -11,9 +11,13 @@ class NotaEvento(Base):
     reserva_id = Column(Integer, ForeignKey("reservas.id"), nullable=False)
     titulo = Column(String)
     conteudo = Column(Text, nullable=False)
-    criado_por_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    criado_por_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     data_criacao = Column(DateTime, default=datetime.utcnow)
     data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_notas_evento_reserva_id_data_criacao", reserva_id, data_criacao.desc()),
+    )
     
     # Relacionamentos
     reserva = relationship("Reserva", back_populates="notas")
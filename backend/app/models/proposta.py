@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Date, Enum, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Date, Enum, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -18,7 +18,7 @@ class Proposta(Base):
     id = Column(Integer, primary_key=True, index=True)
     rfq_id = Column(Integer, ForeignKey("rfqs.id"), nullable=False)
     fornecedor_id = Column(Integer, ForeignKey("fornecedores.id"), nullable=False)
-    atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=True)  # Opcional, pode criar proposta sem atividade específica
+    atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=True, index=True)  # Opcional, pode criar proposta sem atividade específica
     
     # Detalhes da proposta
     preco_total = Column(Float, nullable=False)
@@ -34,6 +34,12 @@ class Proposta(Base):
     data_criacao = Column(DateTime, default=datetime.utcnow)
     data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     data_expiracao = Column(DateTime)  # Data limite para resposta
+
+    __table_args__ = (
+        # Propostas de um RFQ / de um fornecedor, mais recentes primeiro
+        Index("ix_propostas_rfq_id_data_criacao", rfq_id, data_criacao.desc()),
+        Index("ix_propostas_fornecedor_id_data_criacao", fornecedor_id, data_criacao.desc()),
+    )
     
     # Relacionamentos
     rfq = relationship("RFQ", back_populates="propostas")
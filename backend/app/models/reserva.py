@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, Date, Enum, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -17,19 +17,27 @@ class Reserva(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     empresa_id = Column(Integer, ForeignKey("empresas.id"), nullable=False)
-    atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=False)
-    proposta_id = Column(Integer, ForeignKey("propostas.id"), nullable=True)  # Opcional, reserva pode vir de proposta
+    atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=False, index=True)
+    proposta_id = Column(Integer, ForeignKey("propostas.id"), nullable=True, index=True)  # Opcional, reserva pode vir de proposta
     data = Column(Date, nullable=False)
     n_pessoas = Column(Integer, nullable=False)
     preco_total = Column(Float, nullable=False)
     estado = Column(Enum(EstadoReserva), default=EstadoReserva.PENDENTE)
-    data_criacao = Column(DateTime, default=datetime.utcnow)
+    data_criacao = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # Dashboard/relatórios de admin filtram por estado (e período)
+        Index("ix_reservas_estado_data_criacao", estado, data_criacao),
+        # Reservas de uma empresa, mais recentes primeiro (paginação por cursor)
+        Index("ix_reservas_empresa_id_data_criacao", empresa_id, data_criacao.desc()),
+    )
 
     # Relacionamentos
     empresa = relationship("Empresa", back_populates="reservas")
     atividade = relationship("Atividade", back_populates="reservas")
     proposta = relationship("Proposta", back_populates="reserva")
     mensagens = relationship("Mensagem", back_populates="reserva", cascade="all, delete-orphan")
+    mensagens_por_ler = relationship("MensagensPorLer", cascade="all, delete-orphan")
     documentos = relationship("Documento", back_populates="reserva", cascade="all, delete-orphan")
     notas = relationship("NotaEvento", back_populates="reserva", cascade="all, delete-orphan")
     pagamento = relationship("Pagamento", back_populates="reserva", uselist=False, cascade="all, delete-orphan")
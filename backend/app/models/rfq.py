@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, Enum, DateTime, Float
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, Enum, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -37,6 +37,12 @@ class RFQ(Base):
     estado = Column(Enum(EstadoRFQ), default=EstadoRFQ.ABERTO)
     data_criacao = Column(DateTime, default=datetime.utcnow)
     data_atualizacao = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # RFQs da empresa / RFQs abertos, mais recentes primeiro
+        Index("ix_rfqs_empresa_id_data_criacao", empresa_id, data_criacao.desc()),
+        Index("ix_rfqs_estado_data_criacao", estado, data_criacao.desc()),
+    )
     
     # Relacionamentos
     empresa = relationship("Empresa", back_populates="rfqs")
@@ -1,19 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.database import get_db, get_pool_status
+from app.core.dependencies import get_current_user_required
+from app.core.identity import Principal
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.crud import email_outbox as crud_email_outbox
 from app.models.empresa import Empresa
 from app.models.atividade import Atividade
 from app.models.reserva import Reserva
 from app.models.fornecedor import Fornecedor
+from app.services.email_outbox import email_dispatcher
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/dashboard")
-def get_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_dashboard(current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Dashboard com métricas básicas"""
     # Verificar se é admin
     if current_user.tipo.value != "admin":
@@ -62,7 +65,7 @@ def get_dashboard(current_user: User = Depends(get_current_user), db: Session =
 
 
 @router.get("/relatorios")
-def get_relatorios(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_relatorios(current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Relatórios detalhados (apenas admin)"""
     from datetime import datetime, timedelta
     
@@ -129,3 +132,53 @@ def get_relatorios(current_user: User = Depends(get_current_user), db: Session =
         ]
     }
 
+
+@router.get("/db-pool")
+def get_db_pool(current_user: Principal = Depends(get_current_user_required)):
+    """Estado e métricas do pool de ligações deste worker (apenas admin)"""
+    if current_user.tipo.value != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
+    
+    return get_pool_status()
+
+
+@router.get("/emails/falhados")
+def get_emails_falhados(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: Principal = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """Emails que falharam em definitivo (dead-letter da fila de envio, apenas admin)"""
+    if current_user.tipo.value != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
+    
+    pagina = crud_email_outbox.get_falhados(db, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, pagina)
+    return [
+        {
+            "id": email.id,
+            "destinatario": email.destinatario,
+            "assunto": email.assunto,
+            "tentativas": email.tentativas,
+            "ultimo_erro": email.ultimo_erro,
+            "data_criacao": email.data_criacao.isoformat() if email.data_criacao else None
+        }
+        for email in pagina.items
+    ]
+
+
+@router.post("/emails/{email_id}/reenviar")
+def reenviar_email(
+    email_id: int,
+    current_user: Principal = Depends(get_current_user_required),
+    db: Session = Depends(get_db)
+):
+    """Devolve um email falhado à fila de envio (apenas admin)"""
+    if current_user.tipo.value != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
+    
+    if not crud_email_outbox.reenviar(db, email_id):
+        raise HTTPException(status_code=404, detail="Failed email not found")
+    email_dispatcher.acordar()
+    return {"message": "Email devolvido à fila de envio"}
@@ -1,68 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.database import get_db, get_async_read_db
+from app.core.dependencies import get_current_user_required
+from app.core.identity import Principal
+from app.core.catalogo import invalidar_catalogo
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.models.atividade import Atividade, EstadoAtividade
-from app.crud import atividade as crud_atividade, fornecedor as crud_fornecedor
+from app.crud import atividade as crud_atividade
+from app.crud.aio import atividade as crud_atividade_async
 from app.schemas.atividade import AtividadeCreate, AtividadeUpdate, AtividadeResponse, RecomendacaoParams
 
 router = APIRouter(prefix="/atividades", tags=["atividades"])
 
 
 @router.get("/", response_model=List[AtividadeResponse])
-def list_atividades(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todas as atividades"""
-    atividades = crud_atividade.get_atividades(db, skip=skip, limit=limit)
-    return atividades
+async def list_atividades(response: Response, page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_async_read_db)):
+    """Lista todas as atividades (cursor da página seguinte no header X-Next-Cursor)"""
+    pagina = await crud_atividade_async.get_atividades(db, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, pagina)
+    return pagina.items
 
 
 @router.get("/{atividade_id}", response_model=AtividadeResponse)
-def get_atividade(atividade_id: int, db: Session = Depends(get_db)):
+async def get_atividade(atividade_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Obtém atividade por ID"""
-    atividade = crud_atividade.get_atividade(db, atividade_id)
+    atividade = await crud_atividade_async.get_atividade(db, atividade_id)
     if not atividade:
         raise HTTPException(status_code=404, detail="Atividade not found")
     return atividade
 
 
 @router.post("/", response_model=AtividadeResponse)
-def create_atividade(atividade: AtividadeCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_atividade(atividade: AtividadeCreate, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Cria nova atividade"""
     if current_user.tipo.value != "fornecedor":
         raise HTTPException(status_code=403, detail="Only fornecedores can create atividades")
     
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor:
+    if not current_user.fornecedor_id:
         raise HTTPException(status_code=404, detail="Fornecedor profile not found")
     
-    return crud_atividade.create_atividade(db, atividade, fornecedor.id)
+    return crud_atividade.create_atividade(db, atividade, current_user.fornecedor_id)
 
 
 @router.put("/{atividade_id}", response_model=AtividadeResponse)
-def update_atividade(atividade_id: int, atividade_update: AtividadeUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_atividade(atividade_id: int, atividade_update: AtividadeUpdate, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Atualiza atividade"""
     atividade = crud_atividade.get_atividade(db, atividade_id)
     if not atividade:
         raise HTTPException(status_code=404, detail="Atividade not found")
     
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor or atividade.fornecedor_id != fornecedor.id:
+    if not current_user.fornecedor_id or atividade.fornecedor_id != current_user.fornecedor_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     return crud_atividade.update_atividade(db, atividade_id, atividade_update)
 
 
 @router.delete("/{atividade_id}")
-def delete_atividade(atividade_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_atividade(atividade_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Elimina atividade"""
     atividade = crud_atividade.get_atividade(db, atividade_id)
     if not atividade:
         raise HTTPException(status_code=404, detail="Atividade not found")
     
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor or atividade.fornecedor_id != fornecedor.id:
+    if not current_user.fornecedor_id or atividade.fornecedor_id != current_user.fornecedor_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     crud_atividade.delete_atividade(db, atividade_id)
@@ -70,9 +72,9 @@ def delete_atividade(atividade_id: int, current_user: User = Depends(get_current
 
 
 @router.get("/recomendadas/list", response_model=List[AtividadeResponse])
-def get_atividades_recomendadas(params: RecomendacaoParams, db: Session = Depends(get_db)):
+async def get_atividades_recomendadas(params: RecomendacaoParams, db: AsyncSession = Depends(get_async_read_db)):
     """Obtém atividades recomendadas baseado em critérios"""
-    atividades = crud_atividade.get_atividades_recomendadas(
+    atividades = await crud_atividade_async.get_atividades_recomendadas(
         db,
         n_pessoas=params.n_pessoas,
         orcamento=params.orcamento,
@@ -83,9 +85,9 @@ def get_atividades_recomendadas(params: RecomendacaoParams, db: Session = Depend
 
 
 @router.post("/recomendadas", response_model=List[AtividadeResponse])
-def post_atividades_recomendadas(params: RecomendacaoParams, db: Session = Depends(get_db)):
+async def post_atividades_recomendadas(params: RecomendacaoParams, db: AsyncSession = Depends(get_async_read_db)):
     """Obtém atividades recomendadas (POST)"""
-    atividades = crud_atividade.get_atividades_recomendadas(
+    atividades = await crud_atividade_async.get_atividades_recomendadas(
         db,
         n_pessoas=params.n_pessoas,
         orcamento=params.orcamento,
@@ -99,7 +101,7 @@ def post_atividades_recomendadas(params: RecomendacaoParams, db: Session = Depen
 
 
 @router.post("/{atividade_id}/aprovar")
-def aprovar_atividade(atividade_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def aprovar_atividade(atividade_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Aprova uma atividade (apenas admin)"""
     if current_user.tipo.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can approve atividades")
@@ -110,6 +112,7 @@ def aprovar_atividade(atividade_id: int, current_user: User = Depends(get_curren
     
     atividade.aprovada = True
     atividade.estado = EstadoAtividade.APROVADA
+    invalidar_catalogo(db)
     db.commit()
     db.refresh(atividade)
     
@@ -117,7 +120,7 @@ def aprovar_atividade(atividade_id: int, current_user: User = Depends(get_curren
 
 
 @router.post("/{atividade_id}/rejeitar")
-def rejeitar_atividade(atividade_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def rejeitar_atividade(atividade_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Rejeita uma atividade (apenas admin)"""
     if current_user.tipo.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can reject atividades")
@@ -128,6 +131,7 @@ def rejeitar_atividade(atividade_id: int, current_user: User = Depends(get_curre
     
     atividade.aprovada = False
     atividade.estado = EstadoAtividade.REJEITADA
+    invalidar_catalogo(db)
     db.commit()
     db.refresh(atividade)
     
@@ -135,7 +139,7 @@ def rejeitar_atividade(atividade_id: int, current_user: User = Depends(get_curre
 
 
 @router.get("/pendentes/list", response_model=List[AtividadeResponse])
-def list_atividades_pendentes(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def list_atividades_pendentes(current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Lista atividades pendentes de aprovação (apenas admin)"""
     if current_user.tipo.value != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view pending atividades")
@@ -1,54 +1,147 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import timedelta
-from app.database import get_db
-from app.core.security import create_access_token
-from app.core.config import settings
-from app.core.dependencies import get_current_user, get_current_user_required
-from app.models.user import User
-from app.crud import user as crud_user, empresa as crud_empresa, fornecedor as crud_fornecedor
-from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
-from app.schemas.empresa import EmpresaCreate
-from app.schemas.fornecedor import FornecedorCreate
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database import get_async_db
+from app.core.security import create_token_pair, create_claim_token, decode_claim_token, decode_access_token, decode_refresh_token, revoke_token, has_usable_password, PasswordHasherBusy
+from app.core.dependencies import oauth2_scheme, get_current_identity
+from app.core.identity import Identity, Principal, load_identity_async, invalidate_identity
+from app.crud.aio import user as crud_user_async
+from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, RefreshTokenRequest, ClaimAccountRequest, ClaimAccount
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _emitir_tokens(db: AsyncSession, email: str) -> Optional[dict]:
+    """Access + refresh token com as claims de identidade (ids, tipo e perfil)"""
+    identity = await load_identity_async(db, email)
+    if identity is None:
+        return None
+    return create_token_pair(Principal.from_identity(identity).claims())
+
+
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Registo de novo utilizador"""
     # Verificar se email já existe
-    if crud_user.get_user_by_email(db, user_data.email):
+    if await crud_user_async.get_user_by_email(db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Criar utilizador
-    user = crud_user.create_user(db, user_data)
+    # Criar utilizador (hash no pool de processos)
+    try:
+        user = await crud_user_async.create_user(db, user_data)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again shortly",
+            headers={"Retry-After": "1"},
+        )
     
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login e obtenção de token JWT"""
-    user = crud_user.authenticate_user(db, user_credentials.email, user_credentials.password)
+    try:
+        user = await crud_user_async.authenticate_user(db, user_credentials.email, user_credentials.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await _emitir_tokens(db, user.email)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(refresh: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Troca um refresh token por um novo par de tokens (o refresh usado fica revogado)"""
+    payload = decode_refresh_token(refresh.refresh_token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    revoke_token(payload)
+    # Claims novas: o perfil pode ter mudado desde o login
+    invalidate_identity(payload.get("uid"))
+    tokens = await _emitir_tokens(db, payload["sub"])
+    if tokens is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return tokens
+
+
+@router.post("/logout")
+def logout(refresh: Optional[RefreshTokenRequest] = None, token: Optional[str] = Depends(oauth2_scheme)):
+    """Revoga o access token atual e, se enviado, o refresh token"""
+    payload = decode_access_token(token) if token else None
+    if payload:
+        revoke_token(payload)
+    if refresh:
+        refresh_payload = decode_refresh_token(refresh.refresh_token)
+        if refresh_payload:
+            revoke_token(refresh_payload)
+    return {"message": "Sessão terminada"}
+
+
+@router.post("/claim/request", status_code=status.HTTP_202_ACCEPTED)
+async def request_claim_account(claim: ClaimAccountRequest, db: AsyncSession = Depends(get_async_db)):
+    """Envia por email o link para uma conta guest definir a password"""
+    user = await crud_user_async.get_user_by_email(db, claim.email)
+    if user and not has_usable_password(user.password):
+        from app.services.email import email_service
+        # Pôr na fila é uma escrita síncrona na BD: fora do event loop
+        await run_in_threadpool(
+            email_service.send_claim_account_notification, user.nome, user.email, create_claim_token(user.email)
+        )
+    # Resposta igual exista ou não a conta, para não revelar emails registados
+    return {"message": "Se existir uma conta guest com este email, foi enviado um link"}
+
+
+@router.post("/claim", response_model=Token)
+async def claim_account(claim: ClaimAccount, db: AsyncSession = Depends(get_async_db)):
+    """Reclama uma conta guest: define a password e devolve token de acesso"""
+    email = decode_claim_token(claim.token)
+    if not email:
+        raise HTTPException(status_code=400, detail="Invalid or expired claim token")
+    
+    try:
+        user = await crud_user_async.claim_guest_user(db, email, claim.password, claim.nome)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    if not user:
+        raise HTTPException(status_code=400, detail="Account already claimed")
+    
+    return await _emitir_tokens(db, user.email)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user_required)):
+def get_current_user_info(identity: Optional[Identity] = Depends(get_current_identity)):
     """Obtém informação do utilizador autenticado"""
-    return current_user
+    if identity is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return identity.user
 
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.core.dependencies import get_current_user_required, get_current_empresa
+from app.core.identity import Principal, Snapshot
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.crud import empresa as crud_empresa
 from app.schemas.empresa import EmpresaCreate, EmpresaUpdate, EmpresaResponse
 
@@ -11,26 +12,26 @@ router = APIRouter(prefix="/empresas", tags=["empresas"])
 
 
 @router.get("/", response_model=List[EmpresaResponse])
-def list_empresas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todas as empresas"""
-    empresas = crud_empresa.get_empresas(db, skip=skip, limit=limit)
-    return empresas
+def list_empresas(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_read_db)):
+    """Lista todas as empresas (cursor da página seguinte no header X-Next-Cursor)"""
+    pagina = crud_empresa.get_empresas(db, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, pagina)
+    return pagina.items
 
 
 @router.get("/me", response_model=EmpresaResponse)
-def get_my_empresa(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_my_empresa(current_user: Principal = Depends(get_current_user_required), empresa: Optional[Snapshot] = Depends(get_current_empresa), db: Session = Depends(get_db)):
     """Obtém empresa do utilizador autenticado"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can access this endpoint")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
     if not empresa:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     return empresa
 
 
 @router.get("/{empresa_id}", response_model=EmpresaResponse)
-def get_empresa(empresa_id: int, db: Session = Depends(get_db)):
+def get_empresa(empresa_id: int, db: Session = Depends(get_read_db)):
     """Obtém empresa por ID"""
     empresa = crud_empresa.get_empresa(db, empresa_id)
     if not empresa:
@@ -39,13 +40,12 @@ def get_empresa(empresa_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=EmpresaResponse)
-def create_empresa(empresa: EmpresaCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_empresa(empresa: EmpresaCreate, current_user: Principal = Depends(get_current_user_required), existing: Optional[Snapshot] = Depends(get_current_empresa), db: Session = Depends(get_db)):
     """Cria nova empresa"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create empresa profile")
     
     # Verificar se já tem empresa criada
-    existing = crud_empresa.get_empresa_by_user_id(db, current_user.id)
     if existing:
         raise HTTPException(status_code=400, detail="Empresa profile already exists")
     
@@ -53,7 +53,7 @@ def create_empresa(empresa: EmpresaCreate, current_user: User = Depends(get_curr
 
 
 @router.put("/{empresa_id}", response_model=EmpresaResponse)
-def update_empresa(empresa_id: int, empresa_update: EmpresaUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_empresa(empresa_id: int, empresa_update: EmpresaUpdate, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Atualiza empresa"""
     empresa = crud_empresa.get_empresa(db, empresa_id)
     if not empresa:
@@ -66,7 +66,7 @@ def update_empresa(empresa_id: int, empresa_update: EmpresaUpdate, current_user:
 
 
 @router.delete("/{empresa_id}")
-def delete_empresa(empresa_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_empresa(empresa_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Elimina empresa"""
     empresa = crud_empresa.get_empresa(db, empresa_id)
     if not empresa:
@@ -2,33 +2,68 @@
 Router para gestão completa do evento (reserva)
 Inclui mensagens, documentos e notas
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.core.dependencies import get_current_user_required
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
+from app.database import get_db, get_read_db, get_async_db, AsyncSessionLocal
+from app.core.config import settings
+from app.core.security import decode_access_token, is_token_revoked
+from app.core.dependencies import oauth2_scheme, get_current_user_async, get_current_user_required, get_current_user_required_async
+from app.core.identity import Principal
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.core.responses import FastJSONResponse, dumps, etag_matches, not_modified
 from app.crud import (
+    evento as crud_evento,
     reserva as crud_reserva,
     empresa as crud_empresa,
     fornecedor as crud_fornecedor,
-    mensagem as crud_mensagem,
     documento as crud_documento,
     nota_evento as crud_nota
 )
-from app.schemas.mensagem import MensagemCreate, MensagemResponse
+from app.crud.aio import reserva as crud_reserva_async, mensagem as crud_mensagem_async
+from app.schemas.mensagem import MensagemCreate, MensagemResponse, MensagensLidas
 from app.schemas.documento import DocumentoCreate, DocumentoResponse
 from app.schemas.nota_evento import NotaEventoCreate, NotaEventoUpdate, NotaEventoResponse
+from app.services.realtime import evento_broker
 
 router = APIRouter(prefix="/evento", tags=["evento"])
 
 
+@router.get("/mensagens/por-ler")
+async def get_mensagens_por_ler(
+    current_user: Principal = Depends(get_current_user_required_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mensagens por ler do utilizador, no total e por reserva
+
+    Lê só os contadores (mensagens_por_ler), numa query sobre a chave primária:
+    pensado para polling frequente dos dashboards.
+    """
+    por_ler = await crud_mensagem_async.get_por_ler(db, current_user.id)
+    return {
+        "total": sum(n for _, n in por_ler),
+        "reservas": [{"reserva_id": reserva_id, "por_ler": n} for reserva_id, n in por_ler]
+    }
+
+
 @router.get("/{reserva_id}")
-def get_evento_completo(reserva_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
-    """Obtém todos os dados do evento (single source of truth)"""
-    reserva = crud_reserva.get_reserva(db, reserva_id)
-    if not reserva:
+def get_evento_completo(
+    reserva_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_user_required),
+    db: Session = Depends(get_read_db)
+):
+    """Obtém todos os dados do evento (single source of truth), com ETag para polling"""
+    # Reserva, partes do evento e versão do dossier numa query
+    dossier = crud_evento.get_dossier(db, reserva_id)
+    if not dossier:
         raise HTTPException(status_code=404, detail="Reserva not found")
+    reserva, versao = dossier
     
     # Verificar permissão
     empresa = reserva.empresa
@@ -40,10 +75,13 @@ def get_evento_completo(reserva_id: int, current_user: User = Depends(get_curren
     if not (is_empresa or is_fornecedor):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Buscar todos os dados relacionados
-    mensagens = crud_mensagem.get_mensagens_by_reserva(db, reserva_id)
-    documentos = crud_documento.get_documentos_by_reserva(db, reserva_id)
-    notas = crud_nota.get_notas_by_reserva(db, reserva_id)
+    # Revalidar sempre (no-cache), privado ao utilizador; sem alterações: 304 sem mais queries
+    cache_headers = {"ETag": f'W/"{versao}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, cache_headers["ETag"]):
+        return not_modified(cache_headers)
+    
+    # Mensagens, documentos e notas numa segunda query (UNION ALL)
+    mensagens, documentos, notas = crud_evento.get_dossier_itens(db, reserva_id)
     
     # Formatar resposta
     atividade_info = {
@@ -70,7 +108,8 @@ def get_evento_completo(reserva_id: int, current_user: User = Depends(get_curren
             "contacto": fornecedor.contacto or fornecedor.user.email
         }
     
-    return {
+    # FastJSONResponse direto, sem passar pelo jsonable_encoder (datetimes em ISO 8601)
+    return FastJSONResponse({
         "reserva": {
             "id": reserva.id,
             "data": reserva.data.isoformat(),
@@ -82,55 +121,21 @@ def get_evento_completo(reserva_id: int, current_user: User = Depends(get_curren
         "atividade": atividade_info,
         "empresa": empresa_info,
         "fornecedor": fornecedor_info,
-        "mensagens": [
-            {
-                "id": m.id,
-                "remetente_id": m.remetente_id,
-                "destinatario_id": m.destinatario_id,
-                "conteudo": m.conteudo,
-                "lida": m.lida,
-                "data_criacao": m.data_criacao.isoformat(),
-                "remetente_nome": m.remetente.nome
-            }
-            for m in mensagens
-        ],
-        "documentos": [
-            {
-                "id": d.id,
-                "nome": d.nome,
-                "url": d.url,
-                "tipo": d.tipo,
-                "descricao": d.descricao,
-                "uploaded_by_id": d.uploaded_by_id,
-                "data_upload": d.data_upload.isoformat(),
-                "uploaded_by_nome": d.uploaded_by.nome
-            }
-            for d in documentos
-        ],
-        "notas": [
-            {
-                "id": n.id,
-                "titulo": n.titulo,
-                "conteudo": n.conteudo,
-                "criado_por_id": n.criado_por_id,
-                "data_criacao": n.data_criacao.isoformat(),
-                "data_atualizacao": n.data_atualizacao.isoformat(),
-                "criado_por_nome": n.criado_por.nome
-            }
-            for n in notas
-        ]
-    }
+        "mensagens": mensagens,
+        "documentos": documentos,
+        "notas": notas
+    }, headers=cache_headers)
 
 
 @router.post("/{reserva_id}/mensagens", response_model=MensagemResponse)
-def create_mensagem(
+async def create_mensagem(
     reserva_id: int,
     mensagem: MensagemCreate,
-    current_user: User = Depends(get_current_user_required),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user_required_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cria nova mensagem no evento"""
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+    reserva = await crud_reserva_async.get_reserva(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
@@ -158,16 +163,9 @@ def create_mensagem(
         conteudo=mensagem.conteudo
     )
     
-    db_mensagem = crud_mensagem.create_mensagem(db, mensagem_data, current_user.id)
-    
-    # Notificar destinatário por email
-    from app.services.email import email_service
-    destinatario = db.query(User).filter(User.id == destinatario_id).first()
-    if destinatario:
-        # TODO: Enviar email de notificação de nova mensagem
-        pass
+    db_mensagem = await crud_mensagem_async.create_mensagem(db, mensagem_data, current_user.id)
     
-    return {
+    result = {
         "id": db_mensagem.id,
         "reserva_id": db_mensagem.reserva_id,
         "remetente_id": db_mensagem.remetente_id,
@@ -177,17 +175,22 @@ def create_mensagem(
         "data_criacao": db_mensagem.data_criacao.isoformat(),
         "remetente_nome": current_user.nome
     }
+    
+    # Push para as ligações abertas em /evento/{reserva_id}/stream
+    evento_broker.publish(reserva_id, "mensagem", result)
+    
+    return result
 
 
 @router.post("/{reserva_id}/documentos", response_model=DocumentoResponse)
 def create_documento(
     reserva_id: int,
     documento: DocumentoCreate,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Upload de documento para o evento"""
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+    reserva = crud_reserva.get_reserva_detalhe(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
@@ -201,14 +204,15 @@ def create_documento(
     if not (is_empresa or is_fornecedor):
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # A reserva do caminho prevalece sobre a do corpo
     documento_data = DocumentoCreate(
         reserva_id=reserva_id,
-        **documento.dict()
+        **documento.dict(exclude={"reserva_id"})
     )
     
     db_documento = crud_documento.create_documento(db, documento_data, current_user.id)
     
-    return {
+    result = {
         "id": db_documento.id,
         "reserva_id": db_documento.reserva_id,
         "nome": db_documento.nome,
@@ -219,17 +223,21 @@ def create_documento(
         "data_upload": db_documento.data_upload.isoformat(),
         "uploaded_by_nome": current_user.nome
     }
+    
+    evento_broker.publish(reserva_id, "documento", result)
+    
+    return result
 
 
 @router.post("/{reserva_id}/notas", response_model=NotaEventoResponse)
 def create_nota(
     reserva_id: int,
     nota: NotaEventoCreate,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Cria nota no evento"""
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+    reserva = crud_reserva.get_reserva_detalhe(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
@@ -245,12 +253,12 @@ def create_nota(
     
     nota_data = NotaEventoCreate(
         reserva_id=reserva_id,
-        **nota.dict()
+        **nota.dict(exclude={"reserva_id"})
     )
     
     db_nota = crud_nota.create_nota(db, nota_data, current_user.id)
     
-    return {
+    result = {
         "id": db_nota.id,
         "reserva_id": db_nota.reserva_id,
         "titulo": db_nota.titulo,
@@ -260,12 +268,34 @@ def create_nota(
         "data_atualizacao": db_nota.data_atualizacao.isoformat(),
         "criado_por_nome": current_user.nome
     }
+    
+    evento_broker.publish(reserva_id, "nota", result)
+    
+    return result
 
 
 @router.get("/{reserva_id}/mensagens", response_model=List[MensagemResponse])
-def get_mensagens(reserva_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
-    """Lista mensagens do evento"""
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+async def get_mensagens(
+    reserva_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    desde: Optional[int] = None,
+    antes_de: Optional[int] = None,
+    recentes: bool = False,
+    current_user: Principal = Depends(get_current_user_required_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lista mensagens do evento, por ordem cronológica
+
+    - sem parâmetros: desde o início (cursor da página seguinte no header X-Next-Cursor)
+    - desde=<id>: só as mensagens novas depois dessa (polling / após reconectar ao stream)
+    - recentes=true: as últimas mensagens; antes_de=<id> carrega as anteriores a essa
+    """
+    if (antes_de is not None or recentes) and (page.cursor or desde is not None):
+        raise HTTPException(status_code=400, detail="antes_de/recentes cannot be combined with cursor/desde")
+    
+    reserva = await crud_reserva_async.get_reserva(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
@@ -279,7 +309,10 @@ def get_mensagens(reserva_id: int, current_user: User = Depends(get_current_user
     if not (is_empresa or is_fornecedor):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    mensagens = crud_mensagem.get_mensagens_by_reserva(db, reserva_id)
+    pagina = await crud_mensagem_async.get_mensagens_by_reserva(
+        db, reserva_id, cursor=page.cursor, limit=page.limit, desde=desde, antes_de=antes_de, recentes=recentes
+    )
+    set_next_cursor(response, pagina)
     
     return [
         {
@@ -292,5 +325,111 @@ def get_mensagens(reserva_id: int, current_user: User = Depends(get_current_user
             "data_criacao": m.data_criacao.isoformat(),
             "remetente_nome": m.remetente.nome
         }
-        for m in mensagens
+        for m in pagina.items
     ]
+
+
+@router.post("/{reserva_id}/mensagens/lidas")
+async def marcar_mensagens_lidas(
+    reserva_id: int,
+    lidas: MensagensLidas,
+    current_user: Principal = Depends(get_current_user_required_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Marca como lidas as mensagens recebidas pelo utilizador até à mensagem ate_id (inclusive)"""
+    reserva = await crud_reserva_async.get_reserva(db, reserva_id)
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva not found")
+    
+    # Verificar permissão
+    empresa = reserva.empresa
+    fornecedor = reserva.atividade.fornecedor if reserva.atividade else None
+    
+    is_empresa = current_user.tipo.value == "empresa" and empresa and empresa.user_id == current_user.id
+    is_fornecedor = current_user.tipo.value == "fornecedor" and fornecedor and fornecedor.user_id == current_user.id
+    
+    if not (is_empresa or is_fornecedor):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    marcadas = await crud_mensagem_async.marcar_lidas_ate(db, reserva_id, current_user.id, lidas.ate_id)
+    
+    result = {"destinatario_id": current_user.id, "ate_id": lidas.ate_id, "marcadas": marcadas}
+    if marcadas:
+        # Confirmação de leitura para o remetente
+        evento_broker.publish(reserva_id, "lidas", result)
+    
+    return result
+
+
+async def _eventos_sse(request: Request, fila: asyncio.Queue, token_payload: dict) -> AsyncIterator[bytes]:
+    """
+    Itens da fila no formato Server-Sent Events, com keep-alive enquanto não há eventos
+
+    Termina com o evento "expirado" quando o access token da ligação expira ou é
+    revogado (logout): o cliente renova o token e volta a ligar.
+    """
+    yield b"retry: 3000\n\n"
+    while True:
+        restante = token_payload["exp"] - time.time()
+        if restante <= 0 or is_token_revoked(token_payload):
+            yield b"event: expirado\ndata: {}\n\n"
+            break
+        try:
+            evento = await asyncio.wait_for(fila.get(), timeout=min(settings.REALTIME_HEARTBEAT, restante))
+        except asyncio.TimeoutError:
+            if await request.is_disconnected():
+                break
+            yield b": keep-alive\n\n"
+            continue
+        yield b"event: " + evento["tipo"].encode("utf-8") + b"\ndata: " + dumps(evento["dados"]) + b"\n\n"
+
+
+@router.get("/{reserva_id}/stream")
+async def stream_evento(
+    reserva_id: int,
+    request: Request,
+    token: Optional[str] = None,
+    bearer: Optional[str] = Depends(oauth2_scheme)
+):
+    """
+    Canal Server-Sent Events do evento: novas mensagens, documentos e notas das duas partes
+
+    Eventos "mensagem", "documento" e "nota" com o item em JSON (a mesma forma das
+    respostas de criação), "recarregar" quando o cliente perdeu eventos e "expirado"
+    antes de fechar quando o access token expira ou é revogado.
+    O EventSource do browser não envia headers: o access token pode vir em ?token=.
+    """
+    # Sessão só para a autorização: não fica presa durante o stream
+    async with AsyncSessionLocal() as db:
+        current_user = await get_current_user_async(bearer or token, db)
+        token_payload = decode_access_token(bearer or token) if current_user else None
+        if token_payload is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        reserva = await crud_reserva_async.get_reserva(db, reserva_id)
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva not found")
+    
+    # Verificar permissão
+    empresa = reserva.empresa
+    fornecedor = reserva.atividade.fornecedor if reserva.atividade else None
+    
+    is_empresa = current_user.tipo.value == "empresa" and empresa and empresa.user_id == current_user.id
+    is_fornecedor = current_user.tipo.value == "fornecedor" and fornecedor and fornecedor.user_id == current_user.id
+    
+    if not (is_empresa or is_fornecedor):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    async def eventos():
+        async with evento_broker.subscribe(reserva_id) as fila:
+            async for bloco in _eventos_sse(request, fila, token_payload):
+                yield bloco
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
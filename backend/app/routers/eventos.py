@@ -1,22 +1,33 @@
 """
 Router para criação de eventos e geração de propostas
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Header, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.identity import Principal
+from app.core.security import verify_access_key
 from app.crud import empresa as crud_empresa
-from app.models.atividade import Atividade
+from app.crud import proposta_evento as crud_proposta_evento
+from app.models.evento import PropostaGerada
 from app.schemas.evento import (
     EventoCreate,
     EventoPropostasResponse,
+    GrupoReserva,
     PropostaEvento,
-    PropostaEventoItem,
     PropostaEventoUpdate
 )
-from app.services.proposta_generator import gerar_propostas_evento
+from app.services.proposta_generator import (
+    agenda_json,
+    atividades_da_agenda,
+    brief_guardado,
+    guardar_propostas_evento,
+    ler_id_proposta,
+    proposta_guardada,
+    revalidar_agenda,
+    validar_atividade
+)
 
 router = APIRouter(prefix="/eventos", tags=["eventos"])
 
@@ -24,7 +35,7 @@ router = APIRouter(prefix="/eventos", tags=["eventos"])
 @router.post("/criar", response_model=EventoPropostasResponse)
 def criar_evento(
     evento_data: EventoCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -33,79 +44,144 @@ def criar_evento(
     # Se usuário autenticado, buscar empresa
     empresa_id = None
     if current_user and current_user.tipo.value == "empresa":
-        empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-        if empresa:
-            empresa_id = empresa.id
+        empresa_id = current_user.empresa_id
     
-    # Gerar propostas usando o serviço
-    propostas = gerar_propostas_evento(db, evento_data)
+    # Gerar propostas usando o serviço e guardar o evento e as propostas
+    evento_id, chave_acesso, propostas = guardar_propostas_evento(db, evento_data, empresa_id)
     
-    # Por agora, retornar propostas geradas
-    # Em produção, salvar evento e propostas no banco
     return {
-        "evento_id": 1,  # TODO: criar evento no banco
+        "evento_id": evento_id,
+        "chave_acesso": chave_acesso,
         "propostas": propostas
     }
 
 
+def get_proposta_guardada(
+    db: Session,
+    proposta_id: str,
+    current_user: Optional[Principal],
+    chave_acesso: Optional[str]
+) -> PropostaGerada:
+    """
+    Proposta prop_<id> guardada
+
+    A de um evento de uma empresa só é acessível a essa empresa (ou admin); a de
+    um evento criado sem login, a quem tem a chave de acesso devolvida na criação.
+    """
+    numero = ler_id_proposta(proposta_id)
+    proposta = crud_proposta_evento.get_proposta(db, numero) if numero is not None else None
+    if not proposta:
+        raise HTTPException(status_code=404, detail="Proposta not found")
+    evento = proposta.evento
+    if current_user and current_user.tipo.value == "admin":
+        return proposta
+    if evento.empresa_id is not None:
+        autorizado = current_user is not None and current_user.empresa_id == evento.empresa_id
+    else:
+        autorizado = verify_access_key(chave_acesso, evento.chave_hash)
+    if not autorizado:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return proposta
+
+
 @router.post("/propostas/{proposta_id}/editar", response_model=PropostaEvento)
 def editar_proposta(
     proposta_id: str,
-    proposta_atualizada: dict = Body(...),
-    current_user: User = Depends(get_current_user),
+    proposta_atualizada: PropostaEventoUpdate,
+    chave_acesso: Optional[str] = Header(None, alias="X-Evento-Chave"),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Edita uma proposta (revalida disponibilidade se necessário)
-    Por agora, apenas retorna a proposta atualizada (validação será feita no frontend)
+    Edita a agenda de uma proposta guardada
+    Revalida as atividades (aprovadas, com capacidade) e recalcula os preços
     """
-    # TODO: Implementar validação de disponibilidade no backend
-    # Por agora, aceitar edições do frontend
-    return proposta_atualizada
+    proposta = get_proposta_guardada(db, proposta_id, current_user, chave_acesso)
+    evento = brief_guardado(proposta)
+    
+    atividades = atividades_da_agenda(db, agenda_json(proposta_atualizada.agenda))
+    try:
+        agenda = revalidar_agenda(evento, proposta_atualizada.agenda, atividades)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    resposta = proposta_guardada(proposta, evento, agenda)
+    resposta.observacoes = proposta_atualizada.observacoes
+    crud_proposta_evento.update_proposta(db, proposta.id, agenda_json(agenda), proposta_atualizada.observacoes)
+    return resposta
 
 
 @router.post("/propostas/{proposta_id}/confirmar")
 def confirmar_proposta(
     proposta_id: str,
     proposta_data: dict = Body(...),
-    grupos: Optional[List[dict]] = Body(None),
-    current_user: Optional[User] = Depends(get_current_user),
+    grupos: Optional[List[GrupoReserva]] = Body(None),
+    chave_acesso: Optional[str] = Header(None, alias="X-Evento-Chave"),
+    current_user: Optional[Principal] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Confirma uma proposta e cria reserva(s)
+    Confirma uma proposta guardada e cria reserva(s) para as atividades da agenda
     Se grupos for fornecido, cria reservas separadas para cada grupo
     Se usuário não autenticado, cria empresa temporária
+    proposta_data só é lido para os dados da empresa temporária
     """
     from app.crud import reserva as crud_reserva, user as crud_user
-    from app.schemas.reserva import ReservaCreate, ReservaGuestCreate
-    from app.models.reserva import EstadoReserva
-    from app.models.user import TipoUsuario
-    from datetime import datetime, date
+    
+    proposta = get_proposta_guardada(db, proposta_id, current_user, chave_acesso)
+    evento = brief_guardado(proposta)
+    
+    # Atividades da agenda guardada, todas numa query
+    atividades = atividades_da_agenda(db, proposta.agenda)
+    ids_agenda = [item.get('atividade_id') for item in proposta.agenda if item.get('tipo') == 'atividade']
+    
+    if grupos:
+        # Reservas por grupo, só das atividades da proposta
+        pedidos = [
+            (item.atividade_id, grupo.n_pessoas)
+            for grupo in grupos
+            for item in grupo.atividades
+            if item.tipo == 'atividade' and item.atividade_id in ids_agenda
+        ]
+    else:
+        # Reservas da agenda para o número de pessoas do evento
+        pedidos = [(atividade_id, evento.n_pessoas) for atividade_id in ids_agenda]
+    
+    if not pedidos:
+        raise HTTPException(status_code=400, detail="Nenhuma reserva foi criada. Verifique se há atividades válidas na proposta.")
+    
+    # Revalidar antes de qualquer escrita: a agenda guardada pode ter deixado de estar disponível
+    try:
+        itens = [
+            (validar_atividade(atividades, atividade_id, n_pessoas), n_pessoas)
+            for atividade_id, n_pessoas in pedidos
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Buscar ou criar empresa
     empresa_id = None
     
     if current_user and current_user.tipo.value == "empresa":
         # Usuário autenticado como empresa
-        empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-        if empresa:
-            empresa_id = empresa.id
+        empresa_id = current_user.empresa_id
     elif proposta_data.get('email') and proposta_data.get('nome_empresa'):
         # Usuário não autenticado - criar empresa temporária
         # Verificar se já existe usuário com esse email
         user_guest = crud_user.get_user_by_email(db, proposta_data['email'])
         
         if not user_guest:
-            # Criar usuário guest
-            from app.schemas.user import UserCreate
-            user_data = UserCreate(
-                email=proposta_data['email'],
-                password="guest_temp",  # Senha temporária
-                nome=proposta_data.get('nome_empresa', 'Guest'),
-                tipo=TipoUsuario.EMPRESA
+            # Criar usuário guest (sem password, reclamável por email)
+            from app.core.security import create_claim_token
+            from app.services.email import email_service
+            user_guest = crud_user.create_guest_user(
+                db,
+                proposta_data.get('nome_empresa', 'Guest'),
+                proposta_data['email']
+            )
+            email_service.send_claim_account_notification(
+                user_guest.nome, user_guest.email, create_claim_token(user_guest.email)
             )
-            user_guest = crud_user.create_user(db, user_data)
         
         # Verificar se empresa já existe
         empresa = crud_empresa.get_empresa_by_user_id(db, user_guest.id)
@@ -128,76 +204,7 @@ def confirmar_proposta(
             detail="Não foi possível identificar ou criar a empresa. Por favor, faça login ou forneça email e nome da empresa."
         )
     
-    # Extrair data do evento (assumindo que está na proposta ou usar data atual)
-    evento_data = proposta_data.get('data_evento')
-    if isinstance(evento_data, str):
-        try:
-            evento_data = datetime.fromisoformat(evento_data).date()
-        except:
-            evento_data = datetime.now().date()
-    elif not evento_data:
-        evento_data = datetime.now().date()
-    
-    reservas_criadas = []
-    
-    if grupos:
-        # Criar reservas por grupo
-        for grupo in grupos:
-            for atividade_item in grupo.get('atividades', []):
-                if atividade_item.get('tipo') == 'atividade' and atividade_item.get('atividade_id'):
-                    atividade = db.query(Atividade).filter(
-                        Atividade.id == atividade_item['atividade_id']
-                    ).first()
-                    
-                    if atividade:
-                        reserva_data = ReservaCreate(
-                            atividade_id=atividade.id,
-                            data=evento_data,
-                            n_pessoas=grupo['n_pessoas']
-                        )
-                        
-                        preco_total = atividade.preco_por_pessoa * grupo['n_pessoas']
-                        
-                        reserva = crud_reserva.create_reserva(
-                            db,
-                            reserva_data,
-                            empresa_id,
-                            preco_total=preco_total
-                        )
-                        if reserva:
-                            reservas_criadas.append(reserva.id)
-    else:
-        # Criar reservas normais baseadas na agenda da proposta
-        agenda = proposta_data.get('agenda', [])
-        for item in agenda:
-            if item.get('tipo') == 'atividade' and item.get('atividade_id'):
-                atividade = db.query(Atividade).filter(
-                    Atividade.id == item['atividade_id']
-                ).first()
-                
-                if atividade:
-                    # Calcular número de pessoas (usar preço para inferir)
-                    n_pessoas = int(proposta_data.get('preco_total', 0) / proposta_data.get('preco_por_pessoa', 1)) if proposta_data.get('preco_por_pessoa', 0) > 0 else 1
-                    
-                    reserva_data = ReservaCreate(
-                        atividade_id=atividade.id,
-                        data=evento_data,
-                        n_pessoas=n_pessoas
-                    )
-                    
-                    preco_total = atividade.preco_por_pessoa * n_pessoas
-                    
-                    reserva = crud_reserva.create_reserva(
-                        db,
-                        reserva_data,
-                        empresa_id,
-                        preco_total=preco_total
-                    )
-                    if reserva:
-                        reservas_criadas.append(reserva.id)
-    
-    if not reservas_criadas:
-        raise HTTPException(status_code=400, detail="Nenhuma reserva foi criada. Verifique se há atividades válidas na proposta.")
+    reservas_criadas = crud_reserva.create_reservas(db, empresa_id, evento.data_inicio, itens)
     
     return {
         "reservas_criadas": reservas_criadas,
@@ -5,10 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.core.dependencies import get_current_user_required
-from app.models.user import User
+from app.core.identity import Principal
 from app.crud import (
     reserva as crud_reserva,
-    empresa as crud_empresa,
     pagamento as crud_pagamento
 )
 from app.schemas.pagamento import (
@@ -28,7 +27,7 @@ router = APIRouter(prefix="/pagamentos", tags=["pagamentos"])
 @router.post("/", response_model=PagamentoResponse)
 def create_pagamento(
     pagamento_data: PagamentoCreate,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Cria novo pagamento para uma reserva"""
@@ -36,9 +35,7 @@ def create_pagamento(
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create payments")
     
-    # Buscar empresa
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa not found")
     
     # Verificar reserva
@@ -47,7 +44,7 @@ def create_pagamento(
         raise HTTPException(status_code=404, detail="Reserva not found")
     
     # Verificar se reserva pertence à empresa
-    if reserva.empresa_id != empresa.id:
+    if reserva.empresa_id != current_user.empresa_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Verificar se já existe pagamento
@@ -81,22 +78,21 @@ def create_pagamento(
 @router.post("/cartao", response_model=dict)
 def create_pagamento_cartao(
     pagamento_data: PagamentoCartaoCreate,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Cria pagamento com cartão (via gateway)"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create payments")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa not found")
     
     reserva = crud_reserva.get_reserva(db, pagamento_data.reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
-    if reserva.empresa_id != empresa.id:
+    if reserva.empresa_id != current_user.empresa_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Criar pagamento no banco
@@ -119,7 +115,7 @@ def create_pagamento_cartao(
         currency="eur",
         metadata={
             "reserva_id": reserva.id,
-            "empresa_id": empresa.id,
+            "empresa_id": current_user.empresa_id,
             "pagamento_id": db_pagamento.id
         },
         payment_method="card"
@@ -147,22 +143,21 @@ def create_pagamento_cartao(
 @router.post("/mbway", response_model=dict)
 def create_pagamento_mbway(
     pagamento_data: PagamentoMBWayCreate,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Cria pagamento MB Way"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create payments")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa not found")
     
     reserva = crud_reserva.get_reserva(db, pagamento_data.reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
-    if reserva.empresa_id != empresa.id:
+    if reserva.empresa_id != current_user.empresa_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Criar pagamento
@@ -185,7 +180,7 @@ def create_pagamento_mbway(
         telefone=pagamento_data.telefone,
         metadata={
             "reserva_id": reserva.id,
-            "empresa_id": empresa.id,
+            "empresa_id": current_user.empresa_id,
             "pagamento_id": db_pagamento.id
         }
     )
@@ -212,7 +207,7 @@ def create_pagamento_mbway(
 def confirmar_pagamento(
     pagamento_id: int,
     confirmacao: PagamentoConfirmar,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Confirma pagamento após processamento no gateway"""
@@ -289,7 +284,7 @@ def confirmar_pagamento(
 @router.get("/reserva/{reserva_id}", response_model=PagamentoResponse)
 def get_pagamento_by_reserva(
     reserva_id: int,
-    current_user: User = Depends(get_current_user_required),
+    current_user: Principal = Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """Busca pagamento de uma reserva"""
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
-from app.core.dependencies import get_current_user_required
-from app.models.user import User
-from app.crud import proposta as crud_proposta, fornecedor as crud_fornecedor, empresa as crud_empresa
+from app.core.dependencies import get_current_user_required, get_current_empresa, get_current_fornecedor
+from app.core.identity import Principal, Snapshot
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.crud import proposta as crud_proposta
 from app.schemas.proposta import PropostaCreate, PropostaUpdate, PropostaResponse
 from app.services.email import email_service
 
@@ -12,12 +13,11 @@ router = APIRouter(prefix="/propostas", tags=["propostas"])
 
 
 @router.post("/", response_model=PropostaResponse)
-def create_proposta(proposta: PropostaCreate, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def create_proposta(proposta: PropostaCreate, current_user: Principal = Depends(get_current_user_required), fornecedor: Optional[Snapshot] = Depends(get_current_fornecedor), db: Session = Depends(get_db)):
     """Cria nova proposta (fornecedor)"""
     if current_user.tipo.value != "fornecedor":
         raise HTTPException(status_code=403, detail="Only fornecedores can create propostas")
     
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
     if not fornecedor:
         raise HTTPException(status_code=404, detail="Fornecedor profile not found")
     
@@ -74,7 +74,7 @@ def create_proposta(proposta: PropostaCreate, current_user: User = Depends(get_c
 
 
 @router.get("/rfq/{rfq_id}", response_model=List[PropostaResponse])
-def get_propostas_by_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def get_propostas_by_rfq(rfq_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Lista propostas de um RFQ (empresa)"""
     from app.crud import rfq as crud_rfq
     
@@ -84,8 +84,7 @@ def get_propostas_by_rfq(rfq_id: int, current_user: User = Depends(get_current_u
     
     # Verificar permissão
     if current_user.tipo.value == "empresa":
-        empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-        if not empresa or rfq.empresa_id != empresa.id:
+        if not current_user.empresa_id or rfq.empresa_id != current_user.empresa_id:
             raise HTTPException(status_code=403, detail="Not authorized")
     elif current_user.tipo.value == "fornecedor":
         raise HTTPException(status_code=403, detail="Fornecedores cannot view all propostas of an RFQ")
@@ -127,19 +126,25 @@ def get_propostas_by_rfq(rfq_id: int, current_user: User = Depends(get_current_u
 
 
 @router.get("/minhas", response_model=List[PropostaResponse])
-def get_my_propostas(current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
-    """Lista propostas do fornecedor logado"""
+def get_my_propostas(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: Principal = Depends(get_current_user_required),
+    fornecedor: Optional[Snapshot] = Depends(get_current_fornecedor),
+    db: Session = Depends(get_db)
+):
+    """Lista propostas do fornecedor logado (cursor da página seguinte no header X-Next-Cursor)"""
     if current_user.tipo.value != "fornecedor":
         raise HTTPException(status_code=403, detail="Only fornecedores can access this endpoint")
     
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
     if not fornecedor:
         raise HTTPException(status_code=404, detail="Fornecedor profile not found")
     
-    propostas = crud_proposta.get_propostas_by_fornecedor(db, fornecedor.id)
+    pagina = crud_proposta.get_propostas_by_fornecedor(db, fornecedor.id, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, pagina)
     
     result = []
-    for proposta in propostas:
+    for proposta in pagina.items:
         atividade_nome = None
         if proposta.atividade_id:
             atividade = proposta.atividade
@@ -169,12 +174,11 @@ def get_my_propostas(current_user: User = Depends(get_current_user_required), db
 
 
 @router.post("/{proposta_id}/aceitar", response_model=PropostaResponse)
-def aceitar_proposta(proposta_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def aceitar_proposta(proposta_id: int, current_user: Principal = Depends(get_current_user_required), empresa: Optional[Snapshot] = Depends(get_current_empresa), db: Session = Depends(get_db)):
     """Aceita uma proposta (empresa)"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can accept propostas")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
     if not empresa:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
@@ -268,13 +272,12 @@ def aceitar_proposta(proposta_id: int, current_user: User = Depends(get_current_
 
 
 @router.post("/{proposta_id}/recusar", response_model=PropostaResponse)
-def recusar_proposta(proposta_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def recusar_proposta(proposta_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Recusa uma proposta (empresa)"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can reject propostas")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
     proposta = crud_proposta.get_proposta(db, proposta_id)
@@ -284,7 +287,7 @@ def recusar_proposta(proposta_id: int, current_user: User = Depends(get_current_
     # Verificar se o RFQ pertence à empresa
     from app.crud import rfq as crud_rfq
     rfq = crud_rfq.get_rfq(db, proposta.rfq_id)
-    if not rfq or rfq.empresa_id != empresa.id:
+    if not rfq or rfq.empresa_id != current_user.empresa_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     proposta = crud_proposta.recusar_proposta(db, proposta_id)
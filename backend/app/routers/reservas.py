@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.database import get_db
-from app.core.dependencies import get_current_user, get_current_user_required
-from app.core.security import get_password_hash
+from app.database import get_db, get_async_db
+from app.core.dependencies import get_current_user_required, get_current_user_required_async
+from app.core.identity import Principal
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.core.security import create_claim_token
 from app.models.user import User, TipoUsuario
-from app.crud import reserva as crud_reserva, empresa as crud_empresa
+from app.crud import reserva as crud_reserva, empresa as crud_empresa, user as crud_user
+from app.crud.aio import reserva as crud_reserva_async
+from app.models.empresa import Empresa
 from app.schemas.reserva import ReservaCreate, ReservaGuestCreate, ReservaResponse, ReservaCancel
 from app.services.email import email_service
 
@@ -15,18 +20,17 @@ router = APIRouter(prefix="/reservas", tags=["reservas"])
 @router.post("/", response_model=ReservaResponse)
 def create_reserva(
     reserva: ReservaCreate, 
-    current_user: User = Depends(get_current_user_required), 
+    current_user: Principal = Depends(get_current_user_required), 
     db: Session = Depends(get_db)
 ):
     """Cria nova reserva (requer autenticação)"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create reservas")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
-    db_reserva = crud_reserva.create_reserva(db, reserva, empresa.id)
+    db_reserva = crud_reserva.create_reserva(db, reserva, current_user.empresa_id)
     if not db_reserva:
         raise HTTPException(status_code=400, detail="Could not create reserva. Check capacidade and atividade exists.")
     
@@ -80,16 +84,11 @@ def create_reserva_guest(reserva_guest: ReservaGuestCreate, db: Session = Depend
             )
             empresa = crud_empresa.create_empresa(db, empresa_data, user_guest.id)
     else:
-        # Criar user guest e empresa
-        user_guest = User(
-            nome=reserva_guest.nome_empresa,
-            email=reserva_guest.email,
-            password=get_password_hash("guest_temp_password"),  # Password temporário
-            tipo=TipoUsuario.EMPRESA
+        # Criar user guest (sem password, reclamável por email) e empresa
+        user_guest = crud_user.create_guest_user(db, reserva_guest.nome_empresa, reserva_guest.email)
+        email_service.send_claim_account_notification(
+            user_guest.nome, user_guest.email, create_claim_token(user_guest.email)
         )
-        db.add(user_guest)
-        db.commit()
-        db.refresh(user_guest)
         
         # Criar empresa
         from app.schemas.empresa import EmpresaCreate
@@ -137,20 +136,27 @@ def create_reserva_guest(reserva_guest: ReservaGuestCreate, db: Session = Depend
 
 
 @router.get("/{empresa_id}", response_model=List[ReservaResponse])
-def list_reservas_empresa(empresa_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Lista reservas de uma empresa"""
-    empresa = crud_empresa.get_empresa(db, empresa_id)
+async def list_reservas_empresa(
+    empresa_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: Principal = Depends(get_current_user_required_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lista reservas de uma empresa, mais recentes primeiro (cursor da página seguinte no header X-Next-Cursor)"""
+    empresa = await db.get(Empresa, empresa_id)
     if not empresa:
         raise HTTPException(status_code=404, detail="Empresa not found")
     
     if empresa.user_id != current_user.id and current_user.tipo.value != "fornecedor":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    reservas = crud_reserva.get_reservas_by_empresa(db, empresa_id)
+    pagina = await crud_reserva_async.get_reservas_by_empresa(db, empresa_id, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, pagina)
     
     # Adicionar info das atividades
     result = []
-    for reserva in reservas:
+    for reserva in pagina.items:
         atividade_info = {
             "id": reserva.atividade.id,
             "nome": reserva.atividade.nome,
@@ -172,7 +178,7 @@ def list_reservas_empresa(empresa_id: int, current_user: User = Depends(get_curr
 
 
 @router.post("/cancelar", response_model=ReservaResponse)
-def cancelar_reserva(cancel: ReservaCancel, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def cancelar_reserva(cancel: ReservaCancel, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Cancela uma reserva"""
     reserva = crud_reserva.get_reserva(db, cancel.reserva_id)
     if not reserva:
@@ -204,7 +210,7 @@ def cancelar_reserva(cancel: ReservaCancel, current_user: User = Depends(get_cur
 
 
 @router.get("/fornecedor/{fornecedor_id}", response_model=List[ReservaResponse])
-def list_reservas_fornecedor(fornecedor_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def list_reservas_fornecedor(fornecedor_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Lista reservas de um fornecedor"""
     from app.crud import fornecedor as crud_fornecedor
     
@@ -214,17 +220,11 @@ def list_reservas_fornecedor(fornecedor_id: int, current_user: User = Depends(ge
     
     # Verificar se é o próprio fornecedor ou admin
     if current_user.tipo.value != "admin":
-        fornecedor_user = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-        if not fornecedor_user or fornecedor_user.id != fornecedor_id:
+        if not current_user.fornecedor_id or current_user.fornecedor_id != fornecedor_id:
             raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Buscar reservas das atividades do fornecedor
-    from app.models.reserva import Reserva
-    from app.models.atividade import Atividade
-    
-    reservas = db.query(Reserva).join(Atividade).filter(
-        Atividade.fornecedor_id == fornecedor_id
-    ).all()
+    # Buscar reservas das atividades do fornecedor (atividade carregada no mesmo JOIN)
+    reservas = crud_reserva.get_reservas_by_fornecedor(db, fornecedor_id)
     
     result = []
     for reserva in reservas:
@@ -249,18 +249,16 @@ def list_reservas_fornecedor(fornecedor_id: int, current_user: User = Depends(ge
 
 
 @router.post("/{reserva_id}/aceitar", response_model=ReservaResponse)
-def aceitar_reserva(reserva_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def aceitar_reserva(reserva_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Aceita uma reserva (fornecedor)"""
-    from app.crud import fornecedor as crud_fornecedor
     from app.models.reserva import Reserva, EstadoReserva
     
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+    reserva = crud_reserva.get_reserva_detalhe(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
     # Verificar se o fornecedor é dono da atividade
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor or reserva.atividade.fornecedor_id != fornecedor.id:
+    if not current_user.fornecedor_id or reserva.atividade.fornecedor_id != current_user.fornecedor_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     reserva.estado = EstadoReserva.CONFIRMADA
@@ -303,18 +301,16 @@ def aceitar_reserva(reserva_id: int, current_user: User = Depends(get_current_us
 
 
 @router.post("/{reserva_id}/recusar", response_model=ReservaResponse)
-def recusar_reserva(reserva_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def recusar_reserva(reserva_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Recusa uma reserva (fornecedor)"""
-    from app.crud import fornecedor as crud_fornecedor
     from app.models.reserva import Reserva, EstadoReserva
     
-    reserva = crud_reserva.get_reserva(db, reserva_id)
+    reserva = crud_reserva.get_reserva_detalhe(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva not found")
     
     # Verificar se o fornecedor é dono da atividade
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor or reserva.atividade.fornecedor_id != fornecedor.id:
+    if not current_user.fornecedor_id or reserva.atividade.fornecedor_id != current_user.fornecedor_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     reserva.estado = EstadoReserva.RECUSADA
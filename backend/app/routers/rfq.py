@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.core.dependencies import get_current_user_required
-from app.models.user import User
-from app.crud import rfq as crud_rfq, empresa as crud_empresa
+from app.core.identity import Principal
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.crud import rfq as crud_rfq
 from app.schemas.rfq import RFQCreate, RFQResponse
 from app.services.email import email_service
 
@@ -12,20 +13,18 @@ router = APIRouter(prefix="/rfq", tags=["rfq"])
 
 
 @router.post("/", response_model=RFQResponse)
-def create_rfq(rfq: RFQCreate, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def create_rfq(rfq: RFQCreate, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Cria novo RFQ (Request for Quote)"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can create RFQs")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
-    db_rfq = crud_rfq.create_rfq(db, rfq, empresa.id)
+    db_rfq = crud_rfq.create_rfq(db, rfq, current_user.empresa_id)
     
-    # Contar número de propostas (será 0 inicialmente)
-    from app.crud import proposta as crud_proposta
-    num_propostas = len(crud_proposta.get_propostas_by_rfq(db, db_rfq.id))
+    # RFQ acabado de criar: ainda não tem propostas
+    num_propostas = 0
     
     # Enviar notificação por email para a empresa
     rfq_dict = {
@@ -42,8 +41,7 @@ def create_rfq(rfq: RFQCreate, current_user: User = Depends(get_current_user_req
     # TODO: Buscar fornecedores relevantes e notificar
     # from app.crud import fornecedor as crud_fornecedor
     # fornecedores = crud_fornecedor.get_fornecedores_relevantes(db, db_rfq)
-    # for fornecedor in fornecedores:
-    #     email_service.send_rfq_received_notification(rfq_dict, fornecedor.user.email)
+    # email_service.send_rfq_received_notifications(rfq_dict, [f.user.email for f in fornecedores])
     
     return {
         "id": db_rfq.id,
@@ -66,21 +64,19 @@ def create_rfq(rfq: RFQCreate, current_user: User = Depends(get_current_user_req
 
 
 @router.get("/", response_model=List[RFQResponse])
-def list_my_rfqs(current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def list_my_rfqs(current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Lista RFQs da empresa logada"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can access this endpoint")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
-    rfqs = crud_rfq.get_rfqs_by_empresa(db, empresa.id)
+    # RFQs e contagem de propostas numa só query (subquery COUNT correlacionada)
+    rfqs = crud_rfq.get_rfqs_by_empresa_com_num_propostas(db, current_user.empresa_id)
     
-    from app.crud import proposta as crud_proposta
     result = []
-    for rfq in rfqs:
-        num_propostas = len(crud_proposta.get_propostas_by_rfq(db, rfq.id))
+    for rfq, num_propostas in rfqs:
         result.append({
             "id": rfq.id,
             "empresa_id": rfq.empresa_id,
@@ -104,7 +100,7 @@ def list_my_rfqs(current_user: User = Depends(get_current_user_required), db: Se
 
 
 @router.get("/{rfq_id}", response_model=RFQResponse)
-def get_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def get_rfq(rfq_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Obtém detalhes de um RFQ"""
     rfq = crud_rfq.get_rfq(db, rfq_id)
     if not rfq:
@@ -112,8 +108,7 @@ def get_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required)
     
     # Verificar permissão
     if current_user.tipo.value == "empresa":
-        empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-        if not empresa or rfq.empresa_id != empresa.id:
+        if not current_user.empresa_id or rfq.empresa_id != current_user.empresa_id:
             raise HTTPException(status_code=403, detail="Not authorized")
     elif current_user.tipo.value == "fornecedor":
         # Fornecedor pode ver RFQs abertos
@@ -123,7 +118,7 @@ def get_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required)
         raise HTTPException(status_code=403, detail="Not authorized")
     
     from app.crud import proposta as crud_proposta
-    num_propostas = len(crud_proposta.get_propostas_by_rfq(db, rfq.id))
+    num_propostas = crud_proposta.count_propostas_by_rfq(db, rfq.id)
     
     return {
         "id": rfq.id,
@@ -146,69 +141,75 @@ def get_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required)
 
 
 @router.get("/fornecedor/disponiveis", response_model=List[RFQResponse])
-def list_rfqs_disponiveis(current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
-    """Lista RFQs disponíveis para fornecedores responderem"""
+def list_rfqs_disponiveis(
+    response: Response,
+    localizacao: Optional[str] = None,
+    categoria: Optional[str] = None,
+    compativeis: bool = False,
+    page: PageParams = Depends(page_params),
+    current_user: Principal = Depends(get_current_user_required),
+    db: Session = Depends(get_read_db)
+):
+    """Lista RFQs disponíveis para fornecedores responderem, mais recentes primeiro (cursor da página seguinte no header X-Next-Cursor)"""
     if current_user.tipo.value != "fornecedor":
         raise HTTPException(status_code=403, detail="Only fornecedores can access this endpoint")
     
-    from app.crud import fornecedor as crud_fornecedor
-    fornecedor = crud_fornecedor.get_fornecedor_by_user_id(db, current_user.id)
-    if not fornecedor:
+    if not current_user.fornecedor_id:
         raise HTTPException(status_code=404, detail="Fornecedor profile not found")
     
-    # Por agora, retorna todos os RFQs abertos
-    # Futuramente pode filtrar por localização, categoria, etc.
-    rfqs = crud_rfq.get_rfqs_abertos(db)
+    # Só RFQs sem proposta deste fornecedor, com contagem de propostas, numa só query (NOT EXISTS)
+    pagina = crud_rfq.get_rfqs_por_fornecedor(
+        db,
+        current_user.fornecedor_id,
+        localizacao=localizacao,
+        categoria=categoria,
+        compativeis=compativeis,
+        cursor=page.cursor,
+        limit=page.limit
+    )
+    set_next_cursor(response, pagina)
     
-    from app.crud import proposta as crud_proposta
     result = []
-    for rfq in rfqs:
-        # Verificar se já enviou proposta
-        propostas = crud_proposta.get_propostas_by_rfq(db, rfq.id)
-        ja_respondeu = any(p.fornecedor_id == fornecedor.id for p in propostas)
-        
-        if not ja_respondeu:  # Só mostrar se ainda não respondeu
-            num_propostas = len(propostas)
-            result.append({
-                "id": rfq.id,
-                "empresa_id": rfq.empresa_id,
-                "n_pessoas": rfq.n_pessoas,
-                "data_preferida": rfq.data_preferida,
-                "data_alternativa": rfq.data_alternativa,
-                "localizacao": rfq.localizacao,
-                "raio_km": rfq.raio_km,
-                "orcamento_max": rfq.orcamento_max,
-                "objetivo": rfq.objetivo,
-                "preferencias": rfq.preferencias,
-                "categoria_preferida": rfq.categoria_preferida,
-                "clima_preferido": rfq.clima_preferido,
-                "duracao_max_minutos": rfq.duracao_max_minutos,
-                "estado": rfq.estado.value,
-                "data_criacao": rfq.data_criacao.isoformat(),
-                "num_propostas": num_propostas
-            })
+    for rfq, num_propostas in pagina.items:
+        result.append({
+            "id": rfq.id,
+            "empresa_id": rfq.empresa_id,
+            "n_pessoas": rfq.n_pessoas,
+            "data_preferida": rfq.data_preferida,
+            "data_alternativa": rfq.data_alternativa,
+            "localizacao": rfq.localizacao,
+            "raio_km": rfq.raio_km,
+            "orcamento_max": rfq.orcamento_max,
+            "objetivo": rfq.objetivo,
+            "preferencias": rfq.preferencias,
+            "categoria_preferida": rfq.categoria_preferida,
+            "clima_preferido": rfq.clima_preferido,
+            "duracao_max_minutos": rfq.duracao_max_minutos,
+            "estado": rfq.estado.value,
+            "data_criacao": rfq.data_criacao.isoformat(),
+            "num_propostas": num_propostas
+        })
     
     return result
 
 
 @router.post("/{rfq_id}/cancelar", response_model=RFQResponse)
-def cancelar_rfq(rfq_id: int, current_user: User = Depends(get_current_user_required), db: Session = Depends(get_db)):
+def cancelar_rfq(rfq_id: int, current_user: Principal = Depends(get_current_user_required), db: Session = Depends(get_db)):
     """Cancela um RFQ"""
     if current_user.tipo.value != "empresa":
         raise HTTPException(status_code=403, detail="Only empresas can cancel RFQs")
     
-    empresa = crud_empresa.get_empresa_by_user_id(db, current_user.id)
-    if not empresa:
+    if not current_user.empresa_id:
         raise HTTPException(status_code=404, detail="Empresa profile not found")
     
     rfq = crud_rfq.get_rfq(db, rfq_id)
-    if not rfq or rfq.empresa_id != empresa.id:
+    if not rfq or rfq.empresa_id != current_user.empresa_id:
         raise HTTPException(status_code=404, detail="RFQ not found or not authorized")
     
     rfq = crud_rfq.cancelar_rfq(db, rfq_id)
     
     from app.crud import proposta as crud_proposta
-    num_propostas = len(crud_proposta.get_propostas_by_rfq(db, rfq.id))
+    num_propostas = crud_proposta.count_propostas_by_rfq(db, rfq.id)
     
     return {
         "id": rfq.id,
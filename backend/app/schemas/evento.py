@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, PositiveInt, field_validator
 from typing import List, Optional
 from datetime import date
 
@@ -70,16 +70,29 @@ class PropostaEvento(BaseModel):
     resumo: str
     notas_importantes: Optional[str] = None
     inclusoes: List[str]  # O que está incluído
+    observacoes: Optional[str] = None  # Do cliente, ao editar
 
 
 class EventoPropostasResponse(BaseModel):
     """Resposta com 3 propostas geradas"""
     evento_id: int
+    chave_acesso: str  # Header X-Evento-Chave para editar/confirmar as propostas (só devolvida aqui)
     propostas: List[PropostaEvento]
 
 
 class PropostaEventoUpdate(BaseModel):
-    """Atualização de uma proposta"""
-    proposta_id: str  # A, B, ou C
+    """Atualização de uma proposta (o id vem do path; os preços são recalculados)"""
     agenda: List[PropostaEventoItem]
     observacoes: Optional[str] = None
+
+
+class GrupoItem(BaseModel):
+    """Item da agenda atribuído a um grupo (só o tipo e a atividade contam)"""
+    tipo: str
+    atividade_id: Optional[int] = None
+
+
+class GrupoReserva(BaseModel):
+    """Grupo da equipa na confirmação: uma reserva por atividade para n_pessoas"""
+    n_pessoas: PositiveInt
+    atividades: List[GrupoItem] = []
@@ -20,3 +20,7 @@ class MensagemResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class MensagensLidas(BaseModel):
+    ate_id: int
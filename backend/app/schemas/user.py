@@ -15,6 +15,18 @@ class UserLogin(BaseModel):
     password: str
 
 
+class ClaimAccountRequest(BaseModel):
+    """Pedido de link para reclamar uma conta guest"""
+    email: EmailStr
+
+
+class ClaimAccount(BaseModel):
+    """Definição da password de uma conta guest a partir do link recebido"""
+    token: str
+    password: str
+    nome: Optional[str] = None
+
+
 class UserResponse(BaseModel):
     id: int
     nome: str
@@ -29,4 +41,9 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
@@ -0,0 +1,149 @@
+"""
+Dados mock para desenvolvimento (opt-in)
+
+Uso (a partir de backend/, depois de "alembic upgrade head"):
+    python -m app.seed
+"""
+import sys
+from sqlalchemy import insert
+from app.database import SessionLocal
+from app.models.user import User, TipoUsuario
+from app.models.empresa import Empresa
+from app.models.fornecedor import Fornecedor
+from app.models.atividade import Atividade, EstadoAtividade
+from app.core.security import get_password_hash
+
+CREDENCIAIS = [
+    ("TechCorp", "empresa@example.com", "empresa123", TipoUsuario.EMPRESA),
+    ("Adventure Tours", "fornecedor@example.com", "fornecedor123", TipoUsuario.FORNECEDOR),
+    ("Admin TeamEvents", "admin@example.com", "admin123", TipoUsuario.ADMIN),
+]
+
+ATIVIDADES_MOCK = [
+    {
+        "nome": "Canoagem no Tejo",
+        "tipo": "canoagem",
+        "categoria": "aventura",
+        "preco_por_pessoa": 25.0,
+        "capacidade_max": 30,
+        "localizacao": "Lisboa",
+        "descricao": "Passeio de canoagem pelo rio Tejo com guia experiente",
+        "imagens": '["https://images.unsplash.com/photo-1544551763-46a013bb70d5?w=800"]',
+        "clima": "outdoor",
+        "duracao_minutos": 120
+    },
+    {
+        "nome": "Passeio de Barco",
+        "tipo": "barco",
+        "categoria": "relax",
+        "preco_por_pessoa": 40.0,
+        "capacidade_max": 20,
+        "localizacao": "Cascais",
+        "descricao": "Passeio de barco pela costa de Cascais",
+        "imagens": '["https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800"]',
+        "clima": "outdoor",
+        "duracao_minutos": 180
+    },
+    {
+        "nome": "Paintball",
+        "tipo": "paintball",
+        "categoria": "team_building",
+        "preco_por_pessoa": 35.0,
+        "capacidade_max": 40,
+        "localizacao": "Sintra",
+        "descricao": "Jogo de paintball em campo ao ar livre",
+        "imagens": '["https://images.unsplash.com/photo-1578662996442-48f60103fc96?w=800"]',
+        "clima": "outdoor",
+        "duracao_minutos": 90
+    },
+    {
+        "nome": "Escalada",
+        "tipo": "escalada",
+        "categoria": "aventura",
+        "preco_por_pessoa": 30.0,
+        "capacidade_max": 15,
+        "localizacao": "Sintra",
+        "descricao": "Atividade de escalada em rocha com instrutores",
+        "imagens": '["https://images.unsplash.com/photo-1544966503-7cc5315a0c8b?w=800"]',
+        "clima": "outdoor",
+        "duracao_minutos": 150
+    },
+    {
+        "nome": "Caminhada Guiada",
+        "tipo": "caminhada",
+        "categoria": "relax",
+        "preco_por_pessoa": 15.0,
+        "capacidade_max": 25,
+        "localizacao": "Sintra",
+        "descricao": "Caminhada pelas serras de Sintra com guia",
+        "imagens": '["https://images.unsplash.com/photo-1551632811-561732d1e306?w=800"]',
+        "clima": "outdoor",
+        "duracao_minutos": 240
+    }
+]
+
+
+def seed(db) -> bool:
+    """Cria os dados mock numa única transação. Devolve False se já existirem dados."""
+    if db.query(User.id).first():
+        return False
+
+    # Um INSERT por tabela (executemany/RETURNING) e um único commit
+    user_ids = dict(db.execute(
+        insert(User).returning(User.email, User.id),
+        [
+            {"nome": nome, "email": email, "password": get_password_hash(password), "tipo": tipo}
+            for nome, email, password, tipo in CREDENCIAIS
+        ]
+    ).all())
+
+    db.execute(insert(Empresa), [{
+        "user_id": user_ids["empresa@example.com"],
+        "nome": "TechCorp",
+        "setor": "Tecnologia",
+        "n_funcionarios": 50,
+        "localizacao": "Lisboa",
+        "orcamento_medio": 5000.0,
+        "preferencia_atividades": "Atividades ao ar livre"
+    }])
+
+    fornecedor_id = db.execute(
+        insert(Fornecedor).returning(Fornecedor.id),
+        [{
+            "user_id": user_ids["fornecedor@example.com"],
+            "nome": "Adventure Tours",
+            "localizacao": "Lisboa",
+            "descricao": "Fornecedor de atividades de aventura",
+            "contacto": "+351 123 456 789"
+        }]
+    ).scalar_one()
+
+    db.execute(insert(Atividade), [
+        {**atividade, "fornecedor_id": fornecedor_id, "aprovada": True, "estado": EstadoAtividade.APROVADA}
+        for atividade in ATIVIDADES_MOCK
+    ])
+
+    db.commit()
+    return True
+
+
+def main():
+    db = SessionLocal()
+    try:
+        if not seed(db):
+            print("ℹ️  Dados mock já existem, nada a fazer.")
+            return
+        print(f"✓ {len(CREDENCIAIS)} utilizadores e {len(ATIVIDADES_MOCK)} atividades aprovadas criados")
+        print("📝 Credenciais de teste:")
+        for _, email, password, _ in CREDENCIAIS:
+            print(f"   {email} / {password}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro ao criar dados mock: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
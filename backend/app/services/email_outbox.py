@@ -0,0 +1,241 @@
+"""
+Envio de emails em background a partir da fila email_outbox
+
+EmailService.send_email só insere o email na fila (uma INSERT) e acorda o
+dispatcher; a latência do pedido não depende do servidor de email.
+
+O dispatcher (uma thread por processo) reserva lotes de até EMAIL_BATCH_SIZE
+emails e divide-os pelas EMAIL_WORKERS threads de envio; cada thread envia a
+sua parte numa só ligação SMTP. Por email:
+  - enviado: ENVIADO
+  - erro temporário (ligação, 4xx): nova tentativa com backoff exponencial,
+    EMAIL_RETRY_BASE * 2^(tentativa - 1) segundos, até EMAIL_RETRY_MAX
+  - erro permanente (5xx) ou EMAIL_MAX_ATTEMPTS esgotadas: FALHADO
+    (dead-letter, listado e reenviado em /admin/emails)
+
+Com EMAIL_ENABLED o transporte é SMTP (SMTP_HOST, ...); sem ele os emails
+são escritos na consola, como em desenvolvimento.
+
+Vários processos podem despachar a mesma fila (reservar_lote usa um lease e
+SKIP LOCKED). Com EMAIL_WORKERS=0 a API não despacha e o envio corre à parte:
+    python -m app.services.email_outbox
+"""
+import logging
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Callable, List, Optional, Tuple
+from app.core.config import settings
+from app.crud import email_outbox as crud_email_outbox
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ConsoleTransport:
+    """Escreve os emails na consola (EMAIL_ENABLED=false)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def enviar(self, email):
+        print(f"📧 [EMAIL DISABLED] To: {email.destinatario}")
+        print(f"   Subject: {email.assunto}")
+        print(f"   Content: {email.texto or email.html[:100]}...")
+
+
+class SMTPTransport:
+    """Uma ligação SMTP para vários emails"""
+
+    def __init__(self, host: str, port: int, user: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self):
+        self._smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                self._smtp.starttls()
+            if self.user:
+                self._smtp.login(self.user, self.password or "")
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            self._smtp.close()
+        except OSError:
+            pass
+        self._smtp = None
+        return False
+
+    def enviar(self, email):
+        mensagem = EmailMessage()
+        mensagem["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+        mensagem["To"] = email.destinatario
+        mensagem["Subject"] = email.assunto
+        mensagem.set_content(email.texto or "")
+        mensagem.add_alternative(email.html, subtype="html")
+        self._smtp.send_message(mensagem)
+
+
+def transporte_configurado():
+    if not settings.EMAIL_ENABLED:
+        return ConsoleTransport()
+    return SMTPTransport(
+        settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER, settings.SMTP_PASSWORD,
+        settings.SMTP_STARTTLS, settings.SMTP_TIMEOUT
+    )
+
+
+def erro_permanente(erro: Exception) -> bool:
+    """Recusas 5xx do servidor não melhoram com novas tentativas"""
+    if isinstance(erro, smtplib.SMTPRecipientsRefused):
+        return all(codigo >= 500 for codigo, _ in erro.recipients.values())
+    return isinstance(erro, smtplib.SMTPResponseException) and erro.smtp_code >= 500
+
+
+def atraso_nova_tentativa(tentativas: int) -> float:
+    """Segundos até à próxima tentativa depois de `tentativas` falhadas"""
+    return min(settings.EMAIL_RETRY_BASE * 2 ** (tentativas - 1), settings.EMAIL_RETRY_MAX)
+
+
+class EmailDispatcher:
+    """Despacha a fila email_outbox com um pool de threads de envio"""
+
+    def __init__(self, workers: int, lote: int, intervalo: float, lease: int, max_tentativas: int,
+                 transporte: Callable = transporte_configurado):
+        self.workers = workers
+        self.lote = lote
+        self.intervalo = intervalo
+        self.lease = lease
+        self.max_tentativas = max_tentativas
+        self.transporte = transporte
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        """Arranca a thread do dispatcher (nada a fazer com workers=0)"""
+        if self.workers <= 0 or self._thread is not None:
+            return
+        self._parar.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="email")
+        self._thread = threading.Thread(target=self._loop, name="email-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Termina depois do lote em curso; o que ficar na fila segue no próximo arranque"""
+        if self._thread is None:
+            return
+        self._parar.set()
+        self._acordar.set()
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=True)
+        self._thread = None
+        self._pool = None
+
+    def acordar(self):
+        """Há emails novos: não esperar pelo intervalo de polling"""
+        self._acordar.set()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                processados = self.despachar()
+            except Exception:
+                logger.exception("Falha ao despachar a fila de emails")
+                processados = 0
+            # Lote cheio: provavelmente há mais, segue de imediato
+            if processados < self.lote:
+                self._acordar.wait(self.intervalo)
+                self._acordar.clear()
+
+    def despachar(self) -> int:
+        """Reserva, envia e regista um lote; devolve quantos emails tratou"""
+        db = SessionLocal()
+        try:
+            emails = crud_email_outbox.reservar_lote(db, self.lote, self.lease)
+        finally:
+            db.close()
+        if not emails:
+            return 0
+
+        # Uma parte por thread de envio (cada uma com a sua ligação SMTP)
+        n_partes = max(1, min(self.workers, len(emails)))
+        partes = [emails[i::n_partes] for i in range(n_partes)]
+        if self._pool is not None and n_partes > 1:
+            resultados = [r for parte in self._pool.map(self._enviar_parte, partes) for r in parte]
+        else:
+            resultados = [r for parte in partes for r in self._enviar_parte(parte)]
+
+        db = SessionLocal()
+        try:
+            crud_email_outbox.marcar_enviados(db, [email.id for email, erro in resultados if erro is None])
+            for email, erro in resultados:
+                if erro is not None:
+                    self._registar_falha(db, email, erro)
+        finally:
+            db.close()
+        return len(emails)
+
+    def _enviar_parte(self, emails: list) -> List[Tuple[object, Optional[Exception]]]:
+        """Envia os emails numa só ligação; (email, erro ou None) por email"""
+        resultados = []
+        try:
+            with self.transporte() as transporte:
+                for email in emails:
+                    try:
+                        transporte.enviar(email)
+                        resultados.append((email, None))
+                    except (smtplib.SMTPException, OSError) as erro:
+                        resultados.append((email, erro))
+        except (smtplib.SMTPException, OSError) as erro:
+            # Ligação falhou: os emails por enviar ficam com esse erro
+            enviados = {email.id for email, _ in resultados}
+            resultados.extend((email, erro) for email in emails if email.id not in enviados)
+        return resultados
+
+    def _registar_falha(self, db, email, erro: Exception):
+        descricao = f"{type(erro).__name__}: {erro}"
+        if erro_permanente(erro) or email.tentativas >= self.max_tentativas:
+            logger.warning("Email %s para %s falhou em definitivo: %s", email.id, email.destinatario, descricao)
+            crud_email_outbox.registar_falha(db, email.id, descricao, None)
+        else:
+            proxima = datetime.utcnow() + timedelta(seconds=atraso_nova_tentativa(email.tentativas))
+            crud_email_outbox.registar_falha(db, email.id, descricao, proxima)
+
+
+email_dispatcher = EmailDispatcher(
+    workers=settings.EMAIL_WORKERS,
+    lote=settings.EMAIL_BATCH_SIZE,
+    intervalo=settings.EMAIL_POLL_INTERVAL,
+    lease=settings.EMAIL_LEASE,
+    max_tentativas=settings.EMAIL_MAX_ATTEMPTS
+)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    email_dispatcher.workers = max(email_dispatcher.workers, 1)
+    email_dispatcher.start()
+    try:
+        email_dispatcher._thread.join()
+    except KeyboardInterrupt:
+        email_dispatcher.stop()
@@ -0,0 +1,112 @@
+"""
+Templates dos emails, compilados uma vez no arranque
+
+Cada email tem o assunto em ASSUNTOS e o corpo em app/templates/email, em
+<nome>.html e <nome>.txt. Os corpos estendem _layout.html/_layout.txt (estilos,
+cabeçalho, caixa de conteúdo) e usam as macros de _partes.html/_partes.txt
+(lista de detalhes, botão).
+
+O Environment não volta a ler os ficheiros (auto_reload=False): depois de
+compilados no arranque, renderizar é só executar o código gerado.
+render_lote renderiza um email para muitos destinatários, uma vez por cada
+contexto individual diferente (p. ex. o mesmo RFQ para N fornecedores é
+renderizado uma só vez).
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from app.core.config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Assunto de cada email; os corpos estão em <nome>.html e <nome>.txt
+ASSUNTOS = {
+    "rfq_criado": "RFQ #{{ rfq.id }} criado com sucesso",
+    "rfq_recebido": "Novo RFQ #{{ rfq.id }} disponível",
+    "proposta_recebida": "Nova proposta recebida para RFQ #{{ proposta.rfq_id }}",
+    "proposta_aceite": "Proposta aceite! RFQ #{{ proposta.rfq_id }}",
+    "reserva_confirmada": "Reserva confirmada - {{ reserva.atividade_nome | default('Evento') }}",
+    "claim_conta": "Aceda às suas reservas no TeamSync",
+}
+
+
+@dataclass(frozen=True)
+class EmailRenderizado:
+    assunto: str
+    html: str
+    texto: str
+
+
+def _euros(valor: float) -> str:
+    return f"€{valor:.2f}"
+
+
+def _chave(contexto: Mapping[str, Any]):
+    """Chave do contexto individual para reaproveitar renders iguais no mesmo lote"""
+    try:
+        return tuple(sorted(contexto.items()))
+    except TypeError:
+        return repr(sorted(contexto.items(), key=lambda item: item[0]))
+
+
+class EmailTemplates:
+    """Registo dos templates de email compilados"""
+
+    def __init__(self, pasta: Path = TEMPLATES_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(str(pasta)),
+            # HTML escapado; texto e assuntos não
+            autoescape=select_autoescape(["html"], default_for_string=False),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self.env.filters["euros"] = _euros
+        self.env.globals["frontend_url"] = settings.FRONTEND_URL
+        self._templates = {
+            nome: (
+                self.env.from_string(assunto),
+                self.env.get_template(f"{nome}.html"),
+                self.env.get_template(f"{nome}.txt")
+            )
+            for nome, assunto in ASSUNTOS.items()
+        }
+
+    def render(self, template: str, /, **contexto: Any) -> EmailRenderizado:
+        """Assunto, HTML e texto de um email"""
+        assunto, html, texto = self._templates[template]
+        return EmailRenderizado(
+            assunto=assunto.render(contexto).strip(),
+            html=html.render(contexto),
+            texto=texto.render(contexto)
+        )
+
+    def render_lote(
+        self,
+        template: str,
+        comum: Mapping[str, Any],
+        individuais: Optional[Sequence[Mapping[str, Any]]] = None,
+        n: Optional[int] = None
+    ) -> List[EmailRenderizado]:
+        """
+        O mesmo email para vários destinatários
+
+        comum é o contexto partilhado (p. ex. o RFQ); individuais, um contexto
+        por destinatário (p. ex. o nome), ou None com n destinatários sem nada
+        próprio. Cada contexto individual distinto é renderizado uma só vez.
+        """
+        if individuais is None:
+            individuais = [{}] * (n or 0)
+        renders: Dict[Any, EmailRenderizado] = {}
+        resultado = []
+        for individual in individuais:
+            chave = _chave(individual)
+            if chave not in renders:
+                renders[chave] = self.render(template, **{**comum, **individual})
+            resultado.append(renders[chave])
+        return resultado
+
+
+# Compilados na importação, i.e. no arranque da aplicação
+email_templates = EmailTemplates()
@@ -0,0 +1,239 @@
+"""
+Motor de pontuação das atividades para as propostas de evento
+
+Guarda o catálogo aprovado em colunas NumPy (preço, capacidade, duração,
+rating, categoria em one-hot, clima, tipo e localização codificados) e
+pontua todas as atividades de um brief numa só passagem vetorizada:
+
+  - filtros: capacidade para o grupo e algum dos tipos pedidos
+  - pontuação base, igual à de crud.atividade.select_atividades_candidatas
+    (tipos correspondidos, localização, faixa de preço, rating / 5), mais
+    PONTOS_DURACAO se a atividade cabe no bloco de horário do brief
+  - afinidade com cada tema de proposta (TEMAS), somada à base: uma
+    multiplicação da matriz one-hot das categorias pela matriz de pesos dá a
+    afinidade de todas as atividades com todos os temas
+
+top_k_por_tema devolve, por tema, o id e os pontos das k melhores atividades
+(empates por preço e id, como na query).
+
+O catálogo é carregado na primeira utilização (uma query só com as colunas
+necessárias) e reconstruído quando a versão do catálogo na base de dados
+muda (app.core.catalogo, escritas de qualquer worker) ou ao fim de
+CATALOGO_TTL segundos. NumPy é opcional: sem ele,
+motor_atividades.disponivel é False e o gerador usa a query pontuada.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud import atividade as crud_atividade
+from app.crud.atividade import TIPOS_EVENTO, PONTOS_LOCALIZACAO, PONTOS_FAIXA_PRECO
+from app.schemas.evento import EventoCreate
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional: sem NumPy o gerador usa a query pontuada
+    np = None
+
+# Afinidade de cada tema de proposta com a categoria e o clima das atividades
+TEMAS = {
+    "aventura": {
+        "categoria": {"aventura": 3.0, "esporte": 2.0},
+        "clima": {"outdoor": 1.0, "ambos": 0.5},
+    },
+    "criativa": {
+        "categoria": {"cultural": 3.0, "gastronomia": 2.0, "relax": 2.0},
+        "clima": {"indoor": 1.0, "ambos": 0.5},
+    },
+    "hibrida": {
+        "categoria": {"team_building": 3.0},
+        "clima": {},
+    },
+}
+
+# Duração máxima (minutos) de uma atividade em cada bloco do brief
+DURACAO_BLOCO = {"manha": 240, "tarde": 180, "dia_todo": 240}
+PONTOS_DURACAO = 0.5
+
+
+def afinidade_tema(categoria: Optional[str], clima: Optional[str], tema: str) -> float:
+    """Afinidade de uma atividade com um tema (mesmos pesos do motor)"""
+    pesos = TEMAS[tema]
+    return pesos["categoria"].get(categoria or "", 0.0) + pesos["clima"].get(clima or "", 0.0)
+
+
+def _codificar(valores: Sequence[Optional[str]]) -> Tuple[List[str], "np.ndarray"]:
+    """Vocabulário (valores distintos) e o código de cada valor nesse vocabulário"""
+    vocabulario, codigos = np.unique(np.array([v or "" for v in valores], dtype=object), return_inverse=True)
+    return [str(v) for v in vocabulario], codigos.astype(np.int32)
+
+
+class CatalogoAtividades:
+    """Colunas das atividades aprovadas (snapshot imutável)"""
+
+    def __init__(self, linhas: Sequence, versao: int = 0):
+        n = len(linhas)
+        self.versao = versao
+        self.carregado_em = time.monotonic()
+        self.ids = np.fromiter((l.id for l in linhas), dtype=np.int64, count=n)
+        self.preco = np.fromiter((l.preco_por_pessoa for l in linhas), dtype=np.float64, count=n)
+        self.capacidade = np.fromiter((l.capacidade_max for l in linhas), dtype=np.int64, count=n)
+        self.duracao = np.fromiter(
+            (np.nan if l.duracao_minutos is None else l.duracao_minutos for l in linhas), dtype=np.float64, count=n
+        )
+        self.rating = np.fromiter((l.rating_medio or 0.0 for l in linhas), dtype=np.float64, count=n)
+        self.categorias, self.categoria = _codificar([l.categoria for l in linhas])
+        self.climas, self.clima = _codificar([l.clima for l in linhas])
+        self.tipos, self.tipo = _codificar([l.tipo for l in linhas])
+        self.locais, self.local = _codificar([(l.localizacao or "").strip().lower() for l in linhas])
+        self.categoria_one_hot = np.eye(len(self.categorias), dtype=np.float64)[self.categoria]
+        self._indice_local = {local: i for i, local in enumerate(self.locais)}
+
+        # Pesos dos temas: (categorias x temas) e (climas x temas)
+        self.temas = list(TEMAS)
+        self._pesos_categoria = np.array(
+            [[TEMAS[tema]["categoria"].get(c, 0.0) for tema in self.temas] for c in self.categorias]
+        ).reshape(len(self.categorias), len(self.temas))
+        self._pesos_clima = np.array(
+            [[TEMAS[tema]["clima"].get(c, 0.0) for tema in self.temas] for c in self.climas]
+        ).reshape(len(self.climas), len(self.temas))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _corresponde_tipo(self, tipo: str) -> "np.ndarray":
+        """Atividades de um tipo do brief (mesma regra que crud.atividade.condicao_tipo_evento)"""
+        if tipo in TIPOS_EVENTO:
+            coluna, valores = TIPOS_EVENTO[tipo]
+            vocabulario, codigos = (self.categorias, self.categoria) if coluna == "categoria" else (self.climas, self.clima)
+            return np.array([v in valores for v in vocabulario], dtype=bool)[codigos]
+        # Tipo desconhecido: substring na categoria ou no tipo, avaliada uma vez por valor distinto
+        na_categoria = np.array([tipo in c.lower() for c in self.categorias], dtype=bool)
+        no_tipo = np.array([tipo in t.lower() for t in self.tipos], dtype=bool)
+        return na_categoria[self.categoria] | no_tipo[self.tipo]
+
+    def pontuar(
+        self,
+        evento: EventoCreate,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Máscara das atividades válidas para o brief e pontuação base de cada uma"""
+        validas = self.capacidade >= evento.n_pessoas
+        pontos = self.rating / 5
+
+        tipos = [tipo.strip().lower() for tipo in evento.tipos_atividades if tipo.strip()]
+        if tipos:
+            correspondidos = np.zeros(len(self), dtype=np.float64)
+            for tipo in tipos:
+                correspondidos += self._corresponde_tipo(tipo)
+            validas &= correspondidos > 0
+            pontos = pontos + correspondidos
+
+        local = self._indice_local.get((evento.localizacao or "").strip().lower())
+        if local is not None and self.locais[local]:
+            pontos = pontos + PONTOS_LOCALIZACAO * (self.local == local)
+
+        if preco_min is not None or preco_max is not None:
+            na_faixa = np.ones(len(self), dtype=bool)
+            if preco_min is not None:
+                na_faixa &= self.preco >= preco_min
+            if preco_max is not None:
+                na_faixa &= self.preco < preco_max
+            pontos = pontos + PONTOS_FAIXA_PRECO * na_faixa
+
+        bloco = DURACAO_BLOCO.get(evento.duracao_atividades)
+        if bloco is not None:
+            pontos = pontos + PONTOS_DURACAO * (self.duracao <= bloco)
+
+        return validas, pontos
+
+    def top_k_por_tema(
+        self,
+        evento: EventoCreate,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        k: int = 2
+    ) -> Dict[str, List[Tuple[int, float]]]:
+        """(id, pontos) das k melhores atividades de cada tema para o brief"""
+        validas, pontos = self.pontuar(evento, preco_min, preco_max)
+        candidatas = np.flatnonzero(validas)
+        if len(candidatas) == 0:
+            return {tema: [] for tema in self.temas}
+
+        # (candidatas x temas): base + afinidade de categoria + afinidade de clima
+        total = (
+            pontos[candidatas, None]
+            + self.categoria_one_hot[candidatas] @ self._pesos_categoria
+            + self._pesos_clima[self.clima[candidatas]]
+        )
+        precos = self.preco[candidatas]
+        ids = self.ids[candidatas]
+        resultado = {}
+        for coluna, tema in enumerate(self.temas):
+            melhores = _top_k(total[:, coluna], precos, ids, k)
+            resultado[tema] = list(zip(ids[melhores].tolist(), total[melhores, coluna].tolist()))
+        return resultado
+
+
+def _top_k(pontos: "np.ndarray", precos: "np.ndarray", ids: "np.ndarray", k: int) -> "np.ndarray":
+    """Índices das k maiores pontuações; empates pelo menor preço e depois menor id"""
+    if len(pontos) > k:
+        # Só as que chegam ao k-ésimo valor (inclui os empates nesse valor)
+        limiar = np.partition(pontos, len(pontos) - k)[len(pontos) - k]
+        indices = np.flatnonzero(pontos >= limiar)
+    else:
+        indices = np.arange(len(pontos))
+    ordem = np.lexsort((ids[indices], precos[indices], -pontos[indices]))
+    return indices[ordem[:k]]
+
+
+class MotorAtividades:
+    """Catálogo NumPy partilhado pelo processo, reconstruído quando fica desatualizado"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._catalogo: Optional[CatalogoAtividades] = None
+        self._lock = threading.Lock()
+
+    @property
+    def disponivel(self) -> bool:
+        return np is not None
+
+    def _desatualizado(self, catalogo: Optional[CatalogoAtividades], versao: int) -> bool:
+        return (
+            catalogo is None
+            or catalogo.versao != versao
+            or time.monotonic() - catalogo.carregado_em > self.ttl
+        )
+
+    def catalogo(self, db: Session, versao: int) -> CatalogoAtividades:
+        """
+        Catálogo na versão dada (carrega da base de dados se estiver desatualizado)
+
+        A versão é lida pelo chamador (versao_catalogo) antes de usar o catálogo:
+        uma escrita durante a carga deixa-o numa versão antiga e força nova carga.
+        """
+        catalogo = self._catalogo
+        if self._desatualizado(catalogo, versao):
+            with self._lock:
+                catalogo = self._catalogo
+                if self._desatualizado(catalogo, versao):
+                    catalogo = CatalogoAtividades(crud_atividade.get_colunas_catalogo(db), versao)
+                    self._catalogo = catalogo
+        return catalogo
+
+    def top_k_por_tema(
+        self,
+        db: Session,
+        versao: int,
+        evento: EventoCreate,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        k: int = 2
+    ) -> Dict[str, List[Tuple[int, float]]]:
+        return self.catalogo(db, versao).top_k_por_tema(evento, preco_min, preco_max, k)
+
+
+motor_atividades = MotorAtividades(ttl=settings.CATALOGO_TTL)
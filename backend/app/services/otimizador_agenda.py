@@ -0,0 +1,210 @@
+"""
+Otimização da agenda de cada proposta de evento dentro do orçamento
+
+Para um tema, escolhe a atividade da manhã, a da tarde, o almoço e o
+transporte que maximizam a pontuação da agenda sem passar o teto de preço
+por pessoa da expectativa do brief (TETO_POR_PESSOA). Só entram atividades
+com capacidade para o grupo e que cabem no bloco de horário do tema
+(DURACAO_SLOT).
+
+Pontuação da agenda:
+  - pontos de cada atividade (motor de pontuação), mais PONTOS_SLOT por
+    bloco preenchido: uma atividade vale sempre mais que um bloco vazio
+  - PONTOS_ALMOCO_TEMA se o almoço é o do tema (ALMOCO_TEMA)
+Empates: menor preço por pessoa e depois menores ids, para que o resultado
+seja determinístico.
+
+Almoço e transporte pedidos no brief são obrigatórios. Se só eles já passam o
+teto, a agenda é otimizada sem teto e marcada fora do orçamento.
+
+A pesquisa é exaustiva com poda (branch-and-bound) sobre no máximo
+MAX_CANDIDATAS atividades por bloco, ordenadas por pontos: no pior caso
+(MAX_CANDIDATAS + 1)^2 combinações por opção de almoço.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from app.schemas.evento import EventoCreate
+
+# Preço máximo por pessoa da agenda completa (atividades, almoço, transporte)
+TETO_POR_PESSOA = {
+    "€": 70.0,
+    "€€": 130.0,
+    "€€€": None,
+}
+
+# Blocos de atividades de cada duração do brief
+SLOTS = {
+    "manha": ("manha",),
+    "tarde": ("tarde",),
+    "dia_todo": ("manha", "tarde"),
+}
+
+# Duração máxima (minutos) de cada bloco no horário de cada tema (proposta_generator)
+DURACAO_SLOT = {
+    "aventura": {"manha": 240, "tarde": 180},
+    "criativa": {"manha": 210, "tarde": 150},
+    "hibrida": {"manha": 210, "tarde": 150},
+}
+
+MAX_CANDIDATAS = 8
+PONTOS_SLOT = 1.0
+PONTOS_ALMOCO_TEMA = 0.5
+PRECO_TRANSPORTE = 15.0  # Por pessoa
+
+
+@dataclass(frozen=True)
+class OpcaoAlmoco:
+    chave: str
+    nome: str
+    preco_por_pessoa: float
+    descricao: str
+
+
+ALMOCOS = (
+    OpcaoAlmoco("local", "Almoço em Restaurante Local", 25.0, "Menu completo com entrada, prato principal e sobremesa"),
+    OpcaoAlmoco("networking", "Almoço de Networking", 27.0, "Menu executivo com espaço para networking"),
+    OpcaoAlmoco("premium", "Almoço em Restaurante Premium", 30.0, "Menu gourmet com opções vegetarianas"),
+)
+
+# Almoço preferido de cada tema de proposta
+ALMOCO_TEMA = {"aventura": "local", "criativa": "premium", "hibrida": "networking"}
+
+
+@dataclass(frozen=True)
+class Candidata:
+    atividade_id: int
+    preco_por_pessoa: float
+    capacidade_max: int
+    duracao_minutos: Optional[int]
+    pontos: float
+
+
+@dataclass(frozen=True)
+class Agenda:
+    manha: Optional[Candidata]
+    tarde: Optional[Candidata]
+    almoco: Optional[OpcaoAlmoco]
+    transporte: bool
+    preco_por_pessoa: float
+    pontos: float
+    dentro_do_orcamento: bool
+
+
+def _ordem(candidata: Candidata):
+    return (-candidata.pontos, candidata.preco_por_pessoa, candidata.atividade_id)
+
+
+def candidatas_slot(
+    slot: str,
+    tema: str,
+    evento: EventoCreate,
+    candidatas: Sequence[Candidata]
+) -> List[Candidata]:
+    """Candidatas com capacidade e duração para o bloco do tema, as melhores primeiro"""
+    limite = DURACAO_SLOT[tema][slot]
+    validas = [
+        c for c in candidatas
+        if c.capacidade_max >= evento.n_pessoas and (c.duracao_minutos is None or c.duracao_minutos <= limite)
+    ]
+    return sorted(validas, key=_ordem)[:MAX_CANDIDATAS]
+
+
+def _valor(candidata: Optional[Candidata]) -> float:
+    return 0.0 if candidata is None else candidata.pontos + PONTOS_SLOT
+
+
+def _preco(candidata: Optional[Candidata]) -> float:
+    return 0.0 if candidata is None else candidata.preco_por_pessoa
+
+
+def _ids(candidata: Optional[Candidata]) -> int:
+    return 0 if candidata is None else candidata.atividade_id
+
+
+def _melhor_combinacao(
+    manhas: List[Optional[Candidata]],
+    tardes: List[Optional[Candidata]],
+    almocos: List[Tuple[Optional[OpcaoAlmoco], float]],
+    preco_fixo: float,
+    teto: Optional[float]
+) -> Optional[Tuple]:
+    """
+    (chave, manha, tarde, almoco) da melhor combinação dentro do teto, ou None
+
+    manhas/tardes vêm por valor decrescente (None, o bloco vazio, no fim):
+    quando nem o melhor complemento iguala a melhor agenda já encontrada, o
+    resto da lista não pode melhorar e a pesquisa desse ramo pára.
+    """
+    melhor = None
+    melhor_tarde = _valor(tardes[0]) if tardes else 0.0
+    for almoco, bonus_almoco in almocos:
+        base = preco_fixo + (almoco.preco_por_pessoa if almoco else 0.0)
+        for manha in manhas:
+            limite_manha = bonus_almoco + _valor(manha) + melhor_tarde
+            if melhor is not None and limite_manha < melhor[0][0] - 1e-6:
+                break
+            for tarde in tardes:
+                if tarde is not None and manha is not None and tarde.atividade_id == manha.atividade_id:
+                    continue
+                valor = bonus_almoco + _valor(manha) + _valor(tarde)
+                if melhor is not None and valor < melhor[0][0] - 1e-6:
+                    break
+                preco = base + _preco(manha) + _preco(tarde)
+                if teto is not None and preco > teto + 1e-9:
+                    continue
+                # Maior valor, depois menor preço, depois menores ids (arredondados:
+                # a ordem das somas não pode desempatar)
+                chave = (
+                    round(valor, 6), -round(preco, 2), -_ids(manha), -_ids(tarde),
+                    -(almoco.preco_por_pessoa if almoco else 0.0)
+                )
+                if melhor is None or chave > melhor[0]:
+                    melhor = (chave, manha, tarde, almoco)
+    return melhor
+
+
+def obrigatorios_no_teto(evento: EventoCreate) -> bool:
+    """Se o almoço (o mais barato) e o transporte pedidos no brief cabem no teto"""
+    teto = TETO_POR_PESSOA.get(evento.expectativa_preco.strip())
+    if teto is None:
+        return True
+    minimo = (PRECO_TRANSPORTE if evento.transporte else 0.0) + (
+        min(a.preco_por_pessoa for a in ALMOCOS) if evento.almoco else 0.0
+    )
+    return minimo <= teto + 1e-9
+
+
+def otimizar_agenda(evento: EventoCreate, tema: str, candidatas: Sequence[Candidata]) -> Agenda:
+    """Melhor agenda do tema para o brief dentro do teto de preço por pessoa"""
+    slots = SLOTS.get(evento.duracao_atividades, ())
+    manhas = candidatas_slot("manha", tema, evento, candidatas) + [None] if "manha" in slots else [None]
+    tardes = candidatas_slot("tarde", tema, evento, candidatas) + [None] if "tarde" in slots else [None]
+
+    if evento.almoco:
+        preferido = ALMOCO_TEMA.get(tema)
+        almocos = [(a, PONTOS_ALMOCO_TEMA if a.chave == preferido else 0.0) for a in ALMOCOS]
+        almocos.sort(key=lambda opcao: (-opcao[1], opcao[0].preco_por_pessoa))
+    else:
+        almocos = [(None, 0.0)]
+    preco_fixo = PRECO_TRANSPORTE if evento.transporte else 0.0
+
+    # Se almoço e transporte pedidos já passam o teto, otimiza sem ele
+    dentro_do_orcamento = obrigatorios_no_teto(evento)
+    teto = TETO_POR_PESSOA.get(evento.expectativa_preco.strip()) if dentro_do_orcamento else None
+    melhor = _melhor_combinacao(manhas, tardes, almocos, preco_fixo, teto)
+
+    (valor, _, *_), manha, tarde, almoco = melhor
+    preco = (
+        (PRECO_TRANSPORTE if evento.transporte else 0.0)
+        + (almoco.preco_por_pessoa if almoco else 0.0)
+        + _preco(manha) + _preco(tarde)
+    )
+    return Agenda(
+        manha=manha,
+        tarde=tarde,
+        almoco=almoco,
+        transporte=evento.transporte,
+        preco_por_pessoa=preco,
+        pontos=valor,
+        dentro_do_orcamento=dentro_do_orcamento
+    )
@@ -1,349 +1,503 @@
 """
 Serviço para gerar propostas de evento personalizadas
+
+Para cada tema (aventura, criativa, híbrida) o motor de pontuação escolhe as
+melhores candidatas e o otimizador de agenda monta, dentro do teto de preço
+da expectativa do brief, a manhã, a tarde, o almoço e o transporte.
+
+Esse plano só depende do brief normalizado (impressao_digital: escalão de
+pessoas, localização, tipos, duração, almoço/transporte e expectativa de
+preço) e do catálogo, e fica em cache_planos com a versão do catálogo na
+chave. A versão está na base de dados (app.core.catalogo) e é lida em cada
+pedido: uma escrita em atividades, em qualquer worker, torna os planos
+anteriores inalcançáveis em todos. As propostas (preços para o número exato de
+pessoas) são montadas a partir do plano em cada pedido.
+
+guardar_propostas_evento guarda o brief e uma linha por proposta, só com o
+tema e a agenda (crud.proposta_evento); a proposta é endereçada como
+prop_<id> e reconstruída com proposta_guardada. Quem cria o evento recebe
+uma chave de acesso aleatória (só o hash fica guardado), exigida para editar
+e confirmar as propostas de eventos sem empresa. As edições são revalidadas
+contra o catálogo (revalidar_agenda): os preços nunca vêm do cliente.
 """
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.catalogo import versao_catalogo
+from app.core.config import settings
+from app.core.security import create_access_key
+from app.models.atividade import Atividade, EstadoAtividade
+from app.models.evento import PropostaGerada
 from app.schemas.evento import EventoCreate, PropostaEvento, PropostaEventoItem
 from app.crud import atividade as crud_atividade
+from app.crud import proposta_evento as crud_proposta_evento
+from app.services.motor_atividades import TEMAS, afinidade_tema, motor_atividades
+from app.services.otimizador_agenda import (
+    ALMOCOS, Agenda, Candidata, OpcaoAlmoco, PRECO_TRANSPORTE, MAX_CANDIDATAS, obrigatorios_no_teto, otimizar_agenda
+)
 
+# Atividades candidatas por brief (limitar para não sobrecarregar)
+MAX_ATIVIDADES = 10
 
-def gerar_propostas_evento(db: Session, evento: EventoCreate, evento_id: int = None) -> List[PropostaEvento]:
-    """
-    Gera 3 propostas personalizadas baseadas nos critérios do evento
-    """
-    import uuid
-    
-    # Buscar atividades disponíveis baseadas nos critérios
-    atividades = buscar_atividades_relevantes(db, evento)
-    
-    # Gerar 3 propostas diferentes com IDs únicos
-    propostas = []
-    
-    # Proposta 1: Aventura & Outdoor
-    proposta_a = criar_proposta_aventura(evento, atividades)
-    proposta_a.id = f"prop_{uuid.uuid4().hex[:8]}" if evento_id is None else f"prop_{evento_id}_1"
-    propostas.append(proposta_a)
-    
-    # Proposta 2: Criativa & Relax
-    proposta_b = criar_proposta_criativa(evento, atividades)
-    proposta_b.id = f"prop_{uuid.uuid4().hex[:8]}" if evento_id is None else f"prop_{evento_id}_2"
-    propostas.append(proposta_b)
-    
-    # Proposta 3: Híbrida / Corporate-friendly
-    proposta_c = criar_proposta_hibrida(evento, atividades)
-    proposta_c.id = f"prop_{uuid.uuid4().hex[:8]}" if evento_id is None else f"prop_{evento_id}_3"
-    propostas.append(proposta_c)
-    
-    return propostas
+# Expectativa de preço do brief -> preço por pessoa da atividade [mínimo, máximo)
+FAIXAS_PRECO = {
+    "€": (None, 25.0),
+    "€€": (25.0, 50.0),
+    "€€€": (50.0, None),
+}
 
+AVISO_ORCAMENTO = " O almoço e o transporte pedidos excedem a expectativa de preço indicada."
 
-def buscar_atividades_relevantes(db: Session, evento: EventoCreate):
-    """Busca atividades que correspondem aos critérios"""
-    # Por agora, buscar todas as atividades aprovadas
-    # Em produção, filtrar por localização, tipo, capacidade, etc.
-    from app.models.atividade import Atividade, EstadoAtividade
-    atividades = db.query(Atividade).filter(
-        Atividade.estado == EstadoAtividade.APROVADA
-    ).all()
-    
-    # Filtrar por critérios básicos
-    atividades_filtradas = []
-    for atividade in atividades:
-        # Verificar capacidade
-        if atividade.capacidade_max < evento.n_pessoas:
-            continue
-        
-        # Verificar tipos
-        if evento.tipos_atividades:
-            tipo_match = False
-            for tipo in evento.tipos_atividades:
-                if tipo in atividade.categoria.lower() or tipo in atividade.tipo.lower():
-                    tipo_match = True
-                    break
-            if not tipo_match and len(evento.tipos_atividades) > 0:
-                continue
-        
-        atividades_filtradas.append(atividade)
-    
-    return atividades_filtradas[:10]  # Limitar a 10 para não sobrecarregar
-
-
-def criar_proposta_aventura(evento: EventoCreate, atividades: List) -> PropostaEvento:
-    """Cria proposta focada em aventura e outdoor"""
-    # Filtrar atividades de aventura/outdoor
-    atividades_aventura = [
-        a for a in atividades 
-        if 'aventura' in a.categoria.lower() or 'outdoor' in a.tipo.lower() or 'outdoor' in a.clima.lower()
-    ]
-    
-    if not atividades_aventura:
-        atividades_aventura = atividades[:2]  # Fallback
-    
-    agenda = []
-    preco_total = 0
-    
-    # Manhã: Atividade principal
-    if evento.duracao_atividades in ['manha', 'dia_todo']:
-        atividade_manha = atividades_aventura[0] if atividades_aventura else None
-        if atividade_manha:
-            preco = atividade_manha.preco_por_pessoa * evento.n_pessoas
-            agenda.append(PropostaEventoItem(
-                tipo="atividade",
-                nome=atividade_manha.nome,
-                fornecedor=atividade_manha.fornecedor.nome if atividade_manha.fornecedor else "Fornecedor",
-                local=atividade_manha.localizacao,
-                horario="09:00 - 13:00",
-                duracao_minutos=atividade_manha.duracao_minutos or 240,
-                preco=preco,
-                descricao=atividade_manha.descricao,
-                atividade_id=atividade_manha.id
-            ))
-            preco_total += preco
-    
-    # Almoço
-    if evento.almoco:
-        preco_almoco = 25.0 * evento.n_pessoas  # €25 por pessoa
-        agenda.append(PropostaEventoItem(
-            tipo="almoco",
-            nome="Almoço em Restaurante Local",
-            fornecedor="Restaurante Parceiro",
-            local=evento.localizacao,
-            horario="13:00 - 14:30",
-            duracao_minutos=90,
-            preco=preco_almoco,
-            descricao="Menu completo com entrada, prato principal e sobremesa"
-        ))
-        preco_total += preco_almoco
-    
-    # Tarde: Atividade complementar (se dia todo)
-    if evento.duracao_atividades == 'dia_todo' and len(atividades_aventura) > 1:
-        atividade_tarde = atividades_aventura[1]
-        preco = atividade_tarde.preco_por_pessoa * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="atividade",
-            nome=atividade_tarde.nome,
-            fornecedor=atividade_tarde.fornecedor.nome if atividade_tarde.fornecedor else "Fornecedor",
-            local=atividade_tarde.localizacao,
-            horario="15:00 - 18:00",
-            duracao_minutos=atividade_tarde.duracao_minutos or 180,
-            preco=preco,
-            descricao=atividade_tarde.descricao,
-            atividade_id=atividade_tarde.id
-        ))
-        preco_total += preco
-    
-    # Transporte
-    if evento.transporte:
-        preco_transporte = 15.0 * evento.n_pessoas  # €15 por pessoa
-        agenda.append(PropostaEventoItem(
-            tipo="transporte",
-            nome="Transporte de/para Local",
-            fornecedor="Transporte Parceiro",
-            local=evento.localizacao,
-            horario="08:00 - 19:00",
-            preco=preco_transporte,
-            descricao="Transporte em autocarro confortável"
-        ))
-        preco_total += preco_transporte
-    
-    return PropostaEvento(
-        id="",  # Será definido na função gerar_propostas_evento
-        titulo="Aventura & Outdoor",
-        agenda=agenda,
-        preco_total=preco_total,
-        preco_por_pessoa=preco_total / evento.n_pessoas,
-        resumo="Dia repleto de atividades ao ar livre e aventura, perfeito para equipas que gostam de ação e natureza.",
-        notas_importantes="Recomendamos roupa confortável e calçado adequado para atividades outdoor.",
-        inclusoes=[
+# Escalões do número de pessoas: o plano é feito para o limite do escalão
+# (capacidade para todos os grupos do escalão); acima do último, múltiplos de 50
+ESCALOES_PESSOAS = (5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 200)
+
+PREFIXO_ID = "prop_"
+
+# Textos de cada tema de proposta (não são guardados com a proposta)
+TEXTOS_TEMA = {
+    "aventura": {
+        "titulo": "Aventura & Outdoor",
+        "resumo": "Dia repleto de atividades ao ar livre e aventura, perfeito para equipas que gostam de ação e natureza.",
+        "notas_importantes": "Recomendamos roupa confortável e calçado adequado para atividades outdoor.",
+        "inclusoes": [
             "Todas as atividades incluídas",
             "Equipamento necessário",
             "Guias experientes",
             "Seguro de acidentes pessoais"
+        ],
+    },
+    "criativa": {
+        "titulo": "Criativa & Relax",
+        "resumo": "Experiências criativas e relaxantes, ideais para equipas que valorizam aprendizagem e bem-estar.",
+        "notas_importantes": "Atividades adaptáveis a diferentes níveis de experiência.",
+        "inclusoes": [
+            "Todos os materiais incluídos",
+            "Instrutores qualificados",
+            "Coffee break",
+            "Certificado de participação"
+        ],
+    },
+    "hibrida": {
+        "titulo": "Híbrida / Corporate-Friendly",
+        "resumo": "Combinação equilibrada de atividades, perfeita para eventos corporativos formais.",
+        "notas_importantes": "Formato adaptável a diferentes necessidades corporativas.",
+        "inclusoes": [
+            "Atividades estruturadas",
+            "Espaço para networking",
+            "Suporte logístico completo",
+            "Relatório pós-evento"
+        ],
+    },
+}
+
+
+@dataclass(frozen=True)
+class AtividadeResumo:
+    """O que a agenda usa de uma atividade (guardado na cache, fora da sessão)"""
+    id: int
+    nome: str
+    fornecedor: str
+    localizacao: Optional[str]
+    duracao_minutos: Optional[int]
+    preco_por_pessoa: float
+    descricao: Optional[str]
+
+
+@dataclass(frozen=True)
+class PlanoPropostas:
+    """Agenda escolhida para cada tema e as atividades que usa"""
+    agendas: Dict[str, Agenda]
+    atividades: Dict[int, AtividadeResumo]
+
+
+cache_planos = TTLCache(maxsize=settings.PROPOSTAS_CACHE_SIZE, ttl=settings.PROPOSTAS_CACHE_TTL)
+
+
+def gerar_propostas_evento(db: Session, evento: EventoCreate) -> Dict[str, PropostaEvento]:
+    """
+    Gera 3 propostas personalizadas baseadas nos critérios do evento, por tema
+    (ainda sem id: os ids saem da base de dados em guardar_propostas_evento)
+    """
+    # Melhor agenda de cada tema de proposta (em cache por brief normalizado)
+    plano = planear_propostas(db, evento)
+    agendas, atividades = plano.agendas, plano.atividades
+    return {
+        # Proposta 1: Aventura & Outdoor
+        "aventura": criar_proposta_aventura(evento, agendas["aventura"], atividades),
+        # Proposta 2: Criativa & Relax
+        "criativa": criar_proposta_criativa(evento, agendas["criativa"], atividades),
+        # Proposta 3: Híbrida / Corporate-friendly
+        "hibrida": criar_proposta_hibrida(evento, agendas["hibrida"], atividades),
+    }
+
+
+def guardar_propostas_evento(
+    db: Session,
+    evento: EventoCreate,
+    empresa_id: Optional[int] = None
+) -> Tuple[int, str, List[PropostaEvento]]:
+    """
+    Gera as propostas e guarda o evento e uma linha por proposta
+
+    Devolve (evento_id, chave de acesso do evento, propostas).
+    """
+    propostas = gerar_propostas_evento(db, evento)
+    chave, chave_hash = create_access_key()
+    evento_id, ids = crud_proposta_evento.create_evento(
+        db,
+        evento.model_dump(mode="json", exclude={"empresa_id"}, exclude_none=True),
+        empresa_id,
+        chave_hash,
+        [(tema, agenda_json(proposta.agenda)) for tema, proposta in propostas.items()]
+    )
+    for proposta, proposta_id in zip(propostas.values(), ids):
+        proposta.id = id_proposta(proposta_id)
+    return evento_id, chave, list(propostas.values())
+
+
+def id_proposta(proposta_id: int) -> str:
+    return f"{PREFIXO_ID}{proposta_id}"
+
+
+def ler_id_proposta(proposta_id: str) -> Optional[int]:
+    """Id da linha de uma proposta prop_<id> (None se o id não tem esse formato)"""
+    numero = proposta_id[len(PREFIXO_ID):] if proposta_id.startswith(PREFIXO_ID) else ""
+    return int(numero) if numero.isdigit() else None
+
+
+def agenda_json(itens: List[PropostaEventoItem]) -> List[dict]:
+    """Agenda como é guardada (sem os campos vazios)"""
+    return [item.model_dump(exclude_none=True) for item in itens]
+
+
+def brief_guardado(proposta: PropostaGerada) -> EventoCreate:
+    return EventoCreate.model_validate(proposta.evento.brief)
+
+
+def proposta_guardada(
+    proposta: PropostaGerada,
+    evento: EventoCreate,
+    agenda: Optional[List[PropostaEventoItem]] = None
+) -> PropostaEvento:
+    """Proposta guardada (ou com a agenda dada) com os textos do tema e os totais da agenda"""
+    if agenda is None:
+        agenda = [PropostaEventoItem.model_validate(item) for item in proposta.agenda]
+    resultado = montar_proposta(evento, proposta.tema, agenda)
+    resultado.id = id_proposta(proposta.id)
+    resultado.observacoes = proposta.observacoes
+    return resultado
+
+
+def atividades_da_agenda(db: Session, agenda: List[dict]) -> Dict[int, Atividade]:
+    """Atividades da agenda por id (uma só query)"""
+    ids = {item["atividade_id"] for item in agenda if item.get("tipo") == "atividade" and item.get("atividade_id")}
+    return {atividade.id: atividade for atividade in crud_atividade.get_atividades_com_fornecedor(db, ids)}
+
+
+def validar_atividade(atividades: Dict[int, Atividade], atividade_id: Optional[int], n_pessoas: int) -> Atividade:
+    """Atividade da agenda, aprovada e com capacidade para n_pessoas (ValueError se não)"""
+    atividade = atividades.get(atividade_id)
+    if atividade is None or atividade.estado != EstadoAtividade.APROVADA:
+        raise ValueError(f"Atividade {atividade_id} não está disponível")
+    if atividade.capacidade_max < n_pessoas:
+        raise ValueError(f"Atividade {atividade.id} não tem capacidade para {n_pessoas} pessoas")
+    return atividade
+
+
+def revalidar_agenda(
+    evento: EventoCreate,
+    itens: List[PropostaEventoItem],
+    atividades: Dict[int, Atividade]
+) -> List[PropostaEventoItem]:
+    """
+    Agenda editada com os dados e preços do catálogo para o número de pessoas
+
+    Levanta ValueError se a agenda não tem atividades, se uma atividade não
+    está aprovada ou não tem capacidade para o grupo, ou se um almoço ou tipo
+    de item não existe.
+    """
+    if not any(item.tipo == "atividade" for item in itens):
+        raise ValueError("A agenda tem de ter pelo menos uma atividade")
+    almocos = {almoco.nome: almoco for almoco in ALMOCOS}
+    revalidados = []
+    for item in itens:
+        if item.tipo == "atividade":
+            atividade = validar_atividade(atividades, item.atividade_id, evento.n_pessoas)
+            item = item.model_copy(update={
+                "nome": atividade.nome,
+                "fornecedor": atividade.fornecedor.nome if atividade.fornecedor else "Fornecedor",
+                "local": atividade.localizacao,
+                "duracao_minutos": item.duracao_minutos or atividade.duracao_minutos,
+                "preco": atividade.preco_por_pessoa * evento.n_pessoas,
+                "descricao": atividade.descricao,
+            })
+        elif item.tipo == "almoco":
+            almoco = almocos.get(item.nome)
+            if almoco is None:
+                raise ValueError(f"Almoço desconhecido: {item.nome}")
+            item = item.model_copy(update={"preco": almoco.preco_por_pessoa * evento.n_pessoas})
+        elif item.tipo == "transporte":
+            item = item.model_copy(update={"preco": PRECO_TRANSPORTE * evento.n_pessoas})
+        else:
+            raise ValueError(f"Tipo de item desconhecido: {item.tipo}")
+        revalidados.append(item)
+    return revalidados
+
+
+def escalao_pessoas(n_pessoas: int) -> int:
+    """Limite superior do escalão do número de pessoas"""
+    for limite in ESCALOES_PESSOAS:
+        if n_pessoas <= limite:
+            return limite
+    return -(-n_pessoas // 50) * 50
+
+
+def normalizar_brief(evento: EventoCreate) -> EventoCreate:
+    """O brief como o plano o vê: escalão de pessoas e texto normalizado"""
+    return evento.model_copy(update={
+        "n_pessoas": escalao_pessoas(evento.n_pessoas),
+        "localizacao": evento.localizacao.strip().lower(),
+        "tipos_atividades": sorted({tipo.strip().lower() for tipo in evento.tipos_atividades if tipo.strip()}),
+        "duracao_atividades": evento.duracao_atividades.strip().lower(),
+        "expectativa_preco": evento.expectativa_preco.strip(),
+    })
+
+
+def impressao_digital(evento: EventoCreate) -> Tuple:
+    """Campos do brief normalizado de que o plano depende"""
+    normalizado = normalizar_brief(evento)
+    return (
+        normalizado.n_pessoas,
+        normalizado.localizacao,
+        tuple(normalizado.tipos_atividades),
+        normalizado.duracao_atividades,
+        normalizado.almoco,
+        normalizado.transporte,
+        normalizado.expectativa_preco,
+    )
+
+
+def planear_propostas(db: Session, evento: EventoCreate) -> PlanoPropostas:
+    """Plano das 3 propostas para o brief (cache_planos, ou motor + otimizador)"""
+    # Versão lida antes de planear: uma escrita durante o plano deixa-o numa chave antiga
+    versao = versao_catalogo(db)
+    chave = (versao, impressao_digital(evento))
+    plano = cache_planos.get(chave)
+    if plano is not None:
+        return plano
+
+    normalizado = normalizar_brief(evento)
+    candidatas, atividades = buscar_candidatas_por_tema(db, normalizado, versao)
+    agendas = {tema: otimizar_agenda(normalizado, tema, candidatas[tema]) for tema in TEMAS}
+    usadas = {
+        candidata.atividade_id
+        for agenda in agendas.values()
+        for candidata in (agenda.manha, agenda.tarde)
+        if candidata is not None
+    }
+    plano = PlanoPropostas(
+        agendas=agendas,
+        atividades={
+            atividade_id: AtividadeResumo(
+                id=atividade.id,
+                nome=atividade.nome,
+                fornecedor=atividade.fornecedor.nome if atividade.fornecedor else "Fornecedor",
+                localizacao=atividade.localizacao,
+                duracao_minutos=atividade.duracao_minutos,
+                preco_por_pessoa=atividade.preco_por_pessoa,
+                descricao=atividade.descricao
+            )
+            for atividade_id, atividade in atividades.items()
+            if atividade_id in usadas
+        }
+    )
+    cache_planos.set(chave, plano)
+    return plano
+
+
+def buscar_candidatas_por_tema(db: Session, evento: EventoCreate, versao: int):
+    """
+    Candidatas do brief para cada tema de proposta, e as atividades por id
+
+    Com NumPy, o motor pontua o catálogo inteiro em memória e só as
+    MAX_CANDIDATAS melhores de cada tema vêm da base de dados. Sem ele, as
+    candidatas da query pontuada são pontuadas pela ordem da query mais a
+    afinidade com cada tema.
+    """
+    preco_min, preco_max = FAIXAS_PRECO.get(evento.expectativa_preco.strip(), (None, None))
+    if motor_atividades.disponivel:
+        pontos_por_tema = motor_atividades.top_k_por_tema(db, versao, evento, preco_min, preco_max, k=MAX_CANDIDATAS)
+        atividades = {
+            atividade.id: atividade
+            for atividade in crud_atividade.get_atividades_com_fornecedor(
+                db, {atividade_id for melhores in pontos_por_tema.values() for atividade_id, _ in melhores}
+            )
+        }
+    else:
+        relevantes = buscar_atividades_relevantes(db, evento)
+        atividades = {atividade.id: atividade for atividade in relevantes}
+        pontos_por_tema = {
+            tema: [
+                (a.id, (len(relevantes) - posicao) / len(relevantes) + afinidade_tema(a.categoria, a.clima, tema))
+                for posicao, a in enumerate(relevantes)
+            ]
+            for tema in TEMAS
+        }
+
+    candidatas = {
+        tema: [
+            Candidata(
+                atividade_id=atividade_id,
+                preco_por_pessoa=atividades[atividade_id].preco_por_pessoa,
+                capacidade_max=atividades[atividade_id].capacidade_max,
+                duracao_minutos=atividades[atividade_id].duracao_minutos,
+                pontos=pontos
+            )
+            for atividade_id, pontos in pontos_por_tema[tema]
+            if atividade_id in atividades
         ]
+        for tema in TEMAS
+    }
+    return candidatas, atividades
+
+
+def buscar_atividades_relevantes(db: Session, evento: EventoCreate):
+    """
+    Busca as atividades que correspondem aos critérios
+
+    Capacidade e tipos filtram; localização, faixa de preço e rating ordenam.
+    Tudo é feito na base de dados, que devolve só as MAX_ATIVIDADES melhores.
+    """
+    preco_min, preco_max = FAIXAS_PRECO.get(evento.expectativa_preco.strip(), (None, None))
+    return crud_atividade.get_atividades_candidatas(
+        db,
+        evento.n_pessoas,
+        evento.tipos_atividades,
+        localizacao=evento.localizacao,
+        preco_min=preco_min,
+        preco_max=preco_max,
+        limit=MAX_ATIVIDADES
     )
 
 
-def criar_proposta_criativa(evento: EventoCreate, atividades: List) -> PropostaEvento:
-    """Cria proposta focada em criatividade e relaxamento"""
-    # Filtrar atividades criativas/workshops
-    atividades_criativas = [
-        a for a in atividades 
-        if 'artes' in a.categoria.lower() or 'workshop' in a.categoria.lower() or 'indoor' in a.tipo.lower()
-    ]
-    
-    if not atividades_criativas:
-        atividades_criativas = atividades[:2]  # Fallback
-    
-    agenda = []
-    preco_total = 0
-    
-    # Manhã: Workshop criativo
-    if evento.duracao_atividades in ['manha', 'dia_todo']:
-        atividade_manha = atividades_criativas[0] if atividades_criativas else None
-        if atividade_manha:
-            preco = atividade_manha.preco_por_pessoa * evento.n_pessoas
-            agenda.append(PropostaEventoItem(
-                tipo="atividade",
-                nome=atividade_manha.nome,
-                fornecedor=atividade_manha.fornecedor.nome if atividade_manha.fornecedor else "Fornecedor",
-                local=atividade_manha.localizacao,
-                horario="09:30 - 13:00",
-                duracao_minutos=atividade_manha.duracao_minutos or 210,
-                preco=preco,
-                descricao=atividade_manha.descricao,
-                atividade_id=atividade_manha.id
-            ))
-            preco_total += preco
-    
-    # Almoço
-    if evento.almoco:
-        preco_almoco = 30.0 * evento.n_pessoas  # €30 por pessoa (mais premium)
-        agenda.append(PropostaEventoItem(
-            tipo="almoco",
-            nome="Almoço em Restaurante Premium",
-            fornecedor="Restaurante Parceiro",
-            local=evento.localizacao,
-            horario="13:00 - 14:30",
-            duracao_minutos=90,
-            preco=preco_almoco,
-            descricao="Menu gourmet com opções vegetarianas"
-        ))
-        preco_total += preco_almoco
-    
-    # Tarde: Atividade relaxante
-    if evento.duracao_atividades == 'dia_todo' and len(atividades_criativas) > 1:
-        atividade_tarde = atividades_criativas[1]
-        preco = atividade_tarde.preco_por_pessoa * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="atividade",
-            nome=atividade_tarde.nome,
-            fornecedor=atividade_tarde.fornecedor.nome if atividade_tarde.fornecedor else "Fornecedor",
-            local=atividade_tarde.localizacao,
-            horario="15:00 - 17:30",
-            duracao_minutos=atividade_tarde.duracao_minutos or 150,
-            preco=preco,
-            descricao=atividade_tarde.descricao,
-            atividade_id=atividade_tarde.id
-        ))
-        preco_total += preco
-    
-    # Transporte
-    if evento.transporte:
-        preco_transporte = 15.0 * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="transporte",
-            nome="Transporte de/para Local",
-            fornecedor="Transporte Parceiro",
-            local=evento.localizacao,
-            horario="08:30 - 18:30",
-            preco=preco_transporte,
-            descricao="Transporte em autocarro confortável"
-        ))
-        preco_total += preco_transporte
-    
+def item_atividade(
+    evento: EventoCreate,
+    candidata: Optional[Candidata],
+    atividades: Dict[int, AtividadeResumo],
+    horario: str,
+    duracao_omissao: int
+) -> Optional[PropostaEventoItem]:
+    """Item da agenda para a atividade escolhida para um bloco (None se o bloco ficou vazio)"""
+    if candidata is None:
+        return None
+    atividade = atividades[candidata.atividade_id]
+    return PropostaEventoItem(
+        tipo="atividade",
+        nome=atividade.nome,
+        fornecedor=atividade.fornecedor,
+        local=atividade.localizacao,
+        horario=horario,
+        duracao_minutos=atividade.duracao_minutos or duracao_omissao,
+        preco=atividade.preco_por_pessoa * evento.n_pessoas,
+        descricao=atividade.descricao,
+        atividade_id=atividade.id
+    )
+
+
+def item_almoco(evento: EventoCreate, almoco: Optional[OpcaoAlmoco], horario: str) -> Optional[PropostaEventoItem]:
+    if almoco is None:
+        return None
+    return PropostaEventoItem(
+        tipo="almoco",
+        nome=almoco.nome,
+        fornecedor="Restaurante Parceiro",
+        local=evento.localizacao,
+        horario=horario,
+        duracao_minutos=90,
+        preco=almoco.preco_por_pessoa * evento.n_pessoas,
+        descricao=almoco.descricao
+    )
+
+
+def item_transporte(evento: EventoCreate, agenda: Agenda, horario: str) -> Optional[PropostaEventoItem]:
+    if not agenda.transporte:
+        return None
+    return PropostaEventoItem(
+        tipo="transporte",
+        nome="Transporte de/para Local",
+        fornecedor="Transporte Parceiro",
+        local=evento.localizacao,
+        horario=horario,
+        preco=PRECO_TRANSPORTE * evento.n_pessoas,
+        descricao="Transporte em autocarro confortável"
+    )
+
+
+def montar_proposta(
+    evento: EventoCreate,
+    tema: str,
+    itens: List[Optional[PropostaEventoItem]]
+) -> PropostaEvento:
+    """Proposta do tema com os itens preenchidos da agenda, pela ordem dada, e o preço total"""
+    itens = [item for item in itens if item is not None]
+    preco_total = sum(item.preco for item in itens)
+    textos = dict(TEXTOS_TEMA[tema])
+    if not obrigatorios_no_teto(evento):
+        textos["notas_importantes"] = textos["notas_importantes"] + AVISO_ORCAMENTO
     return PropostaEvento(
-        id="",  # Será definido na função gerar_propostas_evento
-        titulo="Criativa & Relax",
-        agenda=agenda,
+        id="",  # Será definido ao guardar a proposta
+        agenda=itens,
         preco_total=preco_total,
         preco_por_pessoa=preco_total / evento.n_pessoas,
-        resumo="Experiências criativas e relaxantes, ideais para equipas que valorizam aprendizagem e bem-estar.",
-        notas_importantes="Atividades adaptáveis a diferentes níveis de experiência.",
-        inclusoes=[
-            "Todos os materiais incluídos",
-            "Instrutores qualificados",
-            "Coffee break",
-            "Certificado de participação"
+        **textos
+    )
+
+
+def criar_proposta_aventura(evento: EventoCreate, agenda: Agenda, atividades: Dict[int, AtividadeResumo]) -> PropostaEvento:
+    """Cria proposta focada em aventura e outdoor"""
+    return montar_proposta(
+        evento,
+        "aventura",
+        [
+            # Manhã: Atividade principal
+            item_atividade(evento, agenda.manha, atividades, "09:00 - 13:00", 240),
+            item_almoco(evento, agenda.almoco, "13:00 - 14:30"),
+            # Tarde: Atividade complementar
+            item_atividade(evento, agenda.tarde, atividades, "15:00 - 18:00", 180),
+            item_transporte(evento, agenda, "08:00 - 19:00"),
         ]
     )
 
 
-def criar_proposta_hibrida(evento: EventoCreate, atividades: List) -> PropostaEvento:
+def criar_proposta_criativa(evento: EventoCreate, agenda: Agenda, atividades: Dict[int, AtividadeResumo]) -> PropostaEvento:
+    """Cria proposta focada em criatividade e relaxamento"""
+    return montar_proposta(
+        evento,
+        "criativa",
+        [
+            # Manhã: Workshop criativo
+            item_atividade(evento, agenda.manha, atividades, "09:30 - 13:00", 210),
+            item_almoco(evento, agenda.almoco, "13:00 - 14:30"),
+            # Tarde: Atividade relaxante
+            item_atividade(evento, agenda.tarde, atividades, "15:00 - 17:30", 150),
+            item_transporte(evento, agenda, "08:30 - 18:30"),
+        ]
+    )
+
+
+def criar_proposta_hibrida(evento: EventoCreate, agenda: Agenda, atividades: Dict[int, AtividadeResumo]) -> PropostaEvento:
     """Cria proposta híbrida/corporate-friendly"""
-    # Misturar atividades variadas
-    agenda = []
-    preco_total = 0
-    
-    # Manhã: Atividade de team building
-    atividades_team = [a for a in atividades if 'team' in a.categoria.lower() or 'team' in a.tipo.lower()]
-    if not atividades_team:
-        atividades_team = atividades[:1]
-    
-    if evento.duracao_atividades in ['manha', 'dia_todo']:
-        atividade_manha = atividades_team[0] if atividades_team else atividades[0] if atividades else None
-        if atividade_manha:
-            preco = atividade_manha.preco_por_pessoa * evento.n_pessoas
-            agenda.append(PropostaEventoItem(
-                tipo="atividade",
-                nome=atividade_manha.nome,
-                fornecedor=atividade_manha.fornecedor.nome if atividade_manha.fornecedor else "Fornecedor",
-                local=atividade_manha.localizacao,
-                horario="09:00 - 12:30",
-                duracao_minutos=atividade_manha.duracao_minutos or 210,
-                preco=preco,
-                descricao=atividade_manha.descricao,
-                atividade_id=atividade_manha.id
-            ))
-            preco_total += preco
-    
-    # Almoço
-    if evento.almoco:
-        preco_almoco = 27.0 * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="almoco",
-            nome="Almoço de Networking",
-            fornecedor="Restaurante Parceiro",
-            local=evento.localizacao,
-            horario="12:30 - 14:00",
-            duracao_minutos=90,
-            preco=preco_almoco,
-            descricao="Menu executivo com espaço para networking"
-        ))
-        preco_total += preco_almoco
-    
-    # Tarde: Atividade complementar
-    if evento.duracao_atividades == 'dia_todo' and len(atividades) > 1:
-        atividade_tarde = atividades[1]
-        preco = atividade_tarde.preco_por_pessoa * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="atividade",
-            nome=atividade_tarde.nome,
-            fornecedor=atividade_tarde.fornecedor.nome if atividade_tarde.fornecedor else "Fornecedor",
-            local=atividade_tarde.localizacao,
-            horario="14:30 - 17:00",
-            duracao_minutos=atividade_tarde.duracao_minutos or 150,
-            preco=preco,
-            descricao=atividade_tarde.descricao,
-            atividade_id=atividade_tarde.id
-        ))
-        preco_total += preco
-    
-    # Transporte
-    if evento.transporte:
-        preco_transporte = 15.0 * evento.n_pessoas
-        agenda.append(PropostaEventoItem(
-            tipo="transporte",
-            nome="Transporte de/para Local",
-            fornecedor="Transporte Parceiro",
-            local=evento.localizacao,
-            horario="08:00 - 18:00",
-            preco=preco_transporte,
-            descricao="Transporte em autocarro confortável"
-        ))
-        preco_total += preco_transporte
-    
-    return PropostaEvento(
-        id="",  # Será definido na função gerar_propostas_evento
-        titulo="Híbrida / Corporate-Friendly",
-        agenda=agenda,
-        preco_total=preco_total,
-        preco_por_pessoa=preco_total / evento.n_pessoas,
-        resumo="Combinação equilibrada de atividades, perfeita para eventos corporativos formais.",
-        notas_importantes="Formato adaptável a diferentes necessidades corporativas.",
-        inclusoes=[
-            "Atividades estruturadas",
-            "Espaço para networking",
-            "Suporte logístico completo",
-            "Relatório pós-evento"
+    return montar_proposta(
+        evento,
+        "hibrida",
+        [
+            # Manhã: Atividade de team building
+            item_atividade(evento, agenda.manha, atividades, "09:00 - 12:30", 210),
+            item_almoco(evento, agenda.almoco, "12:30 - 14:00"),
+            # Tarde: Atividade complementar
+            item_atividade(evento, agenda.tarde, atividades, "14:30 - 17:00", 150),
+            item_transporte(evento, agenda, "08:00 - 18:00"),
         ]
     )
@@ -0,0 +1,133 @@
+"""
+Canal em tempo real por evento (reserva)
+
+As rotas que criam mensagens, documentos e notas publicam o item criado em
+evento_broker.publish(reserva_id, tipo, dados); cada ligação SSE em
+GET /evento/{reserva_id}/stream subscreve a sua reserva e recebe os itens
+numa fila própria.
+
+Backends (settings.REALTIME_BACKEND):
+  - memory: fan-out no próprio processo. Basta com um worker uvicorn.
+  - postgres: publish faz NOTIFY e cada worker faz LISTEN no mesmo canal e
+    entrega aos seus subscritores, para deployments com vários workers.
+    Payloads acima do limite do NOTIFY seguem como evento "recarregar":
+    o cliente volta a pedir os dados.
+
+publish pode ser chamado a partir de rotas síncronas (threadpool): a entrega
+é agendada no event loop onde o broker arrancou.
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+CANAL_POSTGRES = "evento_reserva"
+NOTIFY_MAX_BYTES = 7900  # Limite do Postgres: 8000 bytes por payload
+
+
+class EventoBroker:
+    """Subscrições por reserva_id com entrega em filas asyncio"""
+
+    def __init__(self, backend: str = "memory", fila_max: int = 100):
+        self.backend = backend
+        self.fila_max = fila_max
+        self._subscricoes: Dict[int, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._conexao = None  # asyncpg (backend postgres)
+        self._conexao_lock: Optional[asyncio.Lock] = None
+
+    async def start(self):
+        """Associa o broker ao event loop da aplicação (e faz LISTEN no backend postgres)"""
+        self._loop = asyncio.get_running_loop()
+        if self.backend == "postgres":
+            import asyncpg  # Só necessário com o backend postgres
+
+            url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+            self._conexao = await asyncpg.connect(url.render_as_string(hide_password=False))
+            self._conexao_lock = asyncio.Lock()
+            await self._conexao.add_listener(CANAL_POSTGRES, self._on_notify)
+
+    async def stop(self):
+        if self._conexao is not None:
+            await self._conexao.close()
+            self._conexao = None
+        self._loop = None
+
+    @asynccontextmanager
+    async def subscribe(self, reserva_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Fila com os eventos da reserva enquanto o bloco estiver ativo"""
+        fila: asyncio.Queue = asyncio.Queue(maxsize=self.fila_max)
+        self._subscricoes.setdefault(reserva_id, set()).add(fila)
+        try:
+            yield fila
+        finally:
+            filas = self._subscricoes.get(reserva_id)
+            if filas is not None:
+                filas.discard(fila)
+                if not filas:
+                    del self._subscricoes[reserva_id]
+
+    def subscritores(self, reserva_id: int) -> int:
+        return len(self._subscricoes.get(reserva_id, ()))
+
+    def publish(self, reserva_id: int, tipo: str, dados: Dict[str, Any]):
+        """Publica um item novo da reserva (thread-safe; sem broker arrancado não faz nada)"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        evento = {"reserva_id": reserva_id, "tipo": tipo, "dados": dados}
+        if self.backend == "postgres":
+            coro = self._notify(evento)
+            if self._no_loop(loop):
+                loop.create_task(coro)
+            else:
+                asyncio.run_coroutine_threadsafe(coro, loop)
+        elif self._no_loop(loop):
+            self._entregar(evento)
+        else:
+            loop.call_soon_threadsafe(self._entregar, evento)
+
+    @staticmethod
+    def _no_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def _entregar(self, evento: Dict[str, Any]):
+        """Coloca o evento na fila de cada subscritor da reserva (no event loop)"""
+        for fila in list(self._subscricoes.get(evento["reserva_id"], ())):
+            try:
+                fila.put_nowait(evento)
+            except asyncio.QueueFull:
+                # Cliente lento: descarta o atrasado e pede-lhe que recarregue
+                while not fila.empty():
+                    fila.get_nowait()
+                fila.put_nowait({"reserva_id": evento["reserva_id"], "tipo": "recarregar", "dados": None})
+
+    async def _notify(self, evento: Dict[str, Any]):
+        payload = dumps(evento)
+        if len(payload) > NOTIFY_MAX_BYTES:
+            payload = dumps({"reserva_id": evento["reserva_id"], "tipo": "recarregar", "dados": None})
+        try:
+            async with self._conexao_lock:
+                await self._conexao.execute("SELECT pg_notify($1, $2)", CANAL_POSTGRES, payload.decode("utf-8"))
+        except Exception:
+            logger.exception("Falha no NOTIFY do evento da reserva %s", evento["reserva_id"])
+
+    def _on_notify(self, conexao, pid, canal, payload: str):
+        try:
+            evento = json.loads(payload)
+        except ValueError:
+            logger.warning("Payload inválido no canal %s", canal)
+            return
+        self._entregar(evento)
+
+
+evento_broker = EventoBroker(backend=settings.REALTIME_BACKEND, fila_max=settings.REALTIME_QUEUE_SIZE)
@@ -0,0 +1,84 @@
+"""
+Benchmark do render dos emails (services/email_templates.py).
+
+Mede:
+  - a compilação dos templates (uma vez, no arranque da aplicação)
+  - render de cada email, já compilado
+  - notificação de um RFQ a N fornecedores: um render por destinatário vs
+    render_lote (um render para todos, o contexto é o mesmo)
+
+Uso (a partir de backend/):
+    python scripts/bench_email_templates.py --fornecedores 500 --repeticoes 2000
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.email_templates import ASSUNTOS, EmailTemplates  # noqa: E402
+
+RFQ = {"id": 42, "n_pessoas": 35, "data_preferida": "2026-11-20", "localizacao": "<Lisboa & Sintra>", "orcamento_max": 2500.0}
+PROPOSTA = {"rfq_id": 42, "preco_total": 2100.0, "preco_por_pessoa": 60.0, "data_proposta": "2026-11-20"}
+CONTEXTOS = {
+    "rfq_criado": {"rfq": RFQ},
+    "rfq_recebido": {"rfq": RFQ},
+    "proposta_recebida": {"proposta": PROPOSTA, "fornecedor_nome": "Adventure Tours"},
+    "proposta_aceite": {"proposta": PROPOSTA, "empresa_nome": "TechCorp"},
+    "reserva_confirmada": {
+        "reserva": {"atividade_nome": "Canoagem", "data": "2026-11-20", "n_pessoas": 35, "preco_total": 2100.0},
+        "fornecedor_nome": "Adventure Tours"
+    },
+    "claim_conta": {"nome": "Ana", "claim_url": "http://localhost:5173/claim?token=abc"},
+}
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em microssegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(tempos)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fornecedores", type=int, default=500, help="Destinatários da notificação de RFQ")
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    templates = EmailTemplates()
+    print(f"Compilação ({len(ASSUNTOS)} emails, arranque): {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    print("\nRender por email (mediana):")
+    for nome in ASSUNTOS:
+        contexto = CONTEXTOS[nome]
+        print(f"  {nome:<20} {medir(lambda: templates.render(nome, **contexto), args.repeticoes):8.1f} µs")
+
+    n = args.fornecedores
+    repeticoes = max(args.repeticoes // 100, 5)
+    um_a_um = medir(lambda: [templates.render("rfq_recebido", rfq=RFQ) for _ in range(n)], repeticoes)
+    lote = medir(lambda: templates.render_lote("rfq_recebido", {"rfq": RFQ}, n=n), repeticoes)
+    print(f"\nRFQ para {n} fornecedores (mediana):")
+    print(f"  render por destinatário {um_a_um / 1000:8.2f} ms")
+    print(f"  render_lote             {lote / 1000:8.2f} ms  ({um_a_um / lote:.0f}x)")
+
+    emails = templates.render_lote("rfq_recebido", {"rfq": RFQ}, n=n)
+    if len(emails) != n or emails[0] != templates.render("rfq_recebido", rfq=RFQ):
+        print("FALHOU: render_lote difere do render individual")
+        return 1
+    if "<Lisboa & Sintra>" in emails[0].html or "<Lisboa & Sintra>" not in emails[0].texto:
+        print("FALHOU: o HTML deve escapar os valores e o texto não")
+        return 1
+    print("\nOK: render_lote igual ao render individual; HTML escapado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
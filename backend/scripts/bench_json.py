@@ -0,0 +1,181 @@
+"""
+Benchmark da serialização das respostas JSON.
+
+Para os maiores payloads da API compara o caminho por omissão do FastAPI
+(jsonable_encoder ou response_model + JSONResponse com o json da biblioteca
+padrão) com FastJSONResponse (orjson, ou fallback json se não instalado):
+  - dossier do evento (GET /evento/{id}): dict construído à mão, sem
+    response_model; a rota devolve FastJSONResponse diretamente
+  - lista de RFQs (GET /rfq/) e catálogo de atividades (GET /atividades/):
+    response_model; só muda o render
+
+Os payloads são sintéticos, com a forma exata das respostas das rotas.
+Verifica também que o JSON produzido é equivalente.
+
+Uso (a partir de backend/):
+    python scripts/bench_json.py --mensagens 2000 --rfqs 1000 --atividades 1000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from app.core import responses  # noqa: E402
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.schemas.rfq import RFQResponse  # noqa: E402
+from app.schemas.atividade import AtividadeResponse  # noqa: E402
+
+AGORA = datetime(2026, 10, 1, 12, 30, 15, 123456)
+
+
+def dossier(n_mensagens: int, n_documentos: int, n_notas: int) -> dict:
+    """Mesma forma que routers/evento.py:get_evento_completo"""
+    return {
+        "reserva": {
+            "id": 1, "data": AGORA.isoformat(), "n_pessoas": 40, "preco_total": 1200.0,
+            "estado": "confirmada", "data_criacao": AGORA.isoformat()
+        },
+        "atividade": {"id": 1, "nome": "Canoagem no Tejo", "tipo": "canoagem", "localizacao": "Lisboa", "preco_por_pessoa": 25.0},
+        "empresa": {"id": 1, "nome": "TechCorp", "localizacao": "Lisboa", "contacto": "empresa@example.com"},
+        "fornecedor": {"id": 1, "nome": "Adventure Tours", "localizacao": "Lisboa", "contacto": "+351 123 456 789"},
+        "mensagens": [
+            {
+                "id": i, "remetente_id": 1 + i % 2, "destinatario_id": 2 - i % 2,
+                "conteudo": f"Mensagem {i} sobre o evento, horários e logística — ção",
+                "lida": i % 3 == 0, "data_criacao": (AGORA + timedelta(minutes=i)).isoformat(),
+                "remetente_nome": "TechCorp" if i % 2 else "Adventure Tours"
+            }
+            for i in range(n_mensagens)
+        ],
+        "documentos": [
+            {
+                "id": i, "nome": f"documento_{i}.pdf", "url": f"https://files.example.com/{i}.pdf",
+                "tipo": "pdf", "descricao": "Contrato", "uploaded_by_id": 1,
+                "data_upload": (AGORA + timedelta(hours=i)).isoformat(), "uploaded_by_nome": "TechCorp"
+            }
+            for i in range(n_documentos)
+        ],
+        "notas": [
+            {
+                "id": i, "titulo": f"Nota {i}", "conteudo": "Confirmar transporte e almoço",
+                "criado_por_id": 2, "data_criacao": AGORA.isoformat(),
+                "data_atualizacao": AGORA.isoformat(), "criado_por_nome": "Adventure Tours"
+            }
+            for i in range(n_notas)
+        ]
+    }
+
+
+def lista_rfqs(n: int) -> list:
+    """Mesma forma que routers/rfq.py:list_my_rfqs"""
+    return [
+        {
+            "id": i, "empresa_id": 1, "n_pessoas": 10 + i % 50,
+            "data_preferida": date(2026, 12, 1) + timedelta(days=i % 30), "data_alternativa": None,
+            "localizacao": "Lisboa", "raio_km": 50, "orcamento_max": 1000.0 + i,
+            "objetivo": "team building", "preferencias": None, "categoria_preferida": "aventura",
+            "clima_preferido": "outdoor", "duracao_max_minutos": 240, "estado": "aberto",
+            "data_criacao": AGORA.isoformat(), "num_propostas": i % 7
+        }
+        for i in range(n)
+    ]
+
+
+def catalogo(n: int) -> list:
+    """Instâncias com atributos (como os modelos ORM) para response_model=List[AtividadeResponse]"""
+    return [
+        SimpleNamespace(
+            id=i, nome=f"Atividade {i}", tipo="canoagem", categoria="aventura", preco_por_pessoa=25.0,
+            capacidade_max=30, localizacao="Lisboa", descricao="Passeio de canoagem pelo rio Tejo com guia",
+            imagens='["https://images.unsplash.com/photo-1544551763-46a013bb70d5?w=800"]', fornecedor_id=1,
+            clima="outdoor", duracao_minutos=120, estado="aprovada", aprovada=True, rating_medio=4.5,
+            total_avaliacoes=12
+        )
+        for i in range(n)
+    ]
+
+
+def medir(fn, repeticoes: int) -> float:
+    """Mediana em ms"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def com_response_model(tipo, conteudo):
+    """Validação + serialização do response_model (igual nos dois caminhos)"""
+    field = create_response_field(name="Response_bench", type_=tipo, mode="serialization")
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(serialize_response(field=field, response_content=conteudo))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensagens", type=int, default=2000)
+    parser.add_argument("--documentos", type=int, default=200)
+    parser.add_argument("--notas", type=int, default=200)
+    parser.add_argument("--rfqs", type=int, default=1000)
+    parser.add_argument("--atividades", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    motor = "orjson" if responses.orjson is not None else "json (fallback)"
+    print(f"FastJSONResponse com {motor}, mediana de {args.repeticoes} repetições")
+
+    # (rota, trabalho comum aos dois caminhos, antes, depois)
+    casos = []
+
+    payload = dossier(args.mensagens, args.documentos, args.notas)
+    casos.append((
+        f"GET /evento/{{id}} ({args.mensagens} msgs)",
+        None,
+        lambda: JSONResponse(jsonable_encoder(payload)).body,
+        lambda: FastJSONResponse(payload).body
+    ))
+
+    for nome, tipo, conteudo in (
+        (f"GET /rfq/ ({args.rfqs} RFQs)", List[RFQResponse], lista_rfqs(args.rfqs)),
+        (f"GET /atividades/ ({args.atividades})", List[AtividadeResponse], catalogo(args.atividades)),
+    ):
+        serializar = com_response_model(tipo, conteudo)
+        serializado = serializar()
+        casos.append((
+            nome,
+            serializar,
+            lambda serializado=serializado: JSONResponse(serializado).body,
+            lambda serializado=serializado: FastJSONResponse(serializado).body
+        ))
+
+    print(f"{'rota':34s} {'response_model':>14s} {'antes':>9s} {'depois':>9s} {'poupado':>9s}")
+    for nome, comum, antes, depois in casos:
+        if json.loads(antes()) != json.loads(depois()):
+            print(f"FALHOU: JSON diferente em {nome}")
+            return 1
+        t_comum = medir(comum, args.repeticoes) if comum else 0.0
+        t_antes = medir(antes, args.repeticoes) + t_comum
+        t_depois = medir(depois, args.repeticoes) + t_comum
+        print(
+            f"{nome:34s} {t_comum:11.2f} ms {t_antes:6.2f} ms {t_depois:6.2f} ms {t_antes - t_depois:6.2f} ms "
+            f"({t_antes / t_depois:5.1f}x, {len(depois()) / 1024:.0f} KiB)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Benchmark do trabalho de password do login (bcrypt.checkpw).
+
+Compara:
+  - antes: checkpw inline no threadpool (como um endpoint síncrono)
+  - depois: verify_password_async no pool de processos dedicado
+
+Para cada modo mostra logins/s, logins/s por core e o atraso máximo do event
+loop enquanto os logins correm (quanto o resto dos pedidos ficaria à espera).
+
+Uso (a partir de backend/):
+    python scripts/bench_login.py --logins 64 --rounds 12 --workers 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def medir_atraso_loop(parar: asyncio.Event) -> float:
+    """Maior atraso observado num tick de 10 ms do event loop"""
+    pior = 0.0
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.01)
+        pior = max(pior, time.perf_counter() - inicio - 0.01)
+    return pior
+
+
+async def correr(logins: int, login) -> tuple:
+    parar = asyncio.Event()
+    atraso = asyncio.create_task(medir_atraso_loop(parar))
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(login() for _ in range(logins)))
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    assert all(resultados)
+    return duracao, await atraso
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12, help="Custo do bcrypt")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos do pool")
+    parser.add_argument("--threads", type=int, default=40, help="Threadpool do modo antes (omissão do anyio)")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.logins)
+
+    from app.core import security
+
+    hashed = security.get_password_hash("password123")
+    cores = os.cpu_count() or 1
+
+    threadpool = ThreadPoolExecutor(max_workers=args.threads)
+
+    async def login_antes():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(threadpool, security._check_password, "password123", hashed)
+
+    async def login_depois():
+        return await security.verify_password_async("password123", hashed)
+
+    # Aquecer o pool de processos (spawn) antes de medir
+    asyncio.run(correr(args.workers, login_depois))
+
+    print(f"logins={args.logins} rounds={args.rounds} workers={args.workers} cores={cores}")
+    for nome, login, nucleos in (
+        ("antes (threadpool)", login_antes, cores),
+        ("depois (processos)", login_depois, min(args.workers, cores)),
+    ):
+        duracao, atraso = asyncio.run(correr(args.logins, login))
+        por_segundo = args.logins / duracao
+        print(
+            f"{nome:20s} {por_segundo:8.1f} logins/s  {por_segundo / nucleos:8.1f} logins/s/core  "
+            f"atraso máx. do loop {atraso * 1000:7.1f} ms"
+        )
+
+    threadpool.shutdown()
+    security.shutdown_password_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
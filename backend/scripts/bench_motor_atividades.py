@@ -0,0 +1,155 @@
+"""
+Microbenchmark do motor de pontuação das propostas (services/motor_atividades.py).
+
+Para cada tamanho do catálogo gera atividades sintéticas (sem base de dados),
+constrói o CatalogoAtividades e mede, por brief, top_k_por_tema (NumPy)
+contra a mesma pontuação num ciclo Python por atividade. Verifica que os
+dois devolvem as mesmas atividades por tema.
+
+Uso (a partir de backend/):
+    python scripts/bench_motor_atividades.py --atividades 10000 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.crud.atividade import TIPOS_EVENTO, PONTOS_LOCALIZACAO, PONTOS_FAIXA_PRECO  # noqa: E402
+from app.schemas.evento import EventoCreate  # noqa: E402
+from app.services.motor_atividades import (  # noqa: E402
+    CatalogoAtividades, DURACAO_BLOCO, PONTOS_DURACAO, TEMAS, afinidade_tema, np
+)
+from app.services.proposta_generator import FAIXAS_PRECO  # noqa: E402
+
+CATEGORIAS = ["aventura", "relax", "team_building", "esporte", "cultural", "gastronomia"]
+CLIMAS = ["outdoor", "indoor", "ambos", None]
+TIPOS = ["canoagem", "paintball", "escalada", "olaria", "cozinha", "yoga", "barco"]
+LOCAIS = ["Lisboa", "Porto", "Sintra", "Cascais", "Faro", "Braga", "Coimbra", None]
+
+BRIEFS = [
+    {"n_pessoas": 20, "localizacao": "Sintra", "tipos_atividades": ["aventuras", "outdoor"], "expectativa_preco": "€€", "duracao_atividades": "dia_todo"},
+    {"n_pessoas": 8, "localizacao": "Lisboa", "tipos_atividades": ["artes", "workshops"], "expectativa_preco": "€", "duracao_atividades": "manha"},
+    {"n_pessoas": 35, "localizacao": "Porto", "tipos_atividades": ["indoor", "team"], "expectativa_preco": "€€€", "duracao_atividades": "tarde"},
+]
+
+
+def gerar_catalogo(n: int, semente: int = 42):
+    aleatorio = random.Random(semente)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            preco_por_pessoa=round(aleatorio.uniform(8, 90), 2),
+            capacidade_max=aleatorio.randint(4, 80),
+            duracao_minutos=aleatorio.choice([None, 60, 90, 120, 180, 240, 300]),
+            rating_medio=round(aleatorio.uniform(0, 5), 1),
+            categoria=aleatorio.choice(CATEGORIAS),
+            tipo=aleatorio.choice(TIPOS),
+            clima=aleatorio.choice(CLIMAS),
+            localizacao=aleatorio.choice(LOCAIS),
+        )
+        for i in range(n)
+    ]
+
+
+def corresponde(tipo: str, a) -> bool:
+    if tipo in TIPOS_EVENTO:
+        coluna, valores = TIPOS_EVENTO[tipo]
+        return getattr(a, coluna) in valores
+    return tipo in (a.categoria or "").lower() or tipo in (a.tipo or "").lower()
+
+
+def top_k_python(linhas, evento: EventoCreate, preco_min, preco_max, k: int = 2):
+    """A mesma pontuação, atividade a atividade"""
+    tipos = [t.strip().lower() for t in evento.tipos_atividades if t.strip()]
+    local = evento.localizacao.strip().lower()
+    bloco = DURACAO_BLOCO.get(evento.duracao_atividades)
+    pontuadas = []
+    for a in linhas:
+        if a.capacidade_max < evento.n_pessoas:
+            continue
+        correspondidos = sum(corresponde(tipo, a) for tipo in tipos)
+        if tipos and not correspondidos:
+            continue
+        pontos = (a.rating_medio or 0.0) / 5 + correspondidos
+        if local and (a.localizacao or "").strip().lower() == local:
+            pontos += PONTOS_LOCALIZACAO
+        if (preco_min is not None or preco_max is not None) and \
+                (preco_min is None or a.preco_por_pessoa >= preco_min) and \
+                (preco_max is None or a.preco_por_pessoa < preco_max):
+            pontos += PONTOS_FAIXA_PRECO
+        if bloco is not None and a.duracao_minutos is not None and a.duracao_minutos <= bloco:
+            pontos += PONTOS_DURACAO
+        pontuadas.append((pontos, a))
+    return {
+        tema: [
+            a.id for _, _, a in sorted(
+                ((pontos + afinidade_tema(a.categoria, a.clima, tema), a.preco_por_pessoa, a) for pontos, a in pontuadas),
+                key=lambda t: (-t[0], t[1], t[2].id)
+            )[:k]
+        ]
+        for tema in TEMAS
+    }
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--atividades", type=int, nargs="+", default=[10000, 100000], help="Tamanhos do catálogo")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy não está instalado: o gerador usa a query pontuada (scripts/bench_propostas.py)")
+        return 1
+
+    eventos = [EventoCreate(data_inicio="2026-12-01", **brief) for brief in BRIEFS]
+    falhas = []
+    print(f"{'atividades':>10}  {'construir':>10}  {'NumPy/brief':>12}  {'Python/brief':>13}")
+    for n in args.atividades:
+        linhas = gerar_catalogo(n)
+        inicio = time.perf_counter()
+        catalogo = CatalogoAtividades(linhas)
+        construir = (time.perf_counter() - inicio) * 1000
+
+        vetorizado, ciclo = [], []
+        for evento in eventos:
+            faixa = FAIXAS_PRECO[evento.expectativa_preco]
+            esperado = top_k_python(linhas, evento, *faixa)
+            obtido = {
+                tema: [atividade_id for atividade_id, _ in melhores]
+                for tema, melhores in catalogo.top_k_por_tema(evento, *faixa).items()
+            }
+            if obtido != esperado:
+                falhas.append(f"{n} atividades, {evento.tipos_atividades}: {obtido} != {esperado}")
+            vetorizado.append(medir(lambda: catalogo.top_k_por_tema(evento, *faixa), args.repeticoes))
+            ciclo.append(medir(lambda: top_k_python(linhas, evento, *faixa), max(1, args.repeticoes // 10)))
+        print(
+            f"{n:>10}  {construir:7.1f} ms  {statistics.median(vetorizado):9.2f} ms  "
+            f"{statistics.median(ciclo):10.2f} ms"
+        )
+
+    for falha in falhas:
+        print(f"FALHOU: {falha}")
+    if falhas:
+        return 1
+    print("OK: NumPy e ciclo Python escolhem as mesmas atividades por tema")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
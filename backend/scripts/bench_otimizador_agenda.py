@@ -0,0 +1,152 @@
+"""
+Benchmark do otimizador de agenda das propostas (services/otimizador_agenda.py).
+
+Para cada tamanho do catálogo (sintético, como em bench_motor_atividades.py)
+mede por brief:
+  - motor: top_k_por_tema com MAX_CANDIDATAS por tema (NumPy)
+  - otimizador: otimizar_agenda dos três temas (branch-and-bound)
+  - força bruta: todas as combinações manhã x tarde x almoço dos mesmos
+    candidatos, para comparar com o otimizador
+
+Verifica que o otimizador encontra a mesma agenda que a força bruta, que o
+resultado não depende da ordem dos candidatos e que nenhuma agenda dentro do
+orçamento passa o teto de preço por pessoa.
+
+Uso (a partir de backend/):
+    python scripts/bench_otimizador_agenda.py --atividades 1000 10000 100000
+"""
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_motor_atividades import BRIEFS, gerar_catalogo  # noqa: E402
+from app.schemas.evento import EventoCreate  # noqa: E402
+from app.services.motor_atividades import CatalogoAtividades, np  # noqa: E402
+from app.services.otimizador_agenda import (  # noqa: E402
+    ALMOCO_TEMA, ALMOCOS, MAX_CANDIDATAS, PONTOS_ALMOCO_TEMA, PONTOS_SLOT, PRECO_TRANSPORTE, SLOTS,
+    TETO_POR_PESSOA, Candidata, candidatas_slot, otimizar_agenda
+)
+from app.services.proposta_generator import FAIXAS_PRECO  # noqa: E402
+
+# Variações dos briefs de bench_motor_atividades: almoço, transporte e orçamento
+VARIANTES = [
+    {"almoco": True, "transporte": True},
+    {"almoco": True, "transporte": False, "expectativa_preco": "€"},
+    {"almoco": False, "transporte": True, "expectativa_preco": "€€"},
+]
+
+
+def forca_bruta(evento: EventoCreate, tema: str, candidatas):
+    """Melhor (valor, preço, manhã, tarde, almoço) por enumeração completa"""
+    slots = SLOTS.get(evento.duracao_atividades, ())
+    manhas = candidatas_slot("manha", tema, evento, candidatas) + [None] if "manha" in slots else [None]
+    tardes = candidatas_slot("tarde", tema, evento, candidatas) + [None] if "tarde" in slots else [None]
+    almocos = ALMOCOS if evento.almoco else (None,)
+    teto = TETO_POR_PESSOA.get(evento.expectativa_preco)
+    melhor = None
+    for manha, tarde, almoco in itertools.product(manhas, tardes, almocos):
+        if manha is not None and tarde is not None and manha.atividade_id == tarde.atividade_id:
+            continue
+        preco = (
+            (PRECO_TRANSPORTE if evento.transporte else 0.0)
+            + (almoco.preco_por_pessoa if almoco else 0.0)
+            + sum(c.preco_por_pessoa for c in (manha, tarde) if c is not None)
+        )
+        if teto is not None and preco > teto + 1e-9:
+            continue
+        valor = sum(c.pontos + PONTOS_SLOT for c in (manha, tarde) if c is not None)
+        if almoco is not None and almoco.chave == ALMOCO_TEMA[tema]:
+            valor += PONTOS_ALMOCO_TEMA
+        chave = (
+            round(valor, 6), -round(preco, 2), -(manha.atividade_id if manha else 0), -(tarde.atividade_id if tarde else 0),
+            -(almoco.preco_por_pessoa if almoco else 0.0)
+        )
+        if melhor is None or chave > melhor[0]:
+            melhor = (chave, manha, tarde, almoco)
+    return melhor
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--atividades", type=int, nargs="+", default=[1000, 10000, 100000], help="Tamanhos do catálogo")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy não está instalado: o motor de pontuação não está disponível")
+        return 1
+
+    eventos = [
+        EventoCreate(data_inicio="2026-12-01", **{**brief, **variante})
+        for brief in BRIEFS for variante in VARIANTES
+    ]
+    falhas = []
+    aleatorio = random.Random(7)
+    print(f"{'atividades':>10}  {'motor':>9}  {'otimizador':>11}  {'força bruta':>12}  (por brief, 3 temas)")
+    for n in args.atividades:
+        linhas = gerar_catalogo(n)
+        catalogo = CatalogoAtividades(linhas)
+        dados = {atividade.id: atividade for atividade in linhas}
+        tempos_motor, tempos_otimizador, tempos_bruta = [], [], []
+        for evento in eventos:
+            faixa = FAIXAS_PRECO[evento.expectativa_preco]
+            pontos_por_tema = catalogo.top_k_por_tema(evento, *faixa, k=MAX_CANDIDATAS)
+            candidatas = {
+                tema: [
+                    Candidata(i, dados[i].preco_por_pessoa, dados[i].capacidade_max, dados[i].duracao_minutos, pontos)
+                    for i, pontos in melhores
+                ]
+                for tema, melhores in pontos_por_tema.items()
+            }
+            tempos_motor.append(medir(lambda: catalogo.top_k_por_tema(evento, *faixa, k=MAX_CANDIDATAS), args.repeticoes))
+            tempos_otimizador.append(medir(
+                lambda: [otimizar_agenda(evento, tema, c) for tema, c in candidatas.items()], args.repeticoes
+            ))
+            tempos_bruta.append(medir(
+                lambda: [forca_bruta(evento, tema, c) for tema, c in candidatas.items()], args.repeticoes
+            ))
+
+            teto = TETO_POR_PESSOA.get(evento.expectativa_preco)
+            for tema, c in candidatas.items():
+                agenda = otimizar_agenda(evento, tema, c)
+                baralhadas = list(c)
+                aleatorio.shuffle(baralhadas)
+                if otimizar_agenda(evento, tema, baralhadas) != agenda:
+                    falhas.append(f"{n}, {tema}: resultado depende da ordem dos candidatos")
+                bruta = forca_bruta(evento, tema, c)
+                if bruta is not None and (bruta[1], bruta[2], bruta[3]) != (agenda.manha, agenda.tarde, agenda.almoco):
+                    falhas.append(f"{n}, {tema}, {evento.expectativa_preco}: otimizador difere da força bruta")
+                if agenda.dentro_do_orcamento and teto is not None and agenda.preco_por_pessoa > teto + 1e-9:
+                    falhas.append(f"{n}, {tema}: {agenda.preco_por_pessoa} acima do teto {teto}")
+        print(
+            f"{n:>10}  {statistics.median(tempos_motor):6.2f} ms  {statistics.median(tempos_otimizador):8.3f} ms  "
+            f"{statistics.median(tempos_bruta):9.3f} ms"
+        )
+
+    for falha in falhas:
+        print(f"FALHOU: {falha}")
+    if falhas:
+        return 1
+    print("OK: agendas ótimas (iguais à força bruta), determinísticas e dentro do teto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
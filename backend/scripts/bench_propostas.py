@@ -0,0 +1,122 @@
+"""
+Benchmark da escolha de atividades para as propostas de evento
+(services/proposta_generator.py:buscar_atividades_relevantes).
+
+Para cada tamanho do catálogo cria uma base de dados SQLite temporária com N
+atividades aprovadas e compara:
+  - query pontuada: filtros, ordenação e LIMIT na base de dados
+    (crud.atividade.get_atividades_candidatas)
+  - carregar tudo: todas as atividades aprovadas para Python, filtro por
+    capacidade e tipo num ciclo e as 10 primeiras (o caminho anterior)
+
+Uso (a partir de backend/):
+    python scripts/bench_propostas.py --atividades 50 5000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+BRIEF = {
+    "data_inicio": "2026-12-01", "duracao_atividades": "dia_todo", "n_pessoas": 20,
+    "localizacao": "Sintra", "tipos_atividades": ["aventuras", "outdoor"], "expectativa_preco": "€€"
+}
+
+
+def carregar_tudo(db, evento):
+    """O caminho anterior: filtro por capacidade e tipo em Python"""
+    from app.models.atividade import Atividade, EstadoAtividade
+    atividades = db.query(Atividade).filter(Atividade.estado == EstadoAtividade.APROVADA).all()
+    filtradas = []
+    for atividade in atividades:
+        if atividade.capacidade_max < evento.n_pessoas:
+            continue
+        if evento.tipos_atividades and not any(
+            tipo in atividade.categoria.lower() or tipo in atividade.tipo.lower()
+            for tipo in evento.tipos_atividades
+        ):
+            continue
+        filtradas.append(atividade)
+    return filtradas[:10]
+
+
+def preparar(caminho: str, n: int):
+    from sqlalchemy import create_engine, insert
+    from app.database import Base
+    from app.models import Atividade, Fornecedor, User
+    from app.models.atividade import EstadoAtividade
+
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conexao:
+        conexao.execute(insert(User), [{"id": 1, "nome": "F", "email": "f@example.com", "password": "x", "tipo": "FORNECEDOR"}])
+        conexao.execute(insert(Fornecedor), [{"id": 1, "user_id": 1, "nome": "Adventure Tours"}])
+        lote = 20000
+        for inicio in range(0, n, lote):
+            conexao.execute(insert(Atividade), [
+                {
+                    "nome": f"atividade {i}", "tipo": ("canoagem", "paintball", "olaria")[i % 3],
+                    "categoria": ("aventura", "relax", "cultural", "team_building")[i % 4],
+                    "clima": ("outdoor", "indoor", "ambos")[i % 3], "preco_por_pessoa": 10.0 + i % 70,
+                    "capacidade_max": 5 + i % 50, "localizacao": ("Lisboa", "Porto", "Sintra", "Faro")[i % 4],
+                    "fornecedor_id": 1, "estado": EstadoAtividade.APROVADA, "aprovada": True,
+                    "rating_medio": (i % 50) / 10
+                }
+                for i in range(inicio, min(n, inicio + lote))
+            ])
+    return engine
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--atividades", type=int, nargs="+", default=[50, 5000, 100000], help="Tamanhos do catálogo")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    from sqlalchemy.orm import sessionmaker
+    from app.schemas.evento import EventoCreate
+    from app.services.proposta_generator import buscar_atividades_relevantes
+
+    evento = EventoCreate(**BRIEF)
+    print(f"{'atividades':>10}  {'query pontuada':>15}  {'carregar tudo':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.atividades:
+            engine = preparar(os.path.join(tmp, f"atividades_{n}.db"), n)
+            Sessao = sessionmaker(bind=engine)
+
+            def pontuada():
+                with Sessao() as db:
+                    return [(a.id, a.fornecedor.nome) for a in buscar_atividades_relevantes(db, evento)]
+
+            def tudo():
+                with Sessao() as db:
+                    return [(a.id, a.fornecedor.nome) for a in carregar_tudo(db, evento)]
+
+            candidatas = pontuada()
+            if not candidatas:
+                print("FALHOU: a query pontuada não devolveu atividades")
+                return 1
+            repeticoes_tudo = args.repeticoes if n <= 10000 else 1
+            print(f"{n:>10}  {medir(pontuada, args.repeticoes):12.2f} ms  {medir(tudo, repeticoes_tudo):11.2f} ms")
+            engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Benchmark do arranque de um worker.
+
+Mede, em processos novos (como um worker uvicorn ou um --reload), o tempo de
+importar app.main e correr os handlers de startup, e compara a mediana com um
+orçamento. Termina com código 1 se o orçamento for excedido.
+
+Uso (a partir de backend/):
+    python scripts/bench_startup.py --runs 5 --budget-ms 2000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+ARRANQUE = """
+import asyncio, time
+inicio = time.perf_counter()
+import app.main
+importado = time.perf_counter()
+asyncio.run(app.main.app.router.startup())
+fim = time.perf_counter()
+print((importado - inicio) * 1000, (fim - importado) * 1000)
+"""
+
+
+def medir() -> tuple:
+    resultado = subprocess.run(
+        [sys.executable, "-c", ARRANQUE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    importacao, startup = resultado.stdout.strip().splitlines()[-1].split()
+    return float(importacao), float(startup)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Orçamento para a mediana (import + startup)")
+    args = parser.parse_args()
+
+    medicoes = [medir() for _ in range(args.runs)]
+    importacao = statistics.median(m[0] for m in medicoes)
+    startup = statistics.median(m[1] for m in medicoes)
+    total = statistics.median(m[0] + m[1] for m in medicoes)
+
+    print(f"runs={args.runs}")
+    print(f"import app.main   mediana {importacao:8.1f} ms")
+    print(f"startup handlers  mediana {startup:8.1f} ms")
+    print(f"total             mediana {total:8.1f} ms (orçamento {args.budget_ms:.0f} ms)")
+
+    if total > args.budget_ms:
+        print("FALHOU: arranque acima do orçamento")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Verifica que os filtros das queries usam colunas indexadas.
+
+Percorre o código de app/crud, app/routers e app/services e, para cada
+.filter()/.where()/.filter_by() que compara colunas de um modelo
+(==, in_, is_, <, <=, >, >=), exige que pelo menos uma dessas colunas seja a
+primeira coluna de um índice, da chave primária ou de uma constraint unique.
+
+Refinamentos encadeados numa query já filtrada (query = query.filter(...))
+não são verificados. Para ignorar uma linha de forma explícita use o
+comentário "# noqa: indice".
+
+Os índices são lidos dos modelos; "alembic check" confirma que as migrações
+estão em sincronia com eles.
+
+Uso (a partir de backend/):
+    python scripts/check_crud_indexes.py
+Termina com código 1 quando encontra filtros sem índice.
+"""
+import ast
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401
+
+PASTAS = ["app/crud", "app/routers", "app/services"]
+METODOS_FILTRO = {"filter", "where", "filter_by"}
+OPERADORES_INDEXAVEIS = (ast.Eq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is)
+METODOS_INDEXAVEIS = {"in_", "is_", "between"}
+PRAGMA = "# noqa: indice"
+
+
+def colunas_indexadas() -> dict:
+    """Modelo -> (tabela, colunas que lideram um índice/PK/unique)"""
+    resultado = {}
+    for mapper in Base.registry.mappers:
+        tabela = mapper.local_table
+        lideres = {col.name for col in tabela.primary_key.columns[:1]}
+        for indice in tabela.indexes:
+            expressoes = list(indice.expressions)
+            primeira = expressoes[0]
+            # Index(col.desc()) guarda um UnaryExpression sobre a coluna
+            primeira = getattr(primeira, "element", primeira)
+            if getattr(primeira, "name", None):
+                lideres.add(primeira.name)
+        for constraint in tabela.constraints:
+            colunas = list(getattr(constraint, "columns", []))
+            if colunas and constraint.__class__.__name__ == "UniqueConstraint":
+                lideres.add(colunas[0].name)
+        for coluna in tabela.columns:
+            if coluna.unique:
+                lideres.add(coluna.name)
+        resultado[mapper.class_.__name__] = (tabela.name, lideres)
+    return resultado
+
+
+def coluna_do_modelo(node, modelos):
+    """Devolve (Modelo, coluna) se o nó for Modelo.coluna"""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in modelos:
+        return node.value.id, node.attr
+    return None
+
+
+def predicados(node, modelos):
+    """Colunas comparadas de forma indexável dentro de um filtro"""
+    encontrados = []
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Compare) and len(sub.ops) == 1 and isinstance(sub.ops[0], OPERADORES_INDEXAVEIS):
+            esquerda = coluna_do_modelo(sub.left, modelos)
+            direita = coluna_do_modelo(sub.comparators[0], modelos)
+            # Modelo.a == Modelo.b é uma condição de join, não um filtro
+            if esquerda and not direita:
+                encontrados.append(esquerda)
+            elif direita and not esquerda:
+                encontrados.append(direita)
+        elif isinstance(sub, ast.Call) and isinstance(sub.func, ast.Attribute) and sub.func.attr in METODOS_INDEXAVEIS:
+            coluna = coluna_do_modelo(sub.func.value, modelos)
+            if coluna:
+                encontrados.append(coluna)
+    return encontrados
+
+
+def modelo_da_query(call):
+    """Para filter_by: o modelo do db.query(Modelo) ou select(Modelo) da cadeia"""
+    node = call.func.value
+    while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        if node.func.attr == "query" and node.args and isinstance(node.args[0], ast.Name):
+            return node.args[0].id
+        node = node.func.value
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "select" and node.args:
+        if isinstance(node.args[0], ast.Name):
+            return node.args[0].id
+    return None
+
+
+def verificar_ficheiro(caminho: Path, modelos: dict) -> list:
+    fonte = caminho.read_text(encoding="utf-8")
+    linhas = fonte.splitlines()
+    problemas = []
+    for node in ast.walk(ast.parse(fonte, filename=str(caminho))):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in METODOS_FILTRO):
+            continue
+        # query = query.filter(...) refina uma query que já foi verificada
+        if isinstance(node.func.value, ast.Name):
+            continue
+        if any(PRAGMA in linhas[n - 1] for n in range(node.lineno, (node.end_lineno or node.lineno) + 1)):
+            continue
+
+        if node.func.attr == "filter_by":
+            modelo = modelo_da_query(node)
+            if modelo not in modelos:
+                continue
+            colunas = [(modelo, kw.arg) for kw in node.keywords if kw.arg]
+        else:
+            colunas = []
+            for arg in node.args:
+                colunas.extend(predicados(arg, modelos))
+
+        por_modelo = {}
+        for modelo, coluna in colunas:
+            por_modelo.setdefault(modelo, []).append(coluna)
+
+        for modelo, cols in por_modelo.items():
+            tabela, lideres = modelos[modelo]
+            if not any(c in lideres for c in cols):
+                relativo = caminho.relative_to(BACKEND_DIR)
+                problemas.append(f"{relativo}:{node.lineno}: filtro em {tabela}({', '.join(sorted(set(cols)))}) sem índice")
+    return problemas
+
+
+def main() -> int:
+    modelos = colunas_indexadas()
+    problemas = []
+    for pasta in PASTAS:
+        for caminho in sorted((BACKEND_DIR / pasta).rglob("*.py")):
+            problemas.extend(verificar_ficheiro(caminho, modelos))
+
+    if problemas:
+        print("Filtros sem índice (adicione um índice numa migração ou '# noqa: indice'):")
+        for problema in problemas:
+            print(f"  {problema}")
+        return 1
+
+    print("OK: todos os filtros usam colunas indexadas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
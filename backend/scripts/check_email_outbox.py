@@ -0,0 +1,221 @@
+"""
+Verifica a fila de envio de emails contra um servidor SMTP local.
+
+Arranca um servidor SMTP mínimo (em memória, com atraso configurável por
+email) e uma base de dados SQLite temporária, e verifica que:
+  - pôr um email na fila (EmailService.send_email) não depende do atraso do
+    servidor SMTP, ao contrário do envio direto
+  - o dispatcher entrega cada email uma só vez, em lotes e com várias threads
+  - erros temporários (451) são repetidos com backoff até passarem
+  - recusas permanentes (550) e emails que esgotam as tentativas ficam
+    FALHADO (dead-letter), e podem voltar à fila com crud.email_outbox.reenviar
+
+Endereços especiais no servidor de teste:
+  recusado-*@...      -> 550 no RCPT
+  temporario-*@...    -> 451 nas 2 primeiras tentativas, depois aceita
+  indisponivel-*@...  -> 451 sempre
+
+Uso (a partir de backend/):
+    python scripts/check_email_outbox.py --emails 200 --atraso 0.02
+"""
+import argparse
+import os
+import socketserver
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+MAX_TENTATIVAS = 4
+
+
+class ServidorSMTP(socketserver.ThreadingTCPServer):
+    """Servidor SMTP de teste: guarda os destinatários aceites"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, atraso: float):
+        super().__init__(("127.0.0.1", 0), PedidoSMTP)
+        self.atraso = atraso
+        self.lock = threading.Lock()
+        self.entregues = Counter()
+        self.tentativas = Counter()
+        self.ligacoes = 0
+
+
+class PedidoSMTP(socketserver.StreamRequestHandler):
+    def responder(self, linha: str):
+        self.wfile.write(linha.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.ligacoes += 1
+        self.responder("220 localhost SMTP de teste")
+        destinatarios = []
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                return
+            comando = linha.decode("utf-8", "replace").strip()
+            verbo = comando[:4].upper()
+            if verbo in ("EHLO", "HELO"):
+                self.responder("250 localhost")
+            elif verbo == "MAIL":
+                destinatarios = []
+                self.responder("250 OK")
+            elif verbo == "RCPT":
+                endereco = comando.split(":", 1)[1].strip().strip("<>")
+                with servidor.lock:
+                    servidor.tentativas[endereco] += 1
+                    tentativa = servidor.tentativas[endereco]
+                if endereco.startswith("recusado-"):
+                    self.responder("550 No such user")
+                elif endereco.startswith("indisponivel-") or (endereco.startswith("temporario-") and tentativa <= 2):
+                    self.responder("451 Try again later")
+                else:
+                    destinatarios.append(endereco)
+                    self.responder("250 OK")
+            elif verbo == "DATA":
+                self.responder("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(servidor.atraso)
+                with servidor.lock:
+                    servidor.entregues.update(destinatarios)
+                self.responder("250 OK")
+            elif verbo in ("RSET", "NOOP"):
+                self.responder("250 OK")
+            elif verbo == "QUIT":
+                self.responder("221 Bye")
+                return
+            else:
+                self.responder("502 Command not implemented")
+
+
+def configurar(caminho_db: str, porta: int):
+    os.environ["DATABASE_URL"] = f"sqlite:///{caminho_db}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("REPLICA_DATABASE_URL", None)
+    os.environ.update({
+        "EMAIL_ENABLED": "true",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(porta),
+        "SMTP_STARTTLS": "false",
+        "EMAIL_WORKERS": "4",
+        "EMAIL_BATCH_SIZE": "20",
+        "EMAIL_POLL_INTERVAL": "0.2",
+        "EMAIL_MAX_ATTEMPTS": str(MAX_TENTATIVAS),
+        "EMAIL_RETRY_BASE": "0.1",
+        "EMAIL_RETRY_MAX": "0.5",
+    })
+
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200, help="Emails normais a enviar")
+    parser.add_argument("--atraso", type=float, default=0.02, help="Segundos que o servidor SMTP demora por email")
+    parser.add_argument("--timeout", type=float, default=60, help="Segundos para esvaziar a fila")
+    args = parser.parse_args()
+
+    servidor = ServidorSMTP(args.atraso)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configurar(os.path.join(tmp, "email_outbox.db"), servidor.server_address[1])
+
+        from sqlalchemy import func, select
+        from app.crud import email_outbox as crud_email_outbox
+        from app.database import SessionLocal
+        from app.models.email_outbox import EmailOutbox, EstadoEmail
+        from app.services.email import email_service
+        from app.services.email_outbox import email_dispatcher, transporte_configurado
+
+        normais = [f"cliente-{i}@example.com" for i in range(args.emails)]
+        especiais = ["temporario-1@example.com", "temporario-2@example.com",
+                     "recusado-1@example.com", "indisponivel-1@example.com"]
+
+        # Latência do pedido: pôr na fila vs enviar diretamente
+        direto = []
+        for i in range(min(20, args.emails)):
+            email = type("Email", (), {"destinatario": f"direto-{i}@example.com", "assunto": "x", "html": "<p>x</p>", "texto": "x"})
+            inicio = time.perf_counter()
+            with transporte_configurado() as transporte:
+                transporte.enviar(email)
+            direto.append((time.perf_counter() - inicio) * 1000)
+
+        na_fila = []
+        for destinatario in normais + especiais:
+            inicio = time.perf_counter()
+            email_service.send_email(destinatario, "Teste", "<p>Olá</p>", "Olá")
+            na_fila.append((time.perf_counter() - inicio) * 1000)
+
+        inicio = time.perf_counter()
+        email_dispatcher.start()
+        db = SessionLocal()
+        try:
+            while time.perf_counter() - inicio < args.timeout:
+                pendentes = db.scalar(
+                    select(func.count(EmailOutbox.id)).where(EmailOutbox.estado == EstadoEmail.PENDENTE)
+                )
+                if pendentes == 0:
+                    break
+                time.sleep(0.05)
+            duracao = time.perf_counter() - inicio
+            email_dispatcher.stop()
+
+            emails = {e.destinatario: e for e in db.scalars(select(EmailOutbox))}
+            falhas = []
+            if pendentes:
+                falhas.append(f"{pendentes} emails ainda pendentes ao fim de {args.timeout}s")
+            for destinatario in normais:
+                if servidor.entregues[destinatario] != 1 or emails[destinatario].estado != EstadoEmail.ENVIADO:
+                    falhas.append(f"{destinatario}: entregue {servidor.entregues[destinatario]}x, {emails[destinatario].estado}")
+            for destinatario in ("temporario-1@example.com", "temporario-2@example.com"):
+                email = emails[destinatario]
+                if email.estado != EstadoEmail.ENVIADO or email.tentativas != 3 or servidor.entregues[destinatario] != 1:
+                    falhas.append(f"{destinatario}: {email.estado} em {email.tentativas} tentativas")
+            recusado = emails["recusado-1@example.com"]
+            if recusado.estado != EstadoEmail.FALHADO or recusado.tentativas != 1:
+                falhas.append(f"recusado: {recusado.estado} em {recusado.tentativas} tentativas (esperado FALHADO em 1)")
+            indisponivel = emails["indisponivel-1@example.com"]
+            if indisponivel.estado != EstadoEmail.FALHADO or indisponivel.tentativas != MAX_TENTATIVAS:
+                falhas.append(
+                    f"indisponivel: {indisponivel.estado} em {indisponivel.tentativas} tentativas "
+                    f"(esperado FALHADO em {MAX_TENTATIVAS})"
+                )
+
+            # Dead-letter: listagem e regresso à fila
+            falhados = crud_email_outbox.get_falhados(db).items
+            if {e.destinatario for e in falhados} != {"recusado-1@example.com", "indisponivel-1@example.com"}:
+                falhas.append(f"dead-letter inesperado: {[e.destinatario for e in falhados]}")
+            if not crud_email_outbox.reenviar(db, recusado.id) or crud_email_outbox.reenviar(db, emails[normais[0]].id):
+                falhas.append("reenviar só deve aceitar emails FALHADO")
+        finally:
+            db.close()
+
+    total = len(normais) + len(especiais)
+    print(f"Servidor SMTP de teste: {args.atraso * 1000:.0f} ms por email, {servidor.ligacoes} ligações")
+    print(f"Envio direto (por pedido):  mediana {statistics.median(direto):7.2f} ms")
+    print(f"Pôr na fila (por pedido):   mediana {statistics.median(na_fila):7.2f} ms")
+    print(f"Fila esvaziada: {total} emails em {duracao:.2f}s ({total / duracao:.0f} emails/s)")
+    for falha in falhas:
+        print(f"FALHOU: {falha}")
+    if falhas:
+        return 1
+    print("OK: entregas únicas, novas tentativas com backoff e dead-letter como esperado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Verifica o número de statements SQL por endpoint (deteção de N+1).
+
+Cria uma base de dados SQLite temporária (alembic upgrade head + seed), gera
+reservas, mensagens, documentos, notas, RFQs, propostas, atividades aprovadas
+e a agenda de uma proposta de evento em dois volumes e chama
+cada endpoint com o TestClient. Falha (código 1) se algum endpoint exceder o
+seu máximo de statements ou se o número de statements crescer com o número
+de linhas. Os endpoints com ETag são também medidos na revalidação
+(If-None-Match com o ETag atual), que tem de responder 304.
+
+Uso (a partir de backend/):
+    python scripts/check_query_counts.py --linhas 5 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Máximo de statements por endpoint (a autenticação usa as claims do token)
+ENDPOINTS = [
+    ("GET /reservas/{empresa_id}", lambda ids: f"/reservas/{ids['empresa_id']}", "empresa", 2),
+    ("GET /reservas/fornecedor/{id}", lambda ids: f"/reservas/fornecedor/{ids['fornecedor_id']}", "fornecedor", 2),
+    ("GET /evento/{reserva_id}", lambda ids: f"/evento/{ids['reserva_id']}", "empresa", 2),
+    ("GET /evento/{reserva_id}/mensagens", lambda ids: f"/evento/{ids['reserva_id']}/mensagens", "fornecedor", 2),
+    ("GET /evento/{id}/mensagens?recentes", lambda ids: f"/evento/{ids['reserva_id']}/mensagens?recentes=true", "fornecedor", 2),
+    ("GET /evento/mensagens/por-ler", lambda ids: "/evento/mensagens/por-ler", "fornecedor", 1),
+    ("GET /rfq/", lambda ids: "/rfq/", "empresa", 1),
+    ("GET /rfq/fornecedor/disponiveis", lambda ids: "/rfq/fornecedor/disponiveis", "fornecedor", 1),
+    # Versão do catálogo, plano (motor + atividades escolhidas) e INSERT do evento e das propostas
+    ("POST /eventos/criar", lambda ids: "/eventos/criar", "empresa", 5),
+    # Mesmo brief normalizado (escalão de pessoas, maiúsculas, ordem dos tipos): plano em cache
+    ("POST /eventos/criar (cache)", lambda ids: "/eventos/criar", "empresa", 3),
+    # Proposta guardada com n atividades na agenda
+    ("POST /eventos/propostas/{id}/editar", lambda ids: f"/eventos/propostas/{ids['proposta_id']}/editar", "empresa", 3),
+    ("POST /eventos/propostas/{id}/confirmar", lambda ids: f"/eventos/propostas/{ids['proposta_id']}/confirmar", "empresa", 3),
+]
+
+# Corpo dos pedidos POST (ou função dos ids gerados que devolve o corpo)
+CORPOS = {
+    "POST /eventos/criar": {
+        "data_inicio": "2026-12-01", "duracao_atividades": "dia_todo", "n_pessoas": 10,
+        "localizacao": "Lisboa", "tipos_atividades": ["aventuras", "outdoor"],
+        "almoco": True, "transporte": True, "expectativa_preco": "€€"
+    },
+    "POST /eventos/criar (cache)": {
+        "data_inicio": "2026-12-08", "duracao_atividades": "dia_todo", "n_pessoas": 9,
+        "localizacao": " lisboa", "tipos_atividades": ["Outdoor", "aventuras"],
+        "almoco": True, "transporte": True, "expectativa_preco": "€€"
+    },
+    "POST /eventos/propostas/{id}/editar": lambda ids: {
+        "agenda": ids["agenda"] + [
+            {"tipo": "almoco", "nome": "Almoço em Restaurante Local", "preco": 0},
+            {"tipo": "transporte", "nome": "Transporte de/para Local", "preco": 0},
+        ],
+        "observacoes": "editada"
+    },
+    "POST /eventos/propostas/{id}/confirmar": {"proposta_data": {}},
+}
+
+# Revalidação com If-None-Match: máximo de statements da resposta 304
+REVALIDACOES = [
+    ("GET /evento/{reserva_id} (304)", lambda ids: f"/evento/{ids['reserva_id']}", "empresa", 1),
+]
+
+
+def preparar_base_de_dados(caminho: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{caminho}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("REPLICA_DATABASE_URL", None)
+    # Hashing barato e no próprio processo: o custo do bcrypt não interessa aqui
+    os.environ["BCRYPT_ROUNDS"] = "4"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+
+    from app.database import SessionLocal
+    from app.seed import seed
+    db = SessionLocal()
+    try:
+        seed(db)
+    finally:
+        db.close()
+
+
+def gerar_linhas(n: int) -> dict:
+    """
+    Cria n reservas e n RFQs para a empresa do seed (metade com 2 propostas do
+    fornecedor do seed), n mensagens/documentos/notas na primeira reserva e
+    n atividades aprovadas do fornecedor do seed, e um evento da empresa com
+    uma proposta guardada com essas n atividades na agenda
+    """
+    from sqlalchemy import insert, select
+    from app.database import SessionLocal
+    from app.models import Reserva, Mensagem, Documento, NotaEvento, Empresa, Fornecedor, Atividade, RFQ, Proposta
+    from app.models import Evento, PropostaGerada
+    from app.models.reserva import EstadoReserva
+    from app.models.atividade import EstadoAtividade
+
+    db = SessionLocal()
+    try:
+        empresa = db.scalar(select(Empresa))
+        fornecedor = db.scalar(select(Fornecedor))
+        atividades = db.scalars(select(Atividade.id)).all()
+        reserva_ids = db.scalars(
+            insert(Reserva).returning(Reserva.id),
+            [
+                {
+                    "empresa_id": empresa.id,
+                    "atividade_id": atividades[i % len(atividades)],
+                    "data": date(2026, 12, 1) + timedelta(days=i),
+                    "n_pessoas": 5,
+                    "preco_total": 125.0,
+                    "estado": EstadoReserva.PENDENTE
+                }
+                for i in range(n)
+            ]
+        ).all()
+        reserva_id = reserva_ids[0]
+        db.execute(insert(Mensagem), [
+            {
+                "reserva_id": reserva_id,
+                "remetente_id": (empresa.user_id, fornecedor.user_id)[i % 2],
+                "destinatario_id": (fornecedor.user_id, empresa.user_id)[i % 2],
+                "conteudo": f"mensagem {i}"
+            }
+            for i in range(n)
+        ])
+        db.execute(insert(Documento), [
+            {"reserva_id": reserva_id, "nome": f"doc {i}", "url": "http://example.com", "uploaded_by_id": empresa.user_id}
+            for i in range(n)
+        ])
+        db.execute(insert(NotaEvento), [
+            {"reserva_id": reserva_id, "conteudo": f"nota {i}", "criado_por_id": fornecedor.user_id}
+            for i in range(n)
+        ])
+        rfq_ids = db.scalars(
+            insert(RFQ).returning(RFQ.id),
+            [
+                {
+                    "empresa_id": empresa.id, "n_pessoas": 10, "data_preferida": date(2026, 12, 1),
+                    "localizacao": "Lisboa", "orcamento_max": 1000.0
+                }
+                for _ in range(n)
+            ]
+        ).all()
+        db.execute(insert(Proposta), [
+            {
+                "rfq_id": rfq_id, "fornecedor_id": fornecedor.id, "preco_total": 250.0,
+                "preco_por_pessoa": 25.0, "data_proposta": date(2026, 12, 1)
+            }
+            for rfq_id in rfq_ids[::2]
+            for _ in range(2)
+        ])
+        atividade_ids = db.scalars(insert(Atividade).returning(Atividade.id), [
+            {
+                "nome": f"atividade {i}", "tipo": "canoagem", "categoria": ("aventura", "relax", "cultural")[i % 3],
+                "clima": ("outdoor", "indoor")[i % 2], "preco_por_pessoa": 10.0 + i % 60, "capacidade_max": 5 + i % 40,
+                "localizacao": ("Lisboa", "Porto", "Sintra")[i % 3], "fornecedor_id": fornecedor.id,
+                "estado": EstadoAtividade.APROVADA, "aprovada": True
+            }
+            for i in range(n)
+        ]).all()
+        agenda = [
+            {"tipo": "atividade", "nome": f"atividade {i}", "preco": 0, "atividade_id": atividade_id}
+            for i, atividade_id in enumerate(atividade_ids)
+        ]
+        evento = Evento(empresa_id=empresa.id, brief=CORPOS["POST /eventos/criar"] | {"n_pessoas": 5})
+        evento.propostas = [PropostaGerada(tema="aventura", agenda=agenda)]
+        db.add(evento)
+        db.commit()
+        return {
+            "empresa_id": empresa.id, "fornecedor_id": fornecedor.id, "reserva_id": reserva_id,
+            "proposta_id": f"prop_{evento.propostas[0].id}", "agenda": agenda
+        }
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, nargs="+", default=[5, 50], help="Volumes a comparar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        preparar_base_de_dados(os.path.join(tmp, "query_counts.db"))
+
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.database import SessionLocal, count_statements
+        from app.core.catalogo import invalidar_catalogo
+
+        falhou = False
+        with TestClient(app) as client:
+            tokens = {}
+            for tipo, email, password in (
+                ("empresa", "empresa@example.com", "empresa123"),
+                ("fornecedor", "fornecedor@example.com", "fornecedor123"),
+            ):
+                resposta = client.post("/auth/login", json={"email": email, "password": password})
+                tokens[tipo] = resposta.json()["access_token"]
+
+            contagens = {descricao: [] for descricao, *_ in ENDPOINTS + REVALIDACOES}
+            for n in args.linhas:
+                ids = gerar_linhas(n)
+                # Atividades inseridas diretamente: medir com o catálogo em memória por carregar
+                with SessionLocal() as db:
+                    invalidar_catalogo(db)
+                    db.commit()
+                pedidos = [(*endpoint, None, 200) for endpoint in ENDPOINTS]
+                for descricao, caminho, tipo, maximo in REVALIDACOES:
+                    atual = client.get(caminho(ids), headers={"Authorization": f"Bearer {tokens[tipo]}"})
+                    pedidos.append((descricao, caminho, tipo, maximo, atual.headers.get("etag"), 304))
+                for descricao, caminho, tipo, maximo, etag, esperado in pedidos:
+                    headers = {"Authorization": f"Bearer {tokens[tipo]}"}
+                    if etag:
+                        headers["If-None-Match"] = etag
+                    metodo = descricao.split()[0]
+                    corpo = CORPOS.get(descricao)
+                    if callable(corpo):
+                        corpo = corpo(ids)
+                    with count_statements() as contador:
+                        resposta = client.request(metodo, caminho(ids), headers=headers, json=corpo)
+                    if resposta.status_code != esperado:
+                        print(f"FALHOU: {descricao} devolveu {resposta.status_code}: {resposta.text[:200]}")
+                        falhou = True
+                        continue
+                    contagens[descricao].append(contador.count)
+                    try:
+                        contador.assert_max(maximo, f"{descricao} com {n} linhas")
+                    except AssertionError as erro:
+                        print(f"FALHOU: {erro}")
+                        falhou = True
+
+        for descricao, *_, maximo in ENDPOINTS + REVALIDACOES:
+            valores = contagens[descricao]
+            plano = len(set(valores)) <= 1
+            if not plano:
+                print(f"FALHOU: {descricao} cresce com as linhas: {valores}")
+                falhou = True
+            volumes = "  ".join(f"{n} linhas: {v}" for n, v in zip(args.linhas, valores))
+            print(f"{descricao:40s} máx {maximo}  {volumes}")
+
+    if falhou:
+        return 1
+    print("OK: statements por endpoint dentro do limite e independentes do volume")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
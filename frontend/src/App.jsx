@@ -2,6 +2,7 @@ import { BrowserRouter as Router, Routes, Route, Navigate } from 'react-router-d
 import LandingPage from './pages/LandingPage';
 import Login from './pages/Login';
 import Register from './pages/Register';
+import ClaimAccount from './pages/ClaimAccount';
 import Dashboard from './pages/Dashboard';
 import Reservas from './pages/Reservas';
 import Fornecedor from './pages/Fornecedor';
@@ -32,6 +33,7 @@ function App() {
             <Route path="/" element={<LandingPage />} />
             <Route path="/login" element={<Login />} />
             <Route path="/register" element={<Register />} />
+            <Route path="/claim" element={<ClaimAccount />} />
             <Route path="/dashboard" element={<Dashboard />} />
             <Route path="/atividade/:id" element={<AtividadeDetail />} />
             <Route path="/reservas" element={<Reservas />} />
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import Card from './ui/Card';
 import Button from './ui/Button';
 import Input from './ui/Input';
-import api from '../services/api';
+import { getTodasPaginas } from '../services/api';
 
 function PropostaForm({ rfq, onClose, onSubmit }) {
   const [formData, setFormData] = useState({
@@ -26,10 +26,9 @@ function PropostaForm({ rfq, onClose, onSubmit }) {
 
   const loadAtividades = async () => {
     try {
-      const response = await api.get('/atividades/');
       // Filtrar apenas atividades do fornecedor logado
       // Por agora, mostrar todas (será filtrado no backend)
-      setAtividades(response.data);
+      setAtividades(await getTodasPaginas('/atividades/'));
     } catch (error) {
       console.error('Erro ao carregar atividades:', error);
     } finally {
@@ -21,6 +21,7 @@ export const AuthProvider = ({ children }) => {
         })
         .catch(() => {
           localStorage.removeItem('token');
+          localStorage.removeItem('refresh_token');
           localStorage.removeItem('user');
           setUser(null);
         })
@@ -33,8 +34,9 @@ export const AuthProvider = ({ children }) => {
   const login = async (email, password) => {
     try {
       const response = await api.post('/auth/login', { email, password });
-      const { access_token } = response.data;
+      const { access_token, refresh_token } = response.data;
       localStorage.setItem('token', access_token);
+      if (refresh_token) localStorage.setItem('refresh_token', refresh_token);
       
       const userResponse = await api.get('/auth/me');
       setUser(userResponse.data);
@@ -52,8 +54,9 @@ export const AuthProvider = ({ children }) => {
   const register = async (userData) => {
     try {
       const response = await api.post('/auth/register', userData);
-      const { access_token } = response.data;
+      const { access_token, refresh_token } = response.data;
       localStorage.setItem('token', access_token);
+      if (refresh_token) localStorage.setItem('refresh_token', refresh_token);
       
       const userResponse = await api.get('/auth/me');
       setUser(userResponse.data);
@@ -68,14 +71,43 @@ export const AuthProvider = ({ children }) => {
     }
   };
 
+  const claimAccount = async (token, password, nome) => {
+    try {
+      const response = await api.post('/auth/claim', { token, password, nome: nome || undefined });
+      const { access_token, refresh_token } = response.data;
+      localStorage.setItem('token', access_token);
+      if (refresh_token) localStorage.setItem('refresh_token', refresh_token);
+
+      const userResponse = await api.get('/auth/me');
+      setUser(userResponse.data);
+      localStorage.setItem('user', JSON.stringify(userResponse.data));
+
+      return { success: true };
+    } catch (error) {
+      return {
+        success: false,
+        error: error.response?.data?.detail || 'Erro ao ativar a conta'
+      };
+    }
+  };
+
   const logout = () => {
+    // Revogar tokens no servidor (sem esperar pela resposta)
+    const token = localStorage.getItem('token');
+    const refresh_token = localStorage.getItem('refresh_token');
+    if (token) {
+      api.post('/auth/logout', refresh_token ? { refresh_token } : undefined, {
+        headers: { Authorization: `Bearer ${token}` },
+      }).catch(() => {});
+    }
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     setUser(null);
   };
 
   return (
-    <AuthContext.Provider value={{ user, login, register, logout, loading }}>
+    <AuthContext.Provider value={{ user, login, register, claimAccount, logout, loading }}>
       {children}
     </AuthContext.Provider>
   );
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../hooks/useAuth';
-import api from '../services/api';
+import api, { getTodasPaginas } from '../services/api';
 import ReservationForm from '../components/ReservationForm';
 import ReservationFormGuest from '../components/ReservationFormGuest';
 import AppLayout from '../components/layout/AppLayout';
@@ -40,8 +40,7 @@ function AtividadeDetail() {
 
   const loadAvaliacoes = async () => {
     try {
-      const response = await api.get(`/avaliacoes/atividade/${id}`);
-      setAvaliacaoes(response.data);
+      setAvaliacaoes(await getTodasPaginas(`/avaliacoes/atividade/${id}`));
     } catch (error) {
       console.error('Erro ao carregar avaliações:', error);
     }
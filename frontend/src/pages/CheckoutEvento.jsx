@@ -16,6 +16,7 @@ function CheckoutEvento() {
   const proposta = location.state?.proposta;
   const grupos = location.state?.grupos;
   const eventoData = location.state?.eventoData; // Dados do evento original
+  const chaveAcesso = location.state?.chaveAcesso; // Devolvida por /eventos/criar, exigida sem login
   const [aceiteTermos, setAceiteTermos] = useState(false);
   const [processando, setProcessando] = useState(false);
   
@@ -71,7 +72,7 @@ function CheckoutEvento() {
       const response = await api.post(`/eventos/propostas/${proposta.id}/confirmar`, {
         proposta_data: propostaEnvio,
         grupos: grupos || null
-      });
+      }, chaveAcesso ? { headers: { 'X-Evento-Chave': chaveAcesso } } : undefined);
 
       const reservasIds = response.data.reservas_criadas || [];
       
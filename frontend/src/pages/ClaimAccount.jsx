@@ -0,0 +1,111 @@
+import { useState } from 'react';
+import { Link, useNavigate, useSearchParams } from 'react-router-dom';
+import { useAuth } from '../hooks/useAuth';
+import Card from '../components/ui/Card';
+import Button from '../components/ui/Button';
+import Input from '../components/ui/Input';
+
+// Página do link enviado por email (/claim?token=...) para uma conta guest definir a password
+function ClaimAccount() {
+  const [searchParams] = useSearchParams();
+  const token = searchParams.get('token');
+  const [formData, setFormData] = useState({ nome: '', password: '', confirmar: '' });
+  const [error, setError] = useState('');
+  const [loading, setLoading] = useState(false);
+  const { claimAccount } = useAuth();
+  const navigate = useNavigate();
+
+  const handleSubmit = async (e) => {
+    e.preventDefault();
+    setError('');
+
+    if (formData.password !== formData.confirmar) {
+      setError('As passwords não coincidem');
+      return;
+    }
+
+    setLoading(true);
+    const result = await claimAccount(token, formData.password, formData.nome);
+
+    if (result.success) {
+      const user = JSON.parse(localStorage.getItem('user'));
+      navigate(user?.tipo === 'fornecedor' ? '/fornecedor' : '/dashboard');
+    } else {
+      setError(result.error);
+    }
+    setLoading(false);
+  };
+
+  return (
+    <div className="min-h-screen flex items-center justify-center bg-secondary-50 py-12 px-4 sm:px-6 lg:px-8">
+      <div className="max-w-md w-full">
+        <Card>
+          <Card.Header className="text-center">
+            <Card.Title className="text-3xl">Ativar Conta</Card.Title>
+            <Card.Description className="mt-2">
+              Defina uma password para aceder à sua conta
+            </Card.Description>
+          </Card.Header>
+          <Card.Content>
+            {!token ? (
+              <div className="space-y-6">
+                <div className="bg-danger-50 border border-danger-200 text-danger-700 px-4 py-3 rounded-lg text-sm" role="alert">
+                  Link inválido: falta o token de ativação.
+                </div>
+                <Link to="/login" className="block text-center font-medium text-primary-600 hover:text-primary-700">
+                  Voltar ao início de sessão
+                </Link>
+              </div>
+            ) : (
+              <form onSubmit={handleSubmit} className="space-y-6">
+                {error && (
+                  <div className="bg-danger-50 border border-danger-200 text-danger-700 px-4 py-3 rounded-lg text-sm" role="alert">
+                    {error}
+                  </div>
+                )}
+
+                <Input
+                  label="Nome (opcional)"
+                  type="text"
+                  value={formData.nome}
+                  onChange={(e) => setFormData({ ...formData, nome: e.target.value })}
+                  placeholder="O seu nome"
+                />
+
+                <Input
+                  label="Nova password"
+                  type="password"
+                  required
+                  value={formData.password}
+                  onChange={(e) => setFormData({ ...formData, password: e.target.value })}
+                  placeholder="••••••••"
+                />
+
+                <Input
+                  label="Confirmar password"
+                  type="password"
+                  required
+                  value={formData.confirmar}
+                  onChange={(e) => setFormData({ ...formData, confirmar: e.target.value })}
+                  placeholder="••••••••"
+                />
+
+                <Button
+                  type="submit"
+                  disabled={loading}
+                  loading={loading}
+                  className="w-full"
+                  size="lg"
+                >
+                  Ativar Conta
+                </Button>
+              </form>
+            )}
+          </Card.Content>
+        </Card>
+      </div>
+    </div>
+  );
+}
+
+export default ClaimAccount;
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../hooks/useAuth';
-import api from '../services/api';
+import api, { API_URL } from '../services/api';
 import AppLayout from '../components/layout/AppLayout';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -24,6 +24,63 @@ function EventoDetail() {
     loadEvento();
   }, [id]);
 
+  // Novas mensagens, documentos e notas em tempo real (Server-Sent Events)
+  useEffect(() => {
+    let fonte;
+    let religar;
+    let ativo = true;
+
+    const juntar = (lista, item, noFim) => {
+      if (lista.some((existente) => existente.id === item.id)) return lista;
+      return noFim ? [...lista, item] : [item, ...lista];
+    };
+
+    const ligar = () => {
+      const token = localStorage.getItem('token') || '';
+      fonte = new EventSource(`${API_URL}/evento/${id}/stream?token=${encodeURIComponent(token)}`);
+      fonte.addEventListener('mensagem', (e) => {
+        const item = JSON.parse(e.data);
+        setEvento((atual) => atual && { ...atual, mensagens: juntar(atual.mensagens, item, true) });
+      });
+      fonte.addEventListener('documento', (e) => {
+        const item = JSON.parse(e.data);
+        setEvento((atual) => atual && { ...atual, documentos: juntar(atual.documentos, item, false) });
+      });
+      fonte.addEventListener('nota', (e) => {
+        const item = JSON.parse(e.data);
+        setEvento((atual) => atual && { ...atual, notas: juntar(atual.notas, item, false) });
+      });
+      fonte.addEventListener('lidas', (e) => {
+        const { destinatario_id: destinatario, ate_id: ateId } = JSON.parse(e.data);
+        setEvento((atual) => atual && {
+          ...atual,
+          mensagens: atual.mensagens.map((m) => (
+            m.destinatario_id === destinatario && m.id <= ateId ? { ...m, lida: true } : m
+          ))
+        });
+      });
+      fonte.addEventListener('recarregar', () => loadEvento());
+      fonte.addEventListener('expirado', () => {
+        // O servidor fecha o stream quando o token expira: renovar (via loadEvento) e voltar a ligar
+        fonte.close();
+        loadEvento().then(() => ativo && ligar());
+      });
+      fonte.onerror = () => {
+        // Ligação recusada (ex.: token expirado): recarregar renova o token e volta a ligar
+        if (fonte.readyState === EventSource.CLOSED && ativo) {
+          religar = setTimeout(() => loadEvento().then(() => ativo && ligar()), 3000);
+        }
+      };
+    };
+
+    ligar();
+    return () => {
+      ativo = false;
+      clearTimeout(religar);
+      fonte?.close();
+    };
+  }, [id]);
+
   const loadEvento = async () => {
     try {
       const response = await api.get(`/evento/${id}`);
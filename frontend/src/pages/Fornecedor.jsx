@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../hooks/useAuth';
-import api from '../services/api';
+import api, { getTodasPaginas } from '../services/api';
 import AppLayout from '../components/layout/AppLayout';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -56,8 +56,8 @@ function Fornecedor() {
 
   const loadAtividades = async (fornId) => {
     try {
-      const response = await api.get(`/atividades/`);
-      const fornecedorAtividades = response.data.filter(a => a.fornecedor_id === fornId);
+      const todas = await getTodasPaginas('/atividades/');
+      const fornecedorAtividades = todas.filter(a => a.fornecedor_id === fornId);
       setAtividades(fornecedorAtividades);
     } catch (error) {
       console.error('Erro ao carregar atividades:', error);
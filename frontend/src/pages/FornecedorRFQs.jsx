@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../hooks/useAuth';
-import api from '../services/api';
+import api, { getTodasPaginas } from '../services/api';
 import AppLayout from '../components/layout/AppLayout';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -30,8 +30,7 @@ function FornecedorRFQs() {
 
   const loadRFQs = async () => {
     try {
-      const response = await api.get('/rfq/fornecedor/disponiveis');
-      setRfqs(response.data);
+      setRfqs(await getTodasPaginas('/rfq/fornecedor/disponiveis'));
     } catch (error) {
       toast.error('Erro ao carregar RFQs disponíveis');
       console.error(error);
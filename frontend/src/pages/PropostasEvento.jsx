@@ -35,7 +35,12 @@ function PropostasEvento() {
   const handleConfirmarProposta = async (propostaId) => {
     // TODO: Implementar confirmação e criação de reserva
     toast.success(`Proposta ${propostaId} selecionada! Redirecionando para confirmação...`);
-    navigate('/checkout-evento', { state: { proposta: propostas.find(p => p.id === propostaId) } });
+    navigate('/checkout-evento', {
+      state: {
+        proposta: propostas.find(p => p.id === propostaId),
+        chaveAcesso: responseData?.chave_acesso
+      }
+    });
   };
 
   return (
@@ -59,8 +59,9 @@ function Register() {
       });
 
       if (loginResponse.ok) {
-        const { access_token } = await loginResponse.json();
+        const { access_token, refresh_token } = await loginResponse.json();
         localStorage.setItem('token', access_token);
+        localStorage.setItem('refresh_token', refresh_token);
         
         // Criar perfil (empresa ou fornecedor)
         if (formData.tipo === 'empresa') {
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../hooks/useAuth';
-import api from '../services/api';
+import api, { getTodasPaginas } from '../services/api';
 import AppLayout from '../components/layout/AppLayout';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
@@ -40,8 +40,7 @@ function Reservas() {
 
   const loadReservas = async (empId) => {
     try {
-      const response = await api.get(`/reservas/${empId}`);
-      setReservas(response.data);
+      setReservas(await getTodasPaginas(`/reservas/${empId}`));
     } catch (error) {
       console.error('Erro ao carregar reservas:', error);
     }
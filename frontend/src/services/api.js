@@ -28,12 +28,44 @@ api.interceptors.request.use(
   }
 );
 
+// Renovar o access token (curto) com o refresh token, uma vez por pedido
+let refreshEmCurso = null;
+
+const renovarToken = () => {
+  if (!refreshEmCurso) {
+    const refresh_token = localStorage.getItem('refresh_token');
+    refreshEmCurso = (refresh_token
+      ? axios.post(`${API_URL}/auth/refresh`, { refresh_token }).then(({ data }) => {
+          localStorage.setItem('token', data.access_token);
+          localStorage.setItem('refresh_token', data.refresh_token);
+          return data.access_token;
+        })
+      : Promise.reject(new Error('Sem refresh token'))
+    ).finally(() => {
+      refreshEmCurso = null;
+    });
+  }
+  return refreshEmCurso;
+};
+
 // Interceptor para tratar erros de autenticação
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._renovado && !original.url?.startsWith('/auth/')) {
+      original._renovado = true;
+      try {
+        const token = await renovarToken();
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      } catch {
+        // Refresh inválido ou expirado: terminar sessão
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('token');
+      localStorage.removeItem('refresh_token');
       localStorage.removeItem('user');
       window.location.href = '/login';
     }
@@ -41,5 +73,21 @@ api.interceptors.response.use(
   }
 );
 
+// Listagens paginadas por cursor: segue o header X-Next-Cursor até à última página
+const getTodasPaginas = async (url, config = {}) => {
+  const itens = [];
+  let cursor = null;
+  do {
+    const response = await api.get(url, {
+      ...config,
+      params: cursor ? { ...config.params, cursor } : config.params,
+    });
+    itens.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return itens;
+};
+
+export { API_URL, getTodasPaginas };
 export default api;
 